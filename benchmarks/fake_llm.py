@@ -0,0 +1,231 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import random
+import threading
+import time
+import types
+import typing
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import contextmanager
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Literal
+
+import httpx
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, PrivateAttr
+
+from services.ai.ai_settings import AgentRole
+from services.ai.model_config import ModelSelector
+
+WORDS = (
+    "threshold aerobic base recovery tempo interval volume intensity load fatigue fitness form "
+    "zone cadence power pace heart rate variability sleep stress taper build peak race week"
+).split()
+
+
+def _chars_to_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def _message_text(messages: list[BaseMessage]) -> str:
+    return "\n".join(m.content if isinstance(m.content, str) else json.dumps(m.content, default=str) for m in messages)
+
+
+def _filler_text(seed: str, tokens: int) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(WORDS) for _ in range(tokens))
+
+
+def fake_value(annotation: Any, text: Callable[[], str]) -> Any:
+    """A value of `annotation` for fake structured output; unions prefer their final-answer variant."""
+    origin = typing.get_origin(annotation)
+    args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+
+    if origin in (typing.Union, types.UnionType):
+        final = [arg for arg in args if typing.get_origin(arg) is not list]
+        return fake_value((final or args)[0], text)
+    if origin is Literal:
+        return args[0]
+    if origin in (list, tuple, set):
+        return [fake_value(args[0], text)] if args else []
+    if origin is dict:
+        return {}
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return {name: fake_value(field.annotation, text) for name, field in annotation.model_fields.items()}
+        if issubclass(annotation, Enum):
+            return next(iter(annotation)).value
+        if issubclass(annotation, bool):
+            return True
+        if issubclass(annotation, int):
+            return 1
+        if issubclass(annotation, float):
+            return 1.0
+        if issubclass(annotation, datetime):
+            return datetime(2024, 1, 1).isoformat()
+        if issubclass(annotation, date):
+            return date(2024, 1, 1).isoformat()
+    return text()
+
+
+class FakeChatModel(BaseChatModel):
+    """Deterministic stand-in for a provider chat model.
+
+    Responses are filler text (or a schema-valid payload under `with_structured_output`) derived
+    from the prompt, so reruns produce identical outputs. Each call waits `latency_seconds` before
+    the first token and then streams `output_tokens` at `tokens_per_second`. A `failure_rate`
+    fraction of attempts raises a retryable HTTP 429 for `endpoint`; which attempts fail depends
+    only on the prompt and attempt number. With tools bound, the first `tool_call_rounds` replies
+    call the first tool with schema-valid arguments.
+    """
+
+    model: str = "fake-model"
+    endpoint: str = "https://api.openai.com/v1"
+    latency_seconds: float = 0.0
+    tokens_per_second: float | None = None
+    output_tokens: int = 200
+    failure_rate: float = 0.0
+    tool_call_rounds: int = 0
+    seed: int = 0
+
+    _attempts: dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _tool_ids: Iterator[int] = PrivateAttr(default_factory=itertools.count)
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-benchmark-chat"
+
+    @property
+    def _identifying_params(self) -> dict[str, Any]:
+        return {"model": self.model}
+
+    def bind_tools(self, tools: list, *, tool_choice: Any = None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def with_structured_output(self, schema: type[BaseModel], *, include_raw: bool = False, **kwargs: Any):
+        def parse(message: AIMessage):
+            # Tool calls go back to the caller's tool loop, as with provider structured output.
+            parsed = message if message.tool_calls else schema.model_validate_json(message.content)
+            return {"raw": message, "parsed": parsed, "parsing_error": None} if include_raw else parsed
+
+        return self.bind(structured_schema=schema) | RunnableLambda(parse)
+
+    def _plan(self, messages: list[BaseMessage], **kwargs: Any) -> AIMessage:
+        prompt = _message_text(messages)
+        key = hashlib.sha256(f"{self.seed}:{prompt}".encode()).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(key, 0)
+            self._attempts[key] = attempt + 1
+
+        if random.Random(f"{key}:{attempt}").random() < self.failure_rate:
+            request = httpx.Request("POST", f"{self.endpoint}/chat/completions")
+            response = httpx.Response(429, headers={"retry-after": "0"}, request=request)
+            raise httpx.HTTPStatusError("Injected rate limit", request=request, response=response)
+
+        tools = kwargs.get("tools") or []
+        rounds = sum(isinstance(m, ToolMessage) for m in messages)
+        words = iter(_filler_text(key, self.output_tokens).split())
+
+        def text(count: int = 40) -> str:
+            return " ".join(itertools.islice(words, count)) or "ok"
+
+        if tools and rounds < self.tool_call_rounds:
+            function = tools[0]["function"]
+            with self._lock:
+                call_id = f"call_{next(self._tool_ids)}"
+            args = {
+                name: fake_value({"integer": int, "number": float, "boolean": bool}.get(spec.get("type"), str), text)
+                for name, spec in function.get("parameters", {}).get("properties", {}).items()
+            }
+            content, tool_calls = "", [{"name": function["name"], "args": args, "id": call_id}]
+        elif schema := kwargs.get("structured_schema"):
+            content, tool_calls = json.dumps(fake_value(schema, text)), []
+        else:
+            content, tool_calls = text(self.output_tokens), []
+
+        output_tokens = _chars_to_tokens(content) if tool_calls else self.output_tokens
+        input_tokens = _chars_to_tokens(prompt)
+        return AIMessage(
+            content=content,
+            tool_calls=tool_calls,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            },
+            response_metadata={"model_name": self.model},
+        )
+
+    def _generation_seconds(self, message: AIMessage) -> float:
+        if not self.tokens_per_second:
+            return 0.0
+        return message.usage_metadata["output_tokens"] / self.tokens_per_second
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self._plan(messages, **kwargs)
+        time.sleep(self.latency_seconds + self._generation_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self._plan(messages, **kwargs)
+        await asyncio.sleep(self.latency_seconds + self._generation_seconds(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(
+        self, messages, stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self._plan(messages, **kwargs)
+        await asyncio.sleep(self.latency_seconds)
+        words = message.content.split(" ")
+        delay = self._generation_seconds(message) / max(1, len(words))
+        for index, word in enumerate(words):
+            chunk = AIMessageChunk(content=word if index == 0 else f" {word}")
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.content, chunk=ChatGenerationChunk(message=chunk))
+            yield ChatGenerationChunk(message=chunk)
+            await asyncio.sleep(delay)
+        yield ChatGenerationChunk(
+            message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": c["name"], "args": json.dumps(c["args"]), "id": c["id"], "index": i}
+                    for i, c in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata,
+                response_metadata=message.response_metadata,
+            )
+        )
+
+
+@contextmanager
+def fake_llms(**settings: Any) -> Iterator[dict[str, FakeChatModel]]:
+    """Route every `ModelSelector.get_llm` call to a `FakeChatModel`, one per configured model.
+
+    The fakes report the configured model's real name, so scheduling, circuit breaking and cost
+    tracking see the same providers and prices as a real run. Yields the fakes by model key.
+    """
+    models: dict[str, FakeChatModel] = {}
+    lock = threading.Lock()
+
+    def factory(role: AgentRole, model_name: str) -> FakeChatModel:
+        with lock:
+            if model_name not in models:
+                configuration = ModelSelector.CONFIGURATIONS[model_name]
+                models[model_name] = FakeChatModel(
+                    model=configuration.name, endpoint=configuration.base_url, **settings
+                )
+            return models[model_name]
+
+    previous, ModelSelector.llm_factory = ModelSelector.llm_factory, factory
+    try:
+        yield models
+    finally:
+        ModelSelector.llm_factory = previous
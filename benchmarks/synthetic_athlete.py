@@ -0,0 +1,212 @@
+import math
+import random
+from datetime import date, datetime, timedelta
+
+from services.garmin.models import (
+    Activity,
+    ActivitySummary,
+    BodyMetrics,
+    DailyStats,
+    GarminData,
+    HeartRateZone,
+    PhysiologicalMarkers,
+    RecoveryIndicators,
+    TrainingStatus,
+    UserProfile,
+    WeatherData,
+)
+
+SPORTS = {
+    # sport: (share of sessions, speed m/s, typical duration s, laps)
+    "running": (0.45, 3.2, 3600, 10),
+    "cycling": (0.35, 8.5, 5400, 6),
+    "swimming": (0.2, 0.9, 2700, 20),
+}
+
+
+def _laps(rng: random.Random, start: datetime, sport: str, distance: float, duration: int, count: int) -> list[dict]:
+    lap_distance, lap_duration = distance / count, duration / count
+    laps = []
+    for index in range(count):
+        speed = lap_distance / lap_duration * rng.uniform(0.9, 1.1)
+        lap = {
+            "startTime": (start + timedelta(seconds=index * lap_duration)).isoformat(),
+            "distance": round(lap_distance / 1000, 2),
+            "duration": round(lap_duration / 60, 2),
+            "elevationGain": round(rng.uniform(0, 30), 1),
+            "elevationLoss": round(rng.uniform(0, 30), 1),
+            "averageSpeed": round(speed * 3.6, 2),
+            "maxSpeed": round(speed * 3.6 * 1.2, 2),
+            "averageHR": rng.randint(125, 165),
+            "maxHR": rng.randint(165, 185),
+            "calories": rng.randint(40, 120),
+            "intensity": "ACTIVE",
+        }
+        if sport == "cycling":
+            lap.update({"averagePower": float(rng.randint(170, 260)), "maxPower": float(rng.randint(350, 700))})
+        laps.append(lap)
+    return laps
+
+
+def _activity(rng: random.Random, activity_id: int, start: datetime) -> Activity:
+    sport = rng.choices(list(SPORTS), weights=[share for share, *_ in SPORTS.values()])[0]
+    _, speed, typical_duration, lap_count = SPORTS[sport]
+    duration = int(typical_duration * rng.uniform(0.5, 1.8))
+    distance = round(duration * speed * rng.uniform(0.9, 1.1), 1)
+    average_hr = rng.randint(128, 160)
+    summary = ActivitySummary(
+        distance=distance,
+        duration=duration,
+        moving_duration=int(duration * 0.97),
+        elevation_gain=round(rng.uniform(0, 600), 1) if sport != "swimming" else None,
+        elevation_loss=round(rng.uniform(0, 600), 1) if sport != "swimming" else None,
+        average_speed=round(distance / duration, 2),
+        max_speed=round(distance / duration * 1.4, 2),
+        calories=int(duration / 60 * rng.uniform(9, 13)),
+        average_hr=average_hr,
+        max_hr=average_hr + rng.randint(15, 30),
+        min_hr=rng.randint(90, 110),
+        activity_training_load=int(duration / 60 * rng.uniform(0.8, 2.0)),
+        moderate_intensity_minutes=duration // 120,
+        vigorous_intensity_minutes=duration // 300,
+        recovery_heart_rate=rng.randint(20, 40),
+    )
+    if sport == "cycling":
+        summary.avg_power = float(rng.randint(170, 240))
+        summary.max_power = float(rng.randint(500, 900))
+        summary.normalized_power = summary.avg_power * 1.06
+        summary.intensity_factor = round(summary.normalized_power / 260, 2)
+        summary.training_stress_score = round(duration / 3600 * summary.intensity_factor**2 * 100, 1)
+
+    zone_seconds = [duration * share for share in (0.1, 0.45, 0.25, 0.15, 0.05)]
+    return Activity(
+        activity_id=activity_id,
+        activity_type=sport,
+        activity_name=f"{sport.title()} session {activity_id}",
+        start_time=start.strftime("%Y-%m-%d %H:%M:%S"),
+        summary=summary,
+        weather=WeatherData(temp=round(rng.uniform(2, 28), 1), relative_humidity=rng.uniform(30, 90), wind_speed=2.0),
+        hr_zones=[
+            HeartRateZone(zone_number=zone, secs_in_zone=int(seconds), zone_low_boundary=100 + zone * 15)
+            for zone, seconds in enumerate(zone_seconds, 1)
+        ],
+        laps=_laps(rng, start, sport, distance, duration, lap_count),
+    )
+
+
+def generate_garmin_data(
+    days: int,
+    activities_per_day: float = 1.2,
+    end_date: date | None = None,
+    seed: int = 0,
+) -> GarminData:
+    """A plausible athlete history of `days` days ending at `end_date`.
+
+    Activities, daily metrics and histories follow the shapes `TriathlonCoachDataExtractor`
+    produces, so summarizers and plot datasets see realistic payload sizes. The same seed
+    always yields the same data.
+    """
+    rng = random.Random(seed)
+    end_date = end_date or date.today()
+    dates = [end_date - timedelta(days=offset) for offset in range(days - 1, -1, -1)]
+
+    activities = []
+    for day in dates:
+        sessions = int(activities_per_day) + (rng.random() < activities_per_day % 1)
+        for session in range(sessions):
+            start = datetime.combine(day, datetime.min.time()) + timedelta(hours=6 + 5 * session)
+            activities.append(_activity(rng, 10_000_000 + len(activities), start))
+    activities.reverse()
+
+    training_load_history = []
+    chronic = 60.0
+    for index, day in enumerate(dates):
+        acute = 70 + 25 * math.sin(index / 9) + rng.uniform(-8, 8)
+        chronic += (acute - chronic) / 28
+        training_load_history.append(
+            {
+                "date": day.isoformat(),
+                "acute_load": round(acute),
+                "chronic_load": round(chronic),
+                "acwr": round(acute / chronic, 2),
+            }
+        )
+
+    recovery_indicators = [
+        RecoveryIndicators(
+            date=day.isoformat(),
+            sleep={
+                "duration": {
+                    "total": round(total, 2),
+                    "deep": round(total * 0.18, 2),
+                    "light": round(total * 0.55, 2),
+                    "rem": round(total * 0.22, 2),
+                    "awake": round(total * 0.05, 2),
+                },
+                "quality": {"overall_score": rng.randint(60, 92), "deep_sleep": 18, "rem_sleep": 22},
+                "restless_moments": rng.randint(10, 60),
+                "avg_overnight_hrv": round(rng.uniform(45, 75), 1),
+                "resting_heart_rate": rng.randint(42, 52),
+            },
+            stress={"max_level": rng.randint(60, 95), "avg_level": rng.randint(18, 40)},
+        )
+        for day in dates
+        for total in [rng.uniform(6.0, 8.8)]
+    ]
+
+    vo2_max_history = {
+        sport: [
+            {"date": day.isoformat(), "value": round(base + index * 0.01 + rng.uniform(-0.3, 0.3), 1)}
+            for index, day in enumerate(dates)
+            if index % 3 == 0
+        ]
+        for sport, base in (("running", 55.0), ("cycling", 58.0))
+    }
+
+    return GarminData(
+        user_profile=UserProfile(
+            gender="female",
+            weight=61.0,
+            height=170.0,
+            birth_date="1990-05-01",
+            vo2max_running=vo2_max_history["running"][-1]["value"],
+            vo2max_cycling=vo2_max_history["cycling"][-1]["value"],
+            lactate_threshold_speed=4.1,
+            lactate_threshold_heart_rate=168,
+            available_training_days=["Monday", "Tuesday", "Wednesday", "Thursday", "Saturday", "Sunday"],
+            preferred_long_training_days=["Saturday", "Sunday"],
+        ),
+        daily_stats=DailyStats(
+            date=end_date.isoformat(),
+            total_steps=12_000,
+            total_calories=2600,
+            resting_heart_rate=46,
+            average_stress_level=28.0,
+            sleeping_hours=7.4,
+        ),
+        recent_activities=activities,
+        physiological_markers=PhysiologicalMarkers(
+            resting_heart_rate=46,
+            vo2_max=vo2_max_history["running"][-1]["value"],
+            hrv={
+                "weekly_avg": 62.0,
+                "last_night_avg": 64.0,
+                "last_night_5min_high": 88.0,
+                "baseline": {"low_upper": 52.0, "balanced_low": 56.0, "balanced_upper": 70.0},
+            },
+        ),
+        body_metrics=BodyMetrics(
+            weight={
+                "data": [{"date": day.isoformat(), "weight": round(61 + rng.uniform(-0.6, 0.6), 2)} for day in dates],
+                "average": 61.0,
+            },
+            hydration=[{"date": day.isoformat(), "goal": 2.5, "intake": 2.3, "sweat_loss": 0.8} for day in dates],
+        ),
+        recovery_indicators=recovery_indicators,
+        training_status=TrainingStatus(
+            vo2_max={"value": vo2_max_history["running"][-1]["value"], "date": end_date.isoformat()},
+            acute_training_load={key: training_load_history[-1][key] for key in ("acute_load", "chronic_load", "acwr")},
+        ),
+        vo2_max_history=vo2_max_history,
+        training_load_history=training_load_history,
+    )
@@ -0,0 +1,205 @@
+"""Offline benchmark of the integrated analysis + planning workflow.
+
+Runs `create_integrated_analysis_and_planning_workflow()` against synthetic athletes with fake
+LLMs and reports wall time, critical path, peak RSS and per-node overhead (node wall time not
+spent waiting on an LLM). Each profile runs in a fresh process so peak RSS is per profile.
+
+    python -m benchmarks.workflow_benchmark --profiles 7 21 56 365 --latency 0.5 --tokens-per-second 80
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any
+
+from services.ai.langgraph.workflows.planning_workflow import run_complete_analysis_and_planning
+
+from .fake_llm import fake_llms
+from .synthetic_athlete import generate_garmin_data
+
+PROFILES = (7, 21, 56, 365)
+
+
+@dataclass
+class BenchmarkResult:
+    days: int
+    activities: int
+    wall_seconds: float
+    critical_path: list[str]
+    critical_path_seconds: float
+    peak_rss_mb: float | None
+    llm_calls: int
+    total_tokens: int
+    node_overhead: dict[str, dict[str, float]] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+
+
+def peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def _union_seconds(intervals: list[tuple[float, float]]) -> float:
+    total, reach = 0.0, float("-inf")
+    for start, end in sorted(intervals):
+        if end > reach:
+            total += end - max(start, reach)
+            reach = end
+    return total
+
+
+def node_overhead(trace: dict[str, Any]) -> dict[str, dict[str, float]]:
+    """Per-node wall time, time covered by LLM calls and the rest, from a Chrome trace."""
+    events = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    llm_calls = [event for event in events if event["cat"] == "llm"]
+    totals: dict[str, dict[str, float]] = {}
+    for node in (event for event in events if event["cat"] == "node"):
+        start, end = node["ts"], node["ts"] + node["dur"]
+        llm_seconds = _union_seconds([
+            (max(start, call["ts"]), min(end, call["ts"] + call["dur"]))
+            for call in llm_calls
+            if call["tid"] == node["tid"] and call["ts"] < end and call["ts"] + call["dur"] > start
+        ]) / 1e6
+        entry = totals.setdefault(node["name"], {"runs": 0, "wall_seconds": 0.0, "llm_seconds": 0.0})
+        entry["runs"] += 1
+        entry["wall_seconds"] += node["dur"] / 1e6
+        entry["llm_seconds"] += llm_seconds
+
+    return {
+        name: {
+            "runs": entry["runs"],
+            "wall_seconds": round(entry["wall_seconds"], 3),
+            "llm_seconds": round(entry["llm_seconds"], 3),
+            "overhead_seconds": round(entry["wall_seconds"] - entry["llm_seconds"], 3),
+        }
+        for name, entry in sorted(totals.items(), key=lambda item: -item[1]["wall_seconds"])
+    }
+
+
+async def run_profile(days: int, plotting_enabled: bool = False, seed: int = 0, **llm_settings: Any) -> BenchmarkResult:
+    garmin_data = generate_garmin_data(days, seed=seed)
+    today = date.today()
+    week_dates = [
+        {"date": day.isoformat(), "day_name": day.strftime("%A")}
+        for day in (today + timedelta(days=offset) for offset in range(14))
+    ]
+    race_day = (today + timedelta(days=90)).isoformat()
+
+    with tempfile.TemporaryDirectory(prefix="workflow_benchmark_") as directory, fake_llms(seed=seed, **llm_settings):
+        timeline_path = Path(directory) / "timeline.json"
+        started = time.perf_counter()
+        result = await run_complete_analysis_and_planning(
+            user_id=f"benchmark_{days}d",
+            athlete_name="Benchmark Athlete",
+            garmin_data=asdict(garmin_data),
+            analysis_context="Benchmark run",
+            planning_context="Build towards an autumn marathon",
+            competitions=[{"name": "Autumn Marathon", "date": race_day, "priority": "A"}],
+            current_date={"date": today.isoformat(), "day_name": today.strftime("%A")},
+            week_dates=week_dates,
+            plotting_enabled=plotting_enabled,
+            hitl_enabled=False,
+            timeline_path=str(timeline_path),
+        )
+        wall_seconds = time.perf_counter() - started
+        trace = json.loads(timeline_path.read_text(encoding="utf-8"))
+
+    critical_path = result["execution_metadata"]["critical_path"]
+    return BenchmarkResult(
+        days=days,
+        activities=len(garmin_data.recent_activities),
+        wall_seconds=round(wall_seconds, 3),
+        critical_path=critical_path["path"],
+        critical_path_seconds=critical_path["duration_seconds"],
+        peak_rss_mb=peak_rss_mb(),
+        llm_calls=sum(event.get("cat") == "llm" for event in trace["traceEvents"]),
+        total_tokens=result.get("cost_summary", {}).get("total_tokens", 0),
+        node_overhead=node_overhead(trace),
+        errors=list(result.get("errors") or []),
+    )
+
+
+def _run_in_process(days: int, options: dict[str, Any]) -> BenchmarkResult:
+    logging.basicConfig(level=logging.WARNING)
+    return asyncio.run(run_profile(days, **options))
+
+
+def format_report(results: list[BenchmarkResult]) -> str:
+    lines = [
+        f"{'days':>5} {'activities':>10} {'wall s':>8} {'critical s':>10} {'peak RSS MB':>11} "
+        f"{'LLM calls':>9} {'tokens':>8} {'errors':>6}"
+    ]
+    for r in results:
+        lines.append(
+            f"{r.days:>5} {r.activities:>10} {r.wall_seconds:>8.2f} {r.critical_path_seconds:>10.2f} "
+            f"{r.peak_rss_mb if r.peak_rss_mb is not None else 'n/a':>11} {r.llm_calls:>9} "
+            f"{r.total_tokens:>8} {len(r.errors):>6}"
+        )
+    for r in results:
+        lines += ["", f"{r.days}-day profile critical path: {' -> '.join(r.critical_path)}"]
+        lines.append(f"  {'node':<24} {'runs':>4} {'wall s':>8} {'llm s':>8} {'overhead s':>10}")
+        for name, stats in r.node_overhead.items():
+            lines.append(
+                f"  {name:<24} {stats['runs']:>4} {stats['wall_seconds']:>8.3f} "
+                f"{stats['llm_seconds']:>8.3f} {stats['overhead_seconds']:>10.3f}"
+            )
+        lines += [f"  error: {error}" for error in r.errors]
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> list[BenchmarkResult]:
+    parser = argparse.ArgumentParser(description="Benchmark the analysis + planning workflow with fake LLMs")
+    parser.add_argument("--profiles", type=int, nargs="+", default=list(PROFILES), help="Days of history per run")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds before each LLM call's first token")
+    parser.add_argument("--tokens-per-second", type=float, default=None, help="Fake generation speed")
+    parser.add_argument("--output-tokens", type=int, default=200, help="Tokens per fake LLM response")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of LLM attempts that get a 429")
+    parser.add_argument("--tool-call-rounds", type=int, default=0, help="Tool calls before each final answer")
+    parser.add_argument("--plotting", action="store_true", help="Enable the plotting tools")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-process", action="store_true", help="Run profiles in this process (shared peak RSS)")
+    parser.add_argument("--json", type=Path, help="Also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Benchmarks never report to LangSmith.
+    os.environ.pop("LANGSMITH_API_KEY", None)
+    options = {
+        "plotting_enabled": args.plotting,
+        "seed": args.seed,
+        "latency_seconds": args.latency,
+        "tokens_per_second": args.tokens_per_second,
+        "output_tokens": args.output_tokens,
+        "failure_rate": args.failure_rate,
+        "tool_call_rounds": args.tool_call_rounds,
+    }
+
+    results = []
+    for days in args.profiles:
+        if args.in_process:
+            results.append(_run_in_process(days, options))
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as executor:
+            results.append(executor.submit(_run_in_process, days, options).result())
+
+    print(format_report(results))
+    if args.json:
+        args.json.write_text(json.dumps([asdict(r) for r in results], indent=2), encoding="utf-8")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,29 @@
 import argparse
 import asyncio
 import getpass
+import importlib
 import json
 import logging
 import os
 import sys
-from dataclasses import asdict
+import threading
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import yaml
 
-from core.config import reload_config
-from services.ai.ai_settings import ai_settings
-from services.ai.langgraph.workflows.planning_workflow import (
-    run_complete_analysis_and_planning,
-)
-from services.ai.utils.plan_storage import FilePlanStorage
-from services.garmin import ExtractionConfig, TriathlonCoachDataExtractor
-from services.outside.client import OutsideApiGraphQlClient
-
 sys.path.append(str(Path(__file__).parent.parent))
 
+# Everything below the CLI's own parsing is imported where it is first used: --help and
+# --init-config never load the AI stack, and a run reaches its first Garmin request before
+# langgraph and the provider SDKs finish importing in the background (see preload_workflow).
+if TYPE_CHECKING:
+    from services.ai.utils.llm_hedging import HedgePolicy
+
+WORKFLOW_MODULE = "services.ai.langgraph.workflows.planning_workflow"
+
 
 logging.basicConfig(
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s", level=logging.INFO
@@ -57,6 +58,9 @@ class ConfigParser:
 
         return self.config.get("athlete", {}).get("name", "Athlete"), email
 
+    def get_user_id(self) -> str:
+        return str(self.config.get("athlete", {}).get("user_id") or "cli_user")
+
     def get_contexts(self) -> tuple[str, str]:
         return (
             self.config.get("context", {}).get("analysis", "").strip(),
@@ -71,8 +75,30 @@ class ConfigParser:
             "enable_plotting": self.config.get("extraction", {}).get("enable_plotting", False),
             "hitl_enabled": self.config.get("extraction", {}).get("hitl_enabled", True),
             "skip_synthesis": self.config.get("extraction", {}).get("skip_synthesis", False),
+            "stream_html": self.config.get("extraction", {}).get("stream_html", False),
+            "formatter_backend": self.config.get("extraction", {}).get("formatter_backend"),
+            "durable_checkpoints": self.config.get("extraction", {}).get("durable_checkpoints", True),
+            "node_memo": self.config.get("extraction", {}).get("node_memo", True),
+            "plot_cache": self.config.get("extraction", {}).get("plot_cache", True),
+            "hitl_provider": self.config.get("extraction", {}).get("hitl_provider", "console"),
+            "hitl_timeout_seconds": self.config.get("extraction", {}).get("hitl_timeout_seconds"),
         }
 
+    def get_scheduler_config(self) -> dict[str, Any]:
+        from services.ai.utils.llm_scheduler import parse_scheduler_settings
+
+        return parse_scheduler_settings(self.config.get("scheduler"))
+
+    def get_hedging_policy(self) -> "HedgePolicy":
+        from services.ai.utils.llm_hedging import parse_hedging_settings
+
+        return parse_hedging_settings(self.config.get("hedging"))
+
+    def get_batch_settings(self) -> dict[str, Any]:
+        from services.ai.utils.batch_execution import parse_batch_settings
+
+        return parse_batch_settings(self.config.get("batch"))
+
     def get_competitions(self) -> list[dict[str, Any]]:
         competitions = self.config.get("competitions", [])
         return [
@@ -96,185 +122,426 @@ class ConfigParser:
         )
 
 
-def fetch_outside_competitions_from_config(config: dict[str, Any]) -> list[dict[str, Any]]:
-    client = OutsideApiGraphQlClient()
-
+async def fetch_outside_competitions_from_config(
+    config: dict[str, Any], cache_path: Path | None = None
+) -> list[dict[str, Any]]:
     if isinstance(outside_cfg := config.get("outside"), dict) and any(
         isinstance(value, list) for value in outside_cfg.values()
     ):
-        return client.get_competitions(outside_cfg)
+        lookups = [outside_cfg]
+    else:
+        lookups = []
+        if isinstance(legacy_bikereg := config.get("bikereg", []), list) and legacy_bikereg:
+            lookups.append(legacy_bikereg)
+        if legacy_all := {
+            key: entries
+            for key in ("runreg", "trireg", "skireg")
+            if isinstance(entries := config.get(key, []), list) and entries
+        }:
+            lookups.append(legacy_all)
+    if not lookups:
+        return []
+
+    from services.outside.client import AsyncOutsideApiGraphQlClient
+    from services.outside.response_cache import OutsideResponseCache
+
+    cache = OutsideResponseCache(cache_path)
+    async with AsyncOutsideApiGraphQlClient(cache=cache) as client:
+        results = await asyncio.gather(*(client.get_competitions(lookup) for lookup in lookups))
+    logger.info(f"Outside response cache: {cache.get_stats()}")
+    return [competition for competitions in results for competition in competitions]
+
+
+def find_nearby_competitions_from_config(config: dict[str, Any], mirror_path: Path) -> list[dict[str, Any]]:
+    """Candidate races around `race_search.latitude/longitude` from the local calendar mirror.
+
+    Stale `race_search.regions` are re-synced first; if that fails the last mirrored calendar is used.
+    """
+    if not isinstance(search := config.get("race_search"), dict):
+        return []
+
+    from services.outside.calendar_mirror import CalendarMirror
+    from services.outside.client import OutsideApiGraphQlClient
+
+    mirror = CalendarMirror(mirror_path)
+    app_types = search.get("app_types")
+    if regions := search.get("regions"):
+        try:
+            mirror.sync(
+                OutsideApiGraphQlClient(), regions, app_types=app_types, max_age_hours=search.get("max_age_hours", 24)
+            )
+        except Exception as e:
+            logger.warning(f"Calendar mirror sync failed, using the mirrored calendar: {e}")
+
+    today = datetime.now().date()
+    start = search.get("from") or today.isoformat()
+    end = search.get("until") or (today + timedelta(days=int(search.get("days_ahead", 180)))).isoformat()
+    try:
+        competitions = mirror.find_competitions(
+            priority=search.get("priority", "C"),
+            latitude=float(search["latitude"]),
+            longitude=float(search["longitude"]),
+            radius_km=float(search.get("radius_km", 100)),
+            start=start,
+            end=end,
+            app_types=app_types,
+            event_types=search.get("event_types"),
+            limit=search.get("limit", 10),
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Invalid race_search configuration, skipping nearby races: {e}")
+        return []
+    logger.info(f"Race search: {len(competitions)} candidate races within {search.get('radius_km', 100)} km")
+    return competitions
+
+
+def preload_workflow() -> threading.Thread:
+    """Import the workflow (langgraph, LangChain, provider SDKs) on a background thread.
+
+    Started before Garmin extraction, so the import overlaps with network waits instead of
+    delaying the first Garmin request; the later import of the module just picks it up.
+    """
+    thread = threading.Thread(
+        target=importlib.import_module, args=(WORKFLOW_MODULE,), name="workflow-preload", daemon=True
+    )
+    thread.start()
+    return thread
+
 
-    aggregate: list[dict[str, Any]] = []
+def create_html_progress_logger(step_bytes: int = 16_384):
+    last_logged: dict[str, int] = {}
 
-    if isinstance(legacy_bikereg := config.get("bikereg", []), list) and legacy_bikereg:
-        aggregate.extend(client.get_competitions(legacy_bikereg))
+    def log_progress(label: str, bytes_written: int) -> None:
+        if bytes_written - last_logged.get(label, 0) >= step_bytes:
+            last_logged[label] = bytes_written
+            logger.info(f"Streaming {label}: {bytes_written / 1024:.0f} KB written")
 
-    if legacy_all := {
-        key: entries
-        for key in ("runreg", "trireg", "skireg")
-        if isinstance(entries := config.get(key, []), list) and entries
-    }:
-        aggregate.extend(client.get_competitions(legacy_all))
+    return log_progress
 
-    return aggregate
 
+@dataclass
+class PreparedRun:
+    athlete_name: str
+    output_dir: Path
+    competitions: list[dict[str, Any]]
+    outside_competitions: list[dict[str, Any]]
+    workflow_kwargs: dict[str, Any]
+
+
+def apply_runtime_settings(config_parser: ConfigParser) -> None:
+    """Configure the process-wide LLM scheduler, hedging and AI mode from one config."""
+    from core.config import reload_config
+    from services.ai.ai_settings import ai_settings
+    from services.ai.utils.llm_hedging import llm_hedger
+    from services.ai.utils.llm_scheduler import llm_scheduler
+
+    llm_scheduler.configure(**config_parser.get_scheduler_config())
+    llm_hedger.configure(config_parser.get_hedging_policy())
+
+    os.environ["AI_MODE"] = config_parser.get_extraction_config().get("ai_mode", "development")
+    # Reload config and settings to pick up the new AI_MODE
+    reload_config()
+    ai_settings.reload()
+    logger.info(f"AI Mode: {os.environ['AI_MODE']}")
+
+
+async def prepare_run(
+    config_path: Path,
+    resume_execution_id: str | None = None,
+    password: str | None = None,
+    configure_runtime: bool = True,
+) -> PreparedRun:
+    from services.ai.langgraph.rendering import resolve_formatter_backends
+    from services.ai.langgraph.utils.interaction_providers import create_interaction_provider
+    from services.outside.calendar_mirror import CALENDAR_MIRROR_DB_NAME
+    from services.outside.response_cache import OUTSIDE_CACHE_DB_NAME
 
-async def run_analysis_from_config(config_path: Path) -> None:
     config_parser = ConfigParser(config_path)
     athlete_name, email = config_parser.get_athlete_info()
     analysis_context, planning_context = config_parser.get_contexts()
     extraction_settings = config_parser.get_extraction_config()
+    formatter_backends = resolve_formatter_backends(extraction_settings["formatter_backend"])
 
     competitions = config_parser.get_competitions()
-    outside_competitions = fetch_outside_competitions_from_config(config_parser.config)
-    if outside_competitions:
-        competitions.extend(outside_competitions)
-
     output_dir = config_parser.get_output_directory()
+    interaction_provider = create_interaction_provider(
+        extraction_settings["hitl_provider"],
+        timeout_seconds=extraction_settings["hitl_timeout_seconds"],
+        directory=output_dir / "hitl",
+    )
 
     logger.info(f"Starting analysis for {athlete_name}")
     logger.info(f"Output directory: {output_dir}")
 
-    password = config_parser.get_password()
-
-    os.environ["AI_MODE"] = extraction_settings.get("ai_mode", "development")
-    
-    # Reload config and settings to pick up the new AI_MODE
-    reload_config()
-    ai_settings.reload()
-    
-    logger.info(f"AI Mode: {os.environ['AI_MODE']}")
+    password = None if resume_execution_id else (password or config_parser.get_password())
 
+    if configure_runtime:
+        apply_runtime_settings(config_parser)
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    try:
+    preload_workflow()
+    outside_lookup = None
+    if resume_execution_id:
+        logger.info(f"Resuming execution {resume_execution_id} - skipping Garmin data extraction")
+        garmin_data = {}
+    else:
+        from services.garmin import ExtractionConfig, TriathlonCoachDataExtractor
+
+        def extract_garmin_data() -> dict[str, Any]:
+            extractor = TriathlonCoachDataExtractor(email, password)
+
+            extraction_config = ExtractionConfig(
+                activities_range=extraction_settings["activities_days"],
+                metrics_range=extraction_settings["metrics_days"],
+                include_detailed_activities=True,
+                include_metrics=True,
+            )
+
+            return asdict(extractor.extract_data(extraction_config))
+
+        # Started once the password is in, so the lookup overlaps Garmin login and extraction.
+        outside_lookup = asyncio.gather(
+            fetch_outside_competitions_from_config(config_parser.config, output_dir / OUTSIDE_CACHE_DB_NAME),
+            asyncio.to_thread(
+                find_nearby_competitions_from_config, config_parser.config, output_dir / CALENDAR_MIRROR_DB_NAME
+            ),
+        )
         logger.info("Extracting Garmin Connect data...")
-        extractor = TriathlonCoachDataExtractor(email, password)
+        try:
+            garmin_data = await asyncio.to_thread(extract_garmin_data)
+        except BaseException:
+            outside_lookup.cancel()
+            await asyncio.gather(outside_lookup, return_exceptions=True)
+            raise
+        logger.info("Data extraction completed")
 
-        extraction_config = ExtractionConfig(
-            activities_range=extraction_settings["activities_days"],
-            metrics_range=extraction_settings["metrics_days"],
-            include_detailed_activities=True,
-            include_metrics=True,
-        )
+    outside_competitions: list[dict[str, Any]] = []
+    if outside_lookup is not None:
+        configured, nearby = await outside_lookup
+        known = {(c.get("name"), str(c.get("date"))) for c in competitions + configured}
+        outside_competitions = configured + [c for c in nearby if (c["name"], c["date"]) not in known]
+    if outside_competitions:
+        competitions.extend(outside_competitions)
 
-        garmin_data = extractor.extract_data(extraction_config)
-        logger.info("Data extraction completed")
+    from services.ai.langgraph.utils.node_memo import NODE_MEMO_DB_NAME
+    from services.ai.tools.plotting.plot_result_cache import PLOT_CACHE_DB_NAME
+    from services.ai.utils.execution_timeline import TIMELINE_FILE_NAME
 
-        now = datetime.now()
-        plotting_enabled = extraction_settings.get("enable_plotting", False)
-        hitl_enabled = extraction_settings.get("hitl_enabled", True)
-        skip_synthesis = extraction_settings.get("skip_synthesis", False)
-        
-        logger.info(f"Plotting enabled: {plotting_enabled}")
-        logger.info(f"HITL enabled: {hitl_enabled}")
-        logger.info(f"Skip synthesis: {skip_synthesis}")
-        
-        current_date = {"date": now.strftime("%Y-%m-%d"), "day_name": now.strftime("%A")}
-        week_dates = [
-            {"date": (now + timedelta(days=offset)).strftime("%Y-%m-%d"),
-             "day_name": (now + timedelta(days=offset)).strftime("%A")}
-            for offset in range(14)
-        ]
-        
-        logger.info("Running AI analysis and planning...")
-        
-        result = await run_complete_analysis_and_planning(
-            user_id="cli_user",
-            athlete_name=athlete_name,
-            garmin_data=asdict(garmin_data),
-            analysis_context=analysis_context,
-            planning_context=planning_context,
-            competitions=competitions,
-            current_date=current_date,
-            week_dates=week_dates,
-            plotting_enabled=plotting_enabled,
-            hitl_enabled=hitl_enabled,
-            skip_synthesis=skip_synthesis,
-        )
+    now = datetime.now()
+    plotting_enabled = extraction_settings.get("enable_plotting", False)
+    hitl_enabled = extraction_settings.get("hitl_enabled", True)
+    skip_synthesis = extraction_settings.get("skip_synthesis", False)
+    stream_html = extraction_settings.get("stream_html", False)
+    durable_checkpoints = extraction_settings.get("durable_checkpoints", True) or bool(resume_execution_id)
+    
+    logger.info(f"Plotting enabled: {plotting_enabled}")
+    logger.info(f"HITL enabled: {hitl_enabled}")
+    logger.info(f"Skip synthesis: {skip_synthesis}")
+    logger.info(f"Stream HTML: {stream_html}")
+    logger.info(f"Formatter backends: {formatter_backends}")
+    logger.info(f"Durable checkpoints: {durable_checkpoints}")
+    logger.info(f"Node memoization: {extraction_settings['node_memo']}")
+
+    checkpoint_db = None
+    if durable_checkpoints:
+        from services.ai.langgraph.utils.sqlite_checkpointer import CHECKPOINT_DB_NAME
+
+        checkpoint_db = str(output_dir / CHECKPOINT_DB_NAME)
+    
+    current_date = {"date": now.strftime("%Y-%m-%d"), "day_name": now.strftime("%A")}
+    week_dates = [
+        {"date": (now + timedelta(days=offset)).strftime("%Y-%m-%d"),
+         "day_name": (now + timedelta(days=offset)).strftime("%A")}
+        for offset in range(14)
+    ]
+
+    return PreparedRun(
+        athlete_name=athlete_name,
+        output_dir=output_dir,
+        competitions=competitions,
+        outside_competitions=outside_competitions,
+        workflow_kwargs={
+            "user_id": config_parser.get_user_id(),
+            "athlete_name": athlete_name,
+            "garmin_data": garmin_data,
+            "analysis_context": analysis_context,
+            "planning_context": planning_context,
+            "competitions": competitions,
+            "current_date": current_date,
+            "week_dates": week_dates,
+            "plotting_enabled": plotting_enabled,
+            "hitl_enabled": hitl_enabled,
+            "skip_synthesis": skip_synthesis,
+            "html_stream_dir": str(output_dir) if stream_html else None,
+            "html_progress_callback": create_html_progress_logger() if stream_html else None,
+            "formatter_backends": formatter_backends,
+            "checkpoint_db": checkpoint_db,
+            "resume_execution_id": resume_execution_id,
+            "interaction_provider": interaction_provider,
+            "node_memo_db": str(output_dir / NODE_MEMO_DB_NAME) if extraction_settings["node_memo"] else None,
+            "plot_cache_db": str(output_dir / PLOT_CACHE_DB_NAME) if extraction_settings["plot_cache"] else None,
+            "timeline_path": str(output_dir / TIMELINE_FILE_NAME),
+        },
+    )
 
-        logger.info("Saving results...")
-
-        files_generated: list[str] = []
-        
-        for filename, key in [
-            ("analysis.html", "analysis_html"),
-            ("planning.html", "planning_html"),
-        ]:
-            if content := result.get(key):
-                if isinstance(content, dict):
-                    content = content.get("content", "")
-                (output_dir / filename).write_text(content, encoding="utf-8")
-                files_generated.append(filename)
-                logger.info(f"Saved: {output_dir}/{filename}")
-        
-        for filename, key in [
-            ("metrics_expert.json", "metrics_outputs"),
-            ("activity_expert.json", "activity_outputs"),
-            ("physiology_expert.json", "physiology_outputs"),
-        ]:
-            if output := result.get(key):
-                (output_dir / filename).write_text(
-                    json.dumps(output.model_dump(mode="json"), indent=2, ensure_ascii=False),
-                    encoding="utf-8"
-                )
+
+def save_results(run: PreparedRun, result: dict[str, Any]) -> None:
+    from services.ai.utils.execution_timeline import TIMELINE_FILE_NAME
+    from services.ai.utils.plan_storage import FilePlanStorage
+
+    output_dir = run.output_dir
+    logger.info("Saving results...")
+
+    files_generated: list[str] = []
+    
+    for filename, key in [
+        ("analysis.html", "analysis_html"),
+        ("planning.html", "planning_html"),
+    ]:
+        if content := result.get(key):
+            if isinstance(content, dict):
+                content = content.get("content", "")
+            (output_dir / filename).write_text(content, encoding="utf-8")
+            files_generated.append(filename)
+            logger.info(f"Saved: {output_dir}/{filename}")
+    
+    for filename, key in [
+        ("metrics_expert.json", "metrics_outputs"),
+        ("activity_expert.json", "activity_outputs"),
+        ("physiology_expert.json", "physiology_outputs"),
+    ]:
+        if output := result.get(key):
+            (output_dir / filename).write_text(
+                json.dumps(output.model_dump(mode="json"), indent=2, ensure_ascii=False),
+                encoding="utf-8"
+            )
+            files_generated.append(filename)
+            logger.info(f"Saved: {output_dir}/{filename}")
+    
+    for filename, key in [
+        ("season_plan.md", "season_plan"),
+        ("weekly_plan.md", "weekly_plan"),
+    ]:
+        if plan_dict := result.get(key):
+            output = plan_dict.get("output", plan_dict)
+            if isinstance(output, str):
+                (output_dir / filename).write_text(output, encoding="utf-8")
                 files_generated.append(filename)
                 logger.info(f"Saved: {output_dir}/{filename}")
-        
-        for filename, key in [
-            ("season_plan.md", "season_plan"),
-            ("weekly_plan.md", "weekly_plan"),
-        ]:
-            if plan_dict := result.get(key):
-                output = plan_dict.get("output", plan_dict)
-                if isinstance(output, str):
-                    (output_dir / filename).write_text(output, encoding="utf-8")
-                    files_generated.append(filename)
-                    logger.info(f"Saved: {output_dir}/{filename}")
-                    
-                    # Also save to persistent storage
-                    storage = FilePlanStorage()
-                    plan_type = "season_plan" if key == "season_plan" else "weekly_plan"
-                    # Use the user_id from the result or default to "cli_user"
-                    user_id = result.get("user_id", "cli_user")
-                    storage.save_plan(user_id, plan_type, output)
-
-        cost_total = float(
-            result.get("cost_summary", {}).get("total_cost_usd", 0.0) or
-            result.get("execution_metadata", {}).get("total_cost_usd", 0.0) or
-            sum(cost.get("total_cost", 0) for cost in result.get("costs", []))
-        )
-        total_tokens = int(
-            result.get("cost_summary", {}).get("total_tokens", 0) or
-            result.get("execution_metadata", {}).get("total_tokens", 0)
-        )
+                
+                # Also save to persistent storage
+                storage = FilePlanStorage()
+                plan_type = "season_plan" if key == "season_plan" else "weekly_plan"
+                # Use the user_id from the result or default to "cli_user"
+                user_id = result.get("user_id", "cli_user")
+                storage.save_plan(user_id, plan_type, output)
+
+    if (output_dir / TIMELINE_FILE_NAME).exists():
+        files_generated.append(TIMELINE_FILE_NAME)
+    critical_path = result.get("execution_metadata", {}).get("critical_path", {})
+
+    cost_total = float(
+        result.get("cost_summary", {}).get("total_cost_usd", 0.0) or
+        result.get("execution_metadata", {}).get("total_cost_usd", 0.0) or
+        sum(cost.get("total_cost", 0) for cost in result.get("costs", []))
+    )
+    total_tokens = int(
+        result.get("cost_summary", {}).get("total_tokens", 0) or
+        result.get("execution_metadata", {}).get("total_tokens", 0)
+    )
+
+    (output_dir / "summary.json").write_text(
+        json.dumps({
+            "athlete": run.athlete_name,
+            "analysis_date": datetime.now().isoformat(),
+            "competitions": run.competitions,
+            "total_cost_usd": cost_total,
+            "total_tokens": total_tokens,
+            "execution_id": result.get("execution_id", ""),
+            "trace_id": result.get("execution_metadata", {}).get("trace_id", ""),
+            "root_run_id": result.get("execution_metadata", {}).get("root_run_id", ""),
+            "critical_path": critical_path,
+            "files_generated": files_generated,
+        }, indent=2, ensure_ascii=False),
+        encoding="utf-8"
+    )
 
-        (output_dir / "summary.json").write_text(
-            json.dumps({
-                "athlete": athlete_name,
-                "analysis_date": datetime.now().isoformat(),
-                "competitions": competitions,
-                "total_cost_usd": cost_total,
-                "total_tokens": total_tokens,
-                "execution_id": result.get("execution_id", ""),
-                "trace_id": result.get("execution_metadata", {}).get("trace_id", ""),
-                "root_run_id": result.get("execution_metadata", {}).get("root_run_id", ""),
-                "files_generated": files_generated,
-            }, indent=2, ensure_ascii=False),
-            encoding="utf-8"
+    logger.info("✅ Analysis completed successfully!")
+    if run.outside_competitions:
+        logger.info(f"✅  Added {len(run.outside_competitions)} Outside competitions from config")
+    logger.info(f"📁 Results saved to: {output_dir}")
+    logger.info(f"💰 Total cost: ${cost_total:.2f} ({total_tokens} tokens)")
+    if critical_path.get("path"):
+        logger.info(
+            f"⏱️  Critical path ({critical_path['duration_seconds']}s): {' -> '.join(critical_path['path'])}"
         )
 
-        logger.info("✅ Analysis completed successfully!")
-        if outside_competitions:
-            logger.info(f"✅  Added {len(outside_competitions)} Outside competitions from config")
-        logger.info(f"📁 Results saved to: {output_dir}")
-        logger.info(f"💰 Total cost: ${cost_total:.2f} ({total_tokens} tokens)")
+
+async def run_analysis_from_config(config_path: Path, resume_execution_id: str | None = None) -> None:
+    try:
+        run = await prepare_run(config_path, resume_execution_id)
+        from services.ai.langgraph.workflows.planning_workflow import run_complete_analysis_and_planning
+
+        logger.info("Running AI analysis and planning...")
+
+        result = await run_complete_analysis_and_planning(**run.workflow_kwargs)
+        save_results(run, result)
     except Exception as e:
         logger.error(f"❌ Analysis failed: {e}")
         raise
 
 
+async def run_batch_from_configs(config_paths: list[Path]) -> None:
+    ai_modes = set()
+    user_ids = set()
+    output_dirs = set()
+    for config_path in config_paths:
+        config_parser = ConfigParser(config_path)
+        extraction_settings = config_parser.get_extraction_config()
+        if extraction_settings["hitl_enabled"]:
+            raise ValueError(f"{config_path}: batch mode requires 'extraction.hitl_enabled: false'")
+        ai_modes.add(extraction_settings["ai_mode"])
+        if len(ai_modes) > 1:
+            raise ValueError("All configs in a batch must use the same ai_mode")
+        if (user_id := config_parser.get_user_id()) in user_ids:
+            raise ValueError(f"{config_path}: every config in a batch needs a distinct 'athlete.user_id'")
+        user_ids.add(user_id)
+        # Checkpoints, memo/plot caches and reports live in the output directory, so runs must not share one.
+        if (output_dir := config_parser.get_output_directory().resolve()) in output_dirs:
+            raise ValueError(f"{config_path}: every config in a batch needs a distinct 'output.directory'")
+        output_dirs.add(output_dir)
+
+    # Scheduling, hedging and AI mode are process-wide, so the first config sets them for the batch.
+    apply_runtime_settings(ConfigParser(config_paths[0]))
+    # Password prompts are read one at a time; Garmin logins and extractions then run concurrently.
+    passwords = [ConfigParser(config_path).get_password() for config_path in config_paths]
+    runs = list(await asyncio.gather(*(
+        prepare_run(config_path, password=password, configure_runtime=False)
+        for config_path, password in zip(config_paths, passwords, strict=True)
+    )))
+
+    from services.ai.langgraph.workflows.planning_workflow import run_batch_analysis_and_planning
+    from services.ai.utils.batch_execution import create_batch_coordinator
+
+    coordinator = create_batch_coordinator(**ConfigParser(config_paths[0]).get_batch_settings())
+    logger.info(f"Running {len(runs)} athletes in batch mode (batched providers: {sorted(coordinator.backends) or 'none'})")
+
+    results = await run_batch_analysis_and_planning([run.workflow_kwargs for run in runs], coordinator)
+
+    failed = 0
+    for run, result in zip(runs, results, strict=True):
+        if isinstance(result, BaseException):
+            failed += 1
+            logger.error(f"❌ Analysis failed for {run.athlete_name}: {result}")
+        else:
+            save_results(run, result)
+
+    logger.info(f"Batch jobs: {coordinator.get_stats()}")
+    if failed:
+        raise RuntimeError(f"{failed} of {len(runs)} batch runs failed")
+
+
 def create_config_template(output_path: Path) -> None:
     template_path = Path(__file__).parent / "coach_config_template.yaml"
 
@@ -295,8 +562,20 @@ def main():
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--config", type=Path, help="Path to configuration file (YAML or JSON)")
     group.add_argument("--init-config", type=Path, help="Create a configuration template file")
+    group.add_argument(
+        "--batch",
+        type=Path,
+        nargs="+",
+        metavar="CONFIG",
+        help="Run several non-interactive configs together through the providers' batch APIs",
+    )
 
     parser.add_argument("--output-dir", type=Path, help="Override output directory from config")
+    parser.add_argument(
+        "--resume",
+        metavar="EXECUTION_ID",
+        help="Resume a failed or interrupted run from its last checkpoint (requires --config)",
+    )
 
     args = parser.parse_args()
 
@@ -306,13 +585,22 @@ def main():
 
     if args.config:
         try:
-            asyncio.run(run_analysis_from_config(args.config))
+            asyncio.run(run_analysis_from_config(args.config, args.resume))
         except KeyboardInterrupt:
             logger.info("❌ Analysis cancelled by user")
         except Exception as e:
             logger.error(f"❌ Analysis failed: {e}")
             sys.exit(1)
 
+    if args.batch:
+        try:
+            asyncio.run(run_batch_from_configs(args.batch))
+        except KeyboardInterrupt:
+            logger.info("❌ Batch run cancelled by user")
+        except Exception as e:
+            logger.error(f"❌ Batch run failed: {e}")
+            sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
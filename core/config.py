@@ -1,17 +1,20 @@
 
+import logging
 import os
 from dataclasses import dataclass
-
-from dotenv import load_dotenv
-
-env_file = os.getenv('ENV_FILE', '.env')
-load_dotenv(env_file)
-
-import logging
 from enum import Enum
 
 logger = logging.getLogger(__name__)
 
+def load_env_file() -> None:
+    # Deferred from import time: commands that never read settings skip python-dotenv entirely.
+    if getattr(load_env_file, "_loaded", False):
+        return
+    from dotenv import load_dotenv
+
+    load_dotenv(os.getenv('ENV_FILE', '.env'))
+    load_env_file._loaded = True
+
 class AIMode(Enum):
     STANDARD = "standard"
     COST_EFFECTIVE = "cost_effective"
@@ -29,6 +32,7 @@ class Config:
 
     @classmethod
     def from_env(cls) -> 'Config':
+        load_env_file()
         anthropic_api_key = os.getenv('ANTHROPIC_API_KEY')
         openai_api_key = os.getenv('OPENAI_API_KEY')
         deepseek_api_key = os.getenv("DEEPSEEK_API_KEY")
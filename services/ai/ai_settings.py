@@ -54,6 +54,8 @@ class AISettings:
         }
     )
 
+    generation: int = 0
+
     def get_model_for_role(self, role: AgentRole) -> str:
         return self.model_assignments[self.mode][role]
 
@@ -63,6 +65,7 @@ class AISettings:
 
     def reload(self) -> None:
         self.mode = get_config().ai_mode
+        self.generation += 1
 
 
 # Global settings instance
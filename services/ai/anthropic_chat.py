@@ -0,0 +1,33 @@
+from functools import cached_property
+from typing import Any
+
+import anthropic
+from langchain_anthropic import ChatAnthropic
+from pydantic import Field
+
+
+class ChatAnthropicWithHttpClient(ChatAnthropic):
+    """ChatAnthropic that takes an `http_async_client`, like ChatOpenAI.
+
+    langchain-anthropic has no parameter for the SDK's HTTP client, and batch mode needs one whose
+    transport goes through the batch coordinator. The SDK client is built from public fields only.
+    """
+
+    http_async_client: Any | None = Field(default=None, exclude=True)
+
+    @cached_property
+    def _async_client(self) -> anthropic.AsyncClient:
+        if self.http_async_client is None:
+            return super()._async_client
+
+        params: dict[str, Any] = {
+            "api_key": self.anthropic_api_key.get_secret_value(),
+            "base_url": self.anthropic_api_url,
+            "max_retries": self.max_retries,
+            "default_headers": self.default_headers or None,
+            "http_client": self.http_async_client,
+        }
+        # Same convention as ChatAnthropic: a timeout <= 0 is ignored, None disables it.
+        if self.default_request_timeout is None or self.default_request_timeout > 0:
+            params["timeout"] = self.default_request_timeout
+        return anthropic.AsyncClient(**params)
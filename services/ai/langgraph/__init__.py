@@ -1,7 +1,19 @@
-from .config.langsmith_config import LangSmithConfig
-from .state.training_analysis_state import TrainingAnalysisState
+import importlib
+
+# Exports resolve on first access, so importing a light submodule (rendering, utils) does not
+# pull in langgraph and langchain.
+_LAZY_EXPORTS = {
+    "LangSmithConfig": ".config.langsmith_config",
+    "TrainingAnalysisState": ".state.training_analysis_state",
+}
 
 __all__ = [
     "TrainingAnalysisState",
     "LangSmithConfig",
 ]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_EXPORTS:
+        return getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
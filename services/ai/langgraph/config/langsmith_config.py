@@ -1,6 +1,8 @@
 import logging
 import os
 
+from core.config import load_env_file
+
 logger = logging.getLogger(__name__)
 
 
@@ -11,6 +13,7 @@ class LangSmithConfig:
         project_name: str = "garmin_ai_coach_analysis", api_key: str | None = None
     ) -> bool:
         try:
+            load_env_file()
             if api_key:
                 os.environ["LANGSMITH_API_KEY"] = api_key
 
@@ -1,7 +1,8 @@
-import json
 import logging
 from datetime import datetime
 
+from langchain_core.runnables import RunnableConfig
+
 from services.ai.ai_settings import AgentRole
 from services.ai.model_config import ModelSelector
 from services.ai.tools.plotting import PlotStorage
@@ -9,12 +10,16 @@ from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backo
 
 from ..schemas import ActivityExpertOutputs
 from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.blob_store import get_blob_store
 from .node_base import (
     configure_node_tools,
     create_cost_entry,
     create_plot_entries,
     execute_node_with_error_handling,
+    expert_memo_inputs,
+    expert_prompt_inputs,
     log_node_completion,
+    memoize_node,
 )
 from .prompt_components import (
     get_hitl_instructions,
@@ -37,7 +42,7 @@ ACTIVITY_EXPERT_USER_PROMPT = """Interpret activity summaries to identify patter
 
 ## Inputs
 ### Activity Summary
-{activity_summary}
+{data}
 ### Context
 - Competitions: ```json {competitions} ```
 - Date: ```json {current_date} ```
@@ -72,7 +77,10 @@ Produce 3 structured fields:
 **Important**: Tailor content for each consumer. BE CONCISE."""
 
 
-async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list | str | dict]:
+@memoize_node("activity_expert", AgentRole.ACTIVITY_EXPERT, expert_memo_inputs("activity_summary", "activity_expert_messages"))
+async def activity_expert_node(
+    state: TrainingAnalysisState, config: RunnableConfig | None = None
+) -> dict[str, list | str | dict]:
     logger.info("Starting activity expert node")
 
     plot_storage = PlotStorage(state["execution_id"])
@@ -88,6 +96,7 @@ async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         agent_name="activity",
         plot_storage=plot_storage,
         plotting_enabled=plotting_enabled,
+        config=config,
     )
 
     system_prompt = (
@@ -97,9 +106,11 @@ async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         (get_hitl_instructions("activity") if hitl_enabled else "")
     )
 
-    base_llm = ModelSelector.get_llm(AgentRole.ACTIVITY_EXPERT)
-    llm_with_tools = base_llm.bind_tools(tools) if tools else base_llm
-    llm_with_structure = llm_with_tools.with_structured_output(ActivityExpertOutputs)
+    def bind_llm(llm):
+        llm_with_tools = llm.bind_tools(tools) if tools else llm
+        return llm_with_tools.with_structured_output(ActivityExpertOutputs)
+
+    llm_with_structure = bind_llm(ModelSelector.get_llm(AgentRole.ACTIVITY_EXPERT))
 
     agent_start_time = datetime.now()
 
@@ -116,10 +127,7 @@ async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         base_messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": ACTIVITY_EXPERT_USER_PROMPT.format(
-                activity_summary=state.get("activity_summary", ""),
-                competitions=json.dumps(state["competitions"], indent=2),
-                current_date=json.dumps(state["current_date"], indent=2),
-                analysis_context=state["analysis_context"],
+                **expert_prompt_inputs(state, "activity_summary")
             )},
         ]
         
@@ -128,6 +136,8 @@ async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list |
             messages=base_messages + qa_messages,
             tools=tools,
             max_iterations=15,
+            agent_role=AgentRole.ACTIVITY_EXPERT,
+            bind_llm=bind_llm,
         )
 
     async def node_execution():
@@ -136,7 +146,9 @@ async def activity_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         )
 
         execution_time = (datetime.now() - agent_start_time).total_seconds()
-        plots, plot_storage_data, available_plots = create_plot_entries("activity_expert", plot_storage)
+        plots, plot_storage_data, available_plots = create_plot_entries(
+            "activity_expert", plot_storage, get_blob_store(config)
+        )
 
         log_node_completion("Activity expert", execution_time, len(available_plots))
 
@@ -40,9 +40,14 @@ Input Data:
 
 Repeat for each activity, newest to oldest."""
 
+# Roughly 5-8 activities with lap details per chunk; smaller blocks stay a single call.
+ACTIVITY_CHUNK_TOKENS = 12_000
+ACTIVITY_CHUNK_CONCURRENCY = 4
 
-def extract_activity_data(state: TrainingAnalysisState) -> dict:
-    return state["garmin_data"].get("recent_activities", [])
+
+def extract_activity_data(state: TrainingAnalysisState) -> list:
+    activities = state["garmin_data"].get("recent_activities") or []
+    return sorted(activities, key=lambda activity: activity.get("start_time") or "", reverse=True)
 
 
 activity_summarizer_node = create_data_summarizer_node(
@@ -53,4 +58,6 @@ activity_summarizer_node = create_data_summarizer_node(
     agent_type="activity_summarizer",
     system_prompt=ACTIVITY_SUMMARIZER_SYSTEM_PROMPT,
     user_prompt=ACTIVITY_SUMMARIZER_USER_PROMPT,
+    max_chunk_tokens=ACTIVITY_CHUNK_TOKENS,
+    max_parallel_chunks=ACTIVITY_CHUNK_CONCURRENCY,
 )
@@ -1,16 +1,23 @@
+import asyncio
 import json
 import logging
+import math
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
+
 from services.ai.ai_settings import AgentRole
 from services.ai.model_config import ModelSelector
+from services.ai.utils.llm_scheduler import CHARS_PER_TOKEN, track_queue_wait
 from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backoff
 
 from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.blob_store import GarminDataView, get_blob_store
+from .node_base import create_cost_entry
 from .prompt_components import AgentType, get_workflow_context
-from .tool_calling_helper import extract_text_content
+from .tool_calling_helper import extract_text_content, scheduled_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +56,31 @@ GENERIC_SUMMARIZER_USER_PROMPT = """Extract and organize ALL important metrics f
 Deliver a complete, number-rich but token efficient summary."""
 
 
+def estimate_json_tokens(data: Any) -> int:
+    return len(json.dumps(data, indent=2)) // CHARS_PER_TOKEN
+
+
+def chunk_by_token_budget(items: list[Any], max_chunk_tokens: int) -> list[list[Any]]:
+    """Split `items` into contiguous chunks of roughly equal token size, none above the budget
+    unless a single item already exceeds it."""
+    if not items:
+        return [items]
+
+    sizes = [estimate_json_tokens(item) for item in items]
+    chunk_count = max(1, math.ceil(sum(sizes) / max_chunk_tokens))
+    target = min(max_chunk_tokens, math.ceil(sum(sizes) / chunk_count))
+
+    chunks: list[list[Any]] = [[]]
+    chunk_tokens = 0
+    for item, size in zip(items, sizes, strict=True):
+        if chunks[-1] and chunk_tokens + size > target:
+            chunks.append([])
+            chunk_tokens = 0
+        chunks[-1].append(item)
+        chunk_tokens += size
+    return chunks
+
+
 def create_data_summarizer_node(
     node_name: str,
     agent_role: AgentRole,
@@ -57,44 +89,74 @@ def create_data_summarizer_node(
     agent_type: AgentType,
     system_prompt: str | None = None,
     user_prompt: str | None = None,
+    max_chunk_tokens: int | None = None,
+    max_parallel_chunks: int = 4,
 ) -> Callable:
+    """Build a node that summarizes extracted data with a single LLM call.
+
+    With `max_chunk_tokens` set and list-shaped data, the list is split into token-bounded
+    chunks that are summarized concurrently (at most `max_parallel_chunks` at a time) and
+    joined in input order.
+    """
     
     workflow_context = get_workflow_context(agent_type)
     base_system_prompt = system_prompt or GENERIC_SUMMARIZER_SYSTEM_PROMPT
     effective_system_prompt = base_system_prompt + workflow_context
     effective_user_prompt = user_prompt or GENERIC_SUMMARIZER_USER_PROMPT
     
-    async def summarizer_node(state: TrainingAnalysisState) -> dict[str, list | str]:
+    async def summarizer_node(state: TrainingAnalysisState, config: RunnableConfig | None = None) -> dict[str, list | str]:
         logger.info(f"Starting {node_name} node")
         
         try:
             agent_start_time = datetime.now()
             
-            data_to_summarize = data_extractor(state)
+            garmin_data = GarminDataView(state.get("garmin_data") or {}, get_blob_store(config))
+            data_to_summarize = data_extractor({**state, "garmin_data": garmin_data})
             
-            async def call_llm():
-                response = await ModelSelector.get_llm(agent_role).ainvoke([
+            async def call_llm(data):
+                messages = [
                     {"role": "system", "content": effective_system_prompt},
                     {"role": "user", "content": effective_user_prompt.format(
-                        data=json.dumps(data_to_summarize, indent=2)
+                        data=json.dumps(data, indent=2)
                     )},
-                ])
+                ]
+                async with scheduled_llm_call(agent_role, messages):
+                    response = await ModelSelector.get_llm(agent_role).ainvoke(messages)
                 return extract_text_content(response)
-            
-            summary = await retry_with_backoff(
-                call_llm, AI_ANALYSIS_CONFIG, f"{node_name}"
+
+            chunks = (
+                chunk_by_token_budget(data_to_summarize, max_chunk_tokens)
+                if max_chunk_tokens and isinstance(data_to_summarize, list)
+                else [data_to_summarize]
             )
+
+            if len(chunks) == 1:
+                summary = await retry_with_backoff(
+                    lambda: call_llm(chunks[0]), AI_ANALYSIS_CONFIG, f"{node_name}"
+                )
+            else:
+                logger.info(f"{node_name}: summarizing {len(data_to_summarize)} items in {len(chunks)} chunks")
+                semaphore = asyncio.Semaphore(max_parallel_chunks)
+
+                async def summarize_chunk(index: int, chunk: list) -> str:
+                    async with semaphore:
+                        return await retry_with_backoff(
+                            lambda: call_llm(chunk), AI_ANALYSIS_CONFIG, f"{node_name} chunk {index + 1}/{len(chunks)}"
+                        )
+
+                track_queue_wait()
+                async with asyncio.TaskGroup() as group:
+                    tasks = [group.create_task(summarize_chunk(i, chunk)) for i, chunk in enumerate(chunks)]
+                summary = "\n\n".join(task.result().strip() for task in tasks)
             
             execution_time = (datetime.now() - agent_start_time).total_seconds()
             logger.info(f"{node_name} completed in {execution_time:.2f}s")
             
             return {
                 state_output_key: summary,
-                "costs": [{
-                    "agent": state_output_key.replace("_summary", "_summarizer"),
-                    "execution_time": execution_time,
-                    "timestamp": datetime.now().isoformat(),
-                }],
+                "costs": [create_cost_entry(
+                    state_output_key.replace("_summary", "_summarizer"), execution_time
+                )],
             }
         
         except Exception as e:
@@ -1,12 +1,18 @@
 import logging
 from datetime import datetime
+from pathlib import Path
+
+from langchain_core.runnables import RunnableConfig
 
 from services.ai.ai_settings import AgentRole
 from services.ai.model_config import ModelSelector
 from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backoff
 
+from ..rendering import render_analysis_html
 from ..state.training_analysis_state import TrainingAnalysisState
-from .tool_calling_helper import extract_text_content
+from ..utils.html_stream_writer import get_html_progress_callback, stream_llm_html
+from .node_base import create_cost_entry
+from .tool_calling_helper import extract_text_content, scheduled_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +48,9 @@ FORMATTER_PLOT_INSTRUCTIONS = """
 - **Spacing**: Ensure CSS provides vertical space (~500px) for the interactive charts that will replace them."""
 
 
-async def formatter_node(state: TrainingAnalysisState) -> dict[str, list | str]:
+async def formatter_node(
+    state: TrainingAnalysisState, config: RunnableConfig | None = None
+) -> dict[str, list | str]:
     logger.info("Starting HTML formatter node")
 
     try:
@@ -54,32 +62,50 @@ async def formatter_node(state: TrainingAnalysisState) -> dict[str, list | str]:
 
         agent_start_time = datetime.now()
 
+        stream_dir = state.get("html_stream_dir")
+
         async def call_html_formatting():
             synthesis_result = extract_text_content(state.get("synthesis_result", ""))
-            
-            response = await ModelSelector.get_llm(AgentRole.FORMATTER).ainvoke([
+            messages = [
                 {"role": "system", "content": FORMATTER_SYSTEM_PROMPT},
                 {"role": "user", "content": (
                     FORMATTER_USER_PROMPT_BASE.format(synthesis_result=synthesis_result)
                     + (FORMATTER_PLOT_INSTRUCTIONS if plotting_enabled else "")
                 )},
-            ])
-            return extract_text_content(response)
-
-        analysis_html = await retry_with_backoff(
-            call_html_formatting, AI_ANALYSIS_CONFIG, "HTML Formatting"
-        )
+            ]
+            llm = ModelSelector.get_llm(AgentRole.FORMATTER)
+
+            async with scheduled_llm_call(AgentRole.FORMATTER, messages):
+                if stream_dir:
+                    return await stream_llm_html(
+                        llm,
+                        messages,
+                        Path(stream_dir) / "analysis.html",
+                        "analysis_html",
+                        get_html_progress_callback(config),
+                    )
+
+                response = await llm.ainvoke(messages)
+                return extract_text_content(response)
+
+        if state.get("formatter_backends", {}).get("formatter") == "local":
+            logger.info("Formatter node: Rendering HTML locally from templates")
+            analysis_html = render_analysis_html(
+                extract_text_content(state.get("synthesis_result", "")),
+                athlete_name=state.get("athlete_name", ""),
+                current_date=state.get("current_date"),
+            )
+        else:
+            analysis_html = await retry_with_backoff(
+                call_html_formatting, AI_ANALYSIS_CONFIG, "HTML Formatting"
+            )
 
         execution_time = (datetime.now() - agent_start_time).total_seconds()
         logger.info(f"HTML formatting completed in {execution_time:.2f}s")
 
         return {
             "analysis_html": analysis_html,
-            "costs": [{
-                "agent": "formatter",
-                "execution_time": execution_time,
-                "timestamp": datetime.now().isoformat(),
-            }],
+            "costs": [create_cost_entry("formatter", execution_time)],
         }
 
     except Exception as e:
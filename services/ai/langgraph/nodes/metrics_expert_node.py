@@ -1,7 +1,8 @@
-import json
 import logging
 from datetime import datetime
 
+from langchain_core.runnables import RunnableConfig
+
 from services.ai.ai_settings import AgentRole
 from services.ai.model_config import ModelSelector
 from services.ai.tools.plotting import PlotStorage
@@ -9,12 +10,16 @@ from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backo
 
 from ..schemas import MetricsExpertOutputs
 from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.blob_store import get_blob_store
 from .node_base import (
     configure_node_tools,
     create_cost_entry,
     create_plot_entries,
     execute_node_with_error_handling,
+    expert_memo_inputs,
+    expert_prompt_inputs,
     log_node_completion,
+    memoize_node,
 )
 from .prompt_components import (
     get_hitl_instructions,
@@ -75,7 +80,10 @@ Produce 3 structured fields:
 
 
 
-async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list | str | dict]:
+@memoize_node("metrics", AgentRole.METRICS_EXPERT, expert_memo_inputs("metrics_summary", "metrics_expert_messages"))
+async def metrics_expert_node(
+    state: TrainingAnalysisState, config: RunnableConfig | None = None
+) -> dict[str, list | str | dict]:
     logger.info("Starting metrics expert analysis node")
 
     plot_storage = PlotStorage(state["execution_id"])
@@ -91,6 +99,7 @@ async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         agent_name="metrics",
         plot_storage=plot_storage,
         plotting_enabled=plotting_enabled,
+        config=config,
     )
 
     system_prompt = (
@@ -100,10 +109,11 @@ async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         (get_hitl_instructions("metrics") if hitl_enabled else "")
     )
 
-    base_llm = ModelSelector.get_llm(AgentRole.METRICS_EXPERT)
-    
-    llm_with_tools = base_llm.bind_tools(tools) if tools else base_llm
-    llm_with_structure = llm_with_tools.with_structured_output(MetricsExpertOutputs)
+    def bind_llm(llm):
+        llm_with_tools = llm.bind_tools(tools) if tools else llm
+        return llm_with_tools.with_structured_output(MetricsExpertOutputs)
+
+    llm_with_structure = bind_llm(ModelSelector.get_llm(AgentRole.METRICS_EXPERT))
 
     agent_start_time = datetime.now()
 
@@ -120,10 +130,7 @@ async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list |
         base_messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": METRICS_USER_PROMPT.format(
-                data=state.get("metrics_summary", "No metrics summary available"),
-                competitions=json.dumps(state["competitions"], indent=2),
-                current_date=json.dumps(state["current_date"], indent=2),
-                analysis_context=state["analysis_context"],
+                **expert_prompt_inputs(state, "metrics_summary", "No metrics summary available")
             )},
         ]
         
@@ -132,6 +139,8 @@ async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list |
             messages=base_messages + qa_messages,
             tools=tools,
             max_iterations=15,
+            agent_role=AgentRole.METRICS_EXPERT,
+            bind_llm=bind_llm,
         )
 
     async def node_execution():
@@ -142,7 +151,9 @@ async def metrics_expert_node(state: TrainingAnalysisState) -> dict[str, list |
 
         execution_time = (datetime.now() - agent_start_time).total_seconds()
         
-        plots, plot_storage_data, available_plots = create_plot_entries("metrics", plot_storage)
+        plots, plot_storage_data, available_plots = create_plot_entries(
+            "metrics", plot_storage, get_blob_store(config)
+        )
         
         log_node_completion("Metrics expert analysis", execution_time, len(available_plots))
 
@@ -1,10 +1,25 @@
+import hashlib
+import inspect
+import json
 import logging
 from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
+
 from langgraph.errors import GraphInterrupt
+from services.ai.ai_settings import AgentRole, ai_settings
+from services.ai.model_config import ModelSelector
 from services.ai.tools.plotting import PlotStorage, create_plotting_tools
+from services.ai.tools.plotting.plot_datasets import get_plot_dataset_dir
+from services.ai.tools.plotting.plot_result_cache import get_plot_cache
+from services.ai.utils.llm_hedging import consume_hedge_stats
+from services.ai.utils.llm_scheduler import consume_queue_wait
+
+from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.blob_store import BlobStore, get_blob_store, inline_plot_html, offload_plot_html
+from ..utils.node_memo import fingerprint_inputs, get_node_memo
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +28,17 @@ def configure_node_tools(
     agent_name: str,
     plot_storage: PlotStorage | None = None,
     plotting_enabled: bool = False,
+    config: RunnableConfig | None = None,
 ) -> list:
     tools = []
     
     if plotting_enabled and plot_storage:
-        plotting_tool = create_plotting_tools(plot_storage, agent_name=agent_name)
+        plotting_tool = create_plotting_tools(
+            plot_storage,
+            agent_name=agent_name,
+            dataset_dir=get_plot_dataset_dir(config),
+            cache=get_plot_cache(config),
+        )
         tools.append(plotting_tool)
         logger.debug(f"{agent_name}: Added plotting tool")
     
@@ -29,11 +50,17 @@ def create_cost_entry(agent_name: str, execution_time: float) -> dict[str, Any]:
     return {
         "agent": agent_name,
         "execution_time": execution_time,
+        "queue_wait_time": consume_queue_wait(),
+        **consume_hedge_stats(),
         "timestamp": datetime.now().isoformat(),
     }
 
 
-def create_plot_entries(agent_name: str, plot_storage: PlotStorage) -> tuple[list, dict, list]:
+def create_plot_entries(
+    agent_name: str,
+    plot_storage: PlotStorage,
+    blob_store: BlobStore | None = None,
+) -> tuple[list, dict, list]:
     
     all_plots = plot_storage.get_all_plots()
     timestamp_iso = datetime.now().isoformat()
@@ -55,11 +82,12 @@ def create_plot_entries(agent_name: str, plot_storage: PlotStorage) -> tuple[lis
             "created_at": metadata.created_at.isoformat(),
             "html_content": metadata.html_content,
             "data_summary": metadata.data_summary,
+            "optimization": metadata.optimization,
         }
         for plot_id, metadata in all_plots.items()
     }
     
-    return plots, plot_storage_data, list(all_plots.keys())
+    return plots, offload_plot_html(plot_storage_data, blob_store), list(all_plots.keys())
 
 
 async def execute_node_with_error_handling(
@@ -85,4 +113,85 @@ def log_node_completion(node_name: str, execution_time: float, plot_count: int =
     logger.info(
         f"{node_name} completed in {execution_time:.2f}s"
         + (f" with {plot_count} plots" if plot_count > 0 else "")
-    )
\ No newline at end of file
+    )
+
+def expert_prompt_inputs(state: TrainingAnalysisState, summary_key: str, missing_summary: str = "") -> dict[str, Any]:
+    """Values formatted into an expert's user prompt; the node memo fingerprints the same values."""
+    return {
+        "data": state.get(summary_key, missing_summary),
+        "competitions": json.dumps(state.get("competitions"), indent=2),
+        "current_date": json.dumps(state.get("current_date"), indent=2),
+        "analysis_context": state.get("analysis_context"),
+    }
+
+
+def expert_memo_inputs(summary_key: str, messages_key: str) -> Callable[[TrainingAnalysisState], dict[str, Any]]:
+    def inputs(state: TrainingAnalysisState) -> dict[str, Any]:
+        return {
+            **expert_prompt_inputs(state, summary_key),
+            "athlete_name": state.get("athlete_name"),
+            "messages": state.get(messages_key, []),
+            "plotting_enabled": state.get("plotting_enabled", False),
+            "hitl_enabled": state.get("hitl_enabled", True),
+        }
+
+    return inputs
+
+
+def memoize_node(
+    agent_name: str,
+    agent_role: AgentRole,
+    memo_inputs: Callable[[TrainingAnalysisState], dict[str, Any]],
+) -> Callable:
+    """Serve a node's previous state update when its inputs, model and code are unchanged.
+
+    Active only when a memo store is passed in the run config. Cost entries carry `memo_hit`.
+    """
+
+    def decorate(node_function: Callable) -> Callable:
+        code_version = hashlib.sha256(inspect.getsource(inspect.getmodule(node_function)).encode()).hexdigest()
+        takes_config = "config" in inspect.signature(node_function).parameters
+
+        async def run_node(state, config: RunnableConfig | None) -> dict[str, Any]:
+            return await (node_function(state, config) if takes_config else node_function(state))
+
+        async def memoized(state, config: RunnableConfig | None = None) -> dict[str, Any]:
+            memo = get_node_memo(config)
+            if memo is None:
+                return await run_node(state, config)
+
+            model_name = ai_settings.get_model_for_role(agent_role)
+            fingerprint = fingerprint_inputs(agent_name, {
+                **memo_inputs(state),
+                "model": ModelSelector.CONFIGURATIONS[model_name].name,
+                "model_alias": model_name,
+                "code_version": code_version,
+            })
+
+            # Plot HTML is memoized inline: blob handles only resolve within one execution's store.
+            blob_store = get_blob_store(config)
+            if (cached := memo.get(agent_name, fingerprint)) is not None:
+                logger.info(f"{agent_name}: inputs unchanged, reusing memoized result ({fingerprint[:12]})")
+                if cached.get("plot_storage_data"):
+                    cached["plot_storage_data"] = offload_plot_html(cached["plot_storage_data"], blob_store)
+                return {**cached, "costs": [{**create_cost_entry(agent_name, 0.0), "memo_hit": True}]}
+
+            result = await run_node(state, config)
+            if not result.get("errors"):
+                update = {key: value for key, value in result.items() if key != "costs"}
+                if update.get("plot_storage_data"):
+                    update["plot_storage_data"] = inline_plot_html(update["plot_storage_data"], blob_store)
+                memo.put(agent_name, fingerprint, update)
+            if "costs" in result:
+                result["costs"] = [{**cost, "memo_hit": False} for cost in result["costs"]]
+            return result
+
+        # Not functools.wraps: LangGraph reads the signature to decide whether to pass config,
+        # and the state annotation to infer the node's input schema.
+        memoized.__name__ = node_function.__name__
+        memoized.__qualname__ = node_function.__qualname__
+        memoized.__doc__ = node_function.__doc__
+        memoized.__annotations__ = {**node_function.__annotations__, "config": RunnableConfig | None}
+        return memoized
+
+    return decorate
@@ -1,52 +1,23 @@
 import logging
-from typing import Protocol
 
 from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableConfig
 
 from langgraph.types import Command
 from services.ai.ai_settings import AgentRole
 
 from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.interaction_providers import (
+    AsyncConsoleInteractionProvider,
+    AsyncInteractionProvider,
+    InteractionProvider,
+    collect_answers,
+    get_interaction_provider,
+)
 
 logger = logging.getLogger(__name__)
 
 
-class InteractionProvider(Protocol):
-    def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
-        ...
-
-
-class ConsoleInteractionProvider:
-    def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
-        answers = []
-        
-        print(f"\n{'='*60}")
-        print(f"HITL INTERACTION REQUIRED - {stage_name}")
-        print(f"{'='*60}")
-        
-        for i, qa in enumerate(questions, 1):
-            agent_name = qa["agent"].replace("_", " ").title()
-            question_data = qa["question"]
-            
-            print(f"\nQuestion {i}/{len(questions)} from {agent_name}:")
-            print(f"  {question_data['message']}")
-            if question_data.get("context"):
-                print(f"  Context: {question_data['context']}")
-            
-            user_answer = input("\n👤 Your answer: ").strip()
-            
-            logger.info(f"User answered {agent_name} question {i}: {user_answer}")
-            
-            answers.append({
-                "agent": qa["agent"],
-                "question": question_data["message"],
-                "answer": user_answer
-            })
-        
-        print(f"\n{'='*60}\n")
-        return answers
-
-
 class MasterOrchestrator:
     STAGES = {
         "analysis": {
@@ -69,10 +40,10 @@ class MasterOrchestrator:
         }
     }
     
-    def __init__(self, interaction_provider: InteractionProvider = None):
-        self.interaction_provider = interaction_provider or ConsoleInteractionProvider()
+    def __init__(self, interaction_provider: InteractionProvider | AsyncInteractionProvider | None = None):
+        self.interaction_provider = interaction_provider or AsyncConsoleInteractionProvider()
     
-    def __call__(self, state: TrainingAnalysisState) -> Command:
+    async def __call__(self, state: TrainingAnalysisState) -> Command:
         stage = self._detect_stage(state)
         config = self.STAGES[stage]
         
@@ -98,7 +69,7 @@ class MasterOrchestrator:
         
         logger.info(f"MasterOrchestrator: Found {len(all_questions)} questions, initiating HITL")
         
-        answers = self.interaction_provider.collect_answers(all_questions, config["display_name"])
+        answers = await collect_answers(self.interaction_provider, all_questions, config["display_name"])
         
         agent_qa_updates = self._create_agent_specific_qa_messages(all_questions, answers)
         
@@ -187,6 +158,6 @@ class MasterOrchestrator:
         return updates
 
 
-def master_orchestrator_node(state: TrainingAnalysisState) -> Command:
-    orchestrator = MasterOrchestrator()
-    return orchestrator(state)
\ No newline at end of file
+async def master_orchestrator_node(state: TrainingAnalysisState, config: RunnableConfig | None = None) -> Command:
+    orchestrator = MasterOrchestrator(get_interaction_provider(config))
+    return await orchestrator(state)
\ No newline at end of file
@@ -1,12 +1,18 @@
 import logging
 from datetime import datetime
+from pathlib import Path
+
+from langchain_core.runnables import RunnableConfig
 
 from services.ai.ai_settings import AgentRole
 from services.ai.model_config import ModelSelector
 from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backoff
 
+from ..rendering import render_planning_html
 from ..state.training_analysis_state import TrainingAnalysisState
-from .tool_calling_helper import extract_text_content
+from ..utils.html_stream_writer import get_html_progress_callback, stream_llm_html
+from .node_base import create_cost_entry
+from .tool_calling_helper import extract_text_content, scheduled_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +62,9 @@ Convert the markdown content into a single, self-contained HTML document.
 """
 
 
-async def plan_formatter_node(state: TrainingAnalysisState) -> dict[str, list | str]:
+async def plan_formatter_node(
+    state: TrainingAnalysisState, config: RunnableConfig | None = None
+) -> dict[str, list | str]:
     logger.info("Starting plan formatter node")
 
     try:
@@ -73,30 +81,50 @@ async def plan_formatter_node(state: TrainingAnalysisState) -> dict[str, list |
                 return value.get("output", value.get("content", value))
             return value
         
+        stream_dir = state.get("html_stream_dir")
+
         async def call_plan_formatting():
-            response = await ModelSelector.get_llm(AgentRole.FORMATTER).ainvoke([
+            messages = [
                 {"role": "system", "content": PLAN_FORMATTER_SYSTEM_PROMPT},
                 {"role": "user", "content": PLAN_FORMATTER_USER_PROMPT.format(
                     season_plan=get_content("season_plan"),
                     weekly_plan=get_content("weekly_plan")
                 )},
-            ])
-            return extract_text_content(response)
-
-        planning_html = await retry_with_backoff(
-            call_plan_formatting, AI_ANALYSIS_CONFIG, "Plan Formatter"
-        )
+            ]
+            llm = ModelSelector.get_llm(AgentRole.FORMATTER)
+
+            async with scheduled_llm_call(AgentRole.FORMATTER, messages):
+                if stream_dir:
+                    return await stream_llm_html(
+                        llm,
+                        messages,
+                        Path(stream_dir) / "planning.html",
+                        "planning_html",
+                        get_html_progress_callback(config),
+                    )
+
+                response = await llm.ainvoke(messages)
+                return extract_text_content(response)
+
+        if state.get("formatter_backends", {}).get("plan_formatter") == "local":
+            logger.info("Plan formatter node: Rendering HTML locally from templates")
+            planning_html = render_planning_html(
+                get_content("season_plan"),
+                get_content("weekly_plan"),
+                athlete_name=state.get("athlete_name", ""),
+                week_dates=state.get("week_dates"),
+            )
+        else:
+            planning_html = await retry_with_backoff(
+                call_plan_formatting, AI_ANALYSIS_CONFIG, "Plan Formatter"
+            )
 
         execution_time = (datetime.now() - agent_start_time).total_seconds()
         logger.info(f"Plan formatting completed in {execution_time:.2f}s")
 
         return {
             "planning_html": planning_html,
-            "costs": [{
-                "agent": "plan_formatter",
-                "execution_time": execution_time,
-                "timestamp": datetime.now().isoformat(),
-            }],
+            "costs": [create_cost_entry("plan_formatter", execution_time)],
         }
 
     except Exception as e:
@@ -1,16 +1,32 @@
 import logging
+import time
 from datetime import datetime
 
+from langchain_core.runnables import RunnableConfig
+
 from services.ai.tools.plotting.plot_storage import PlotMetadata, PlotStorage
 from services.ai.tools.plotting.reference_resolver import PlotReferenceResolver
 
 from ..state.training_analysis_state import TrainingAnalysisState
+from ..utils.blob_store import get_blob_store, resolve_blob
 
 logger = logging.getLogger(__name__)
 
 
-async def plot_resolution_node(state: TrainingAnalysisState) -> dict[str, str | dict | list]:
+def _size_stats(resolver: PlotReferenceResolver, plot_storage: PlotStorage, plot_ids: list[str]) -> dict:
+    stats = dict(resolver.size_stats)
+    stats["bytes_saved"] = stats["plot_html_bytes"] - stats["embedded_plot_bytes"]
+    for plot_id in set(plot_ids):
+        for key, value in plot_storage.plots[plot_id].optimization.items():
+            stats[key] = stats.get(key, 0) + value
+    return stats
+
+
+async def plot_resolution_node(
+    state: TrainingAnalysisState, config: RunnableConfig | None = None
+) -> dict[str, str | dict | list]:
     logger.info("Starting plot resolution node")
+    started = time.monotonic()
 
     if not state.get("plotting_enabled", False):
         logger.info("Plotting disabled - skipping plot resolution")
@@ -33,6 +49,7 @@ async def plot_resolution_node(state: TrainingAnalysisState) -> dict[str, str |
             return {"errors": ["No HTML content available for plot resolution"]}
 
         plot_storage = PlotStorage(state["execution_id"])
+        blob_store = get_blob_store(config)
 
         logger.info(
             f"Found {len(state.get('plots', []))} plot entries and "
@@ -45,8 +62,9 @@ async def plot_resolution_node(state: TrainingAnalysisState) -> dict[str, str |
                 description=plot_data["description"],
                 agent_name=plot_data["agent_name"],
                 created_at=datetime.fromisoformat(plot_data["created_at"]),
-                html_content=plot_data["html_content"],
+                html_content=resolve_blob(plot_data["html_content"], blob_store),
                 data_summary=plot_data["data_summary"],
+                optimization=plot_data.get("optimization", {}),
             )
 
         resolver = PlotReferenceResolver(plot_storage)
@@ -96,10 +114,11 @@ async def plot_resolution_node(state: TrainingAnalysisState) -> dict[str, str |
                 "resolved_count": resolved_count,
                 "missing_plots": validation_result["missing_plots"],
                 "available_plots_summary": resolver.get_plot_summary(),
+                "size": _size_stats(resolver, plot_storage, validation_result["found_plots"]),
             },
             "costs": [{
                 "agent": "plot_resolution",
-                "execution_time": 0.1,
+                "execution_time": time.monotonic() - started,
                 "timestamp": datetime.now().isoformat(),
             }],
         }
@@ -66,7 +66,8 @@ def get_plotting_instructions(agent_name: str) -> str:
 ## Visualization Rules
 - **Constraint**: Create plots ONLY for unique insights not visible in standard Garmin reports. Max 2 plots.
 - **Reference**: You MUST reference each plot EXACTLY ONCE in your text using `[PLOT:{agent_name}_TIMESTAMP_ID]`.
-- **Placement**: Place the reference where it best supports your analysis. Do not repeat it."""
+- **Placement**: Place the reference where it best supports your analysis. Do not repeat it.
+- **Data**: Read data with `load_dataset(name)` in the plotting code; never paste values into it."""
 
 
 def get_hitl_instructions(agent_name: str) -> str:
@@ -15,6 +15,7 @@ from .node_base import (
     create_cost_entry,
     execute_node_with_error_handling,
     log_node_completion,
+    memoize_node,
 )
 from .prompt_components import get_hitl_instructions, get_workflow_context
 from .tool_calling_helper import handle_tool_calling_in_node
@@ -67,6 +68,30 @@ Format as structured markdown.
 
 
 
+def load_existing_season_plan(state: TrainingAnalysisState) -> str:
+    try:
+        return FilePlanStorage().load_plan(state["user_id"], "season_plan") or ""
+    except Exception as e:
+        logger.warning(f"Could not read existing season plan: {e}")
+        return ""
+
+
+def season_planner_memo_inputs(state: TrainingAnalysisState) -> dict:
+    return {
+        "athlete_name": state["athlete_name"],
+        "current_date": state["current_date"],
+        "competitions": state["competitions"],
+        "expert_insights": [
+            extract_expert_output(state.get(key), "for_season_planner")
+            for key in ("metrics_outputs", "activity_outputs", "physiology_outputs")
+        ],
+        "existing_season_plan": load_existing_season_plan(state),
+        "messages": state.get("season_planner_messages", []),
+        "hitl_enabled": state.get("hitl_enabled", True),
+    }
+
+
+@memoize_node("season_planner", AgentRole.SEASON_PLANNER, season_planner_memo_inputs)
 async def season_planner_node(state: TrainingAnalysisState) -> dict[str, list | str]:
     logger.info("Starting season planner node")
 
@@ -96,14 +121,7 @@ async def season_planner_node(state: TrainingAnalysisState) -> dict[str, list |
         else:
             qa_messages.append(msg)
     
-    existing_season_plan = ""
-    try:
-        storage = FilePlanStorage()
-        loaded_plan = storage.load_plan(state["user_id"], "season_plan")
-        if loaded_plan:
-            existing_season_plan = loaded_plan
-    except Exception as e:
-        logger.warning(f"Could not read existing season plan: {e}")
+    existing_season_plan = load_existing_season_plan(state)
 
     base_messages = [
         {"role": "system", "content": system_prompt},
@@ -117,10 +135,11 @@ async def season_planner_node(state: TrainingAnalysisState) -> dict[str, list |
         ) + (f"\n\n## Existing Season Plan\nWe have an existing season plan. Do NOT start from scratch. Review this plan against the new expert insights. If the plan is still valid, maintain the phase structure and just refine the details. Only trigger a full replan if the new data suggests the old plan is dangerously off-track.\n\n```markdown\n{existing_season_plan}\n```" if existing_season_plan else "")},
     ]
 
-    base_llm = ModelSelector.get_llm(AgentRole.SEASON_PLANNER)
-    
-    llm_with_tools = base_llm.bind_tools(tools) if tools else base_llm
-    llm_with_structure = llm_with_tools.with_structured_output(AgentOutput)
+    def bind_llm(llm):
+        llm_with_tools = llm.bind_tools(tools) if tools else llm
+        return llm_with_tools.with_structured_output(AgentOutput)
+
+    llm_with_structure = bind_llm(ModelSelector.get_llm(AgentRole.SEASON_PLANNER))
     
     async def call_season_planning():
         messages_with_qa = base_messages + qa_messages
@@ -130,6 +149,8 @@ async def season_planner_node(state: TrainingAnalysisState) -> dict[str, list |
                 messages=messages_with_qa,
                 tools=tools,
                 max_iterations=15,
+                agent_role=AgentRole.SEASON_PLANNER,
+                bind_llm=bind_llm,
             )
         else:
             return await llm_with_structure.ainvoke(messages_with_qa)
@@ -9,6 +9,7 @@ from services.ai.utils.retry_handler import AI_ANALYSIS_CONFIG, retry_with_backo
 
 from ..state.training_analysis_state import TrainingAnalysisState
 from ..utils.output_helper import extract_expert_output
+from .node_base import create_cost_entry
 from .tool_calling_helper import handle_tool_calling_in_node
 
 logger = logging.getLogger(__name__)
@@ -102,6 +103,8 @@ async def synthesis_node(state: TrainingAnalysisState) -> dict[str, list | str]:
                 ],
                 tools=[],
                 max_iterations=3,
+                agent_role=AgentRole.SYNTHESIS,
+                bind_llm=lambda llm: llm.bind_tools([]),
             )
 
         synthesis_result = await retry_with_backoff(
@@ -114,11 +117,7 @@ async def synthesis_node(state: TrainingAnalysisState) -> dict[str, list | str]:
         return {
             "synthesis_result": synthesis_result,
             "synthesis_complete": True,
-            "costs": [{
-                "agent": "synthesis",
-                "execution_time": execution_time,
-                "timestamp": datetime.now().isoformat(),
-            }],
+            "costs": [create_cost_entry("synthesis", execution_time)],
             "available_plots": plot_storage.list_available_plots(),
         }
 
@@ -1,8 +1,17 @@
 import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
 
 from langchain_core.messages import ToolMessage
 
 from langgraph.errors import GraphInterrupt
+from services.ai.ai_settings import AgentRole, ai_settings
+from services.ai.model_config import ModelSelector
+from services.ai.utils.circuit_breaker import get_circuit_breaker
+from services.ai.utils.execution_timeline import record_span
+from services.ai.utils.llm_hedging import llm_hedger
+from services.ai.utils.llm_scheduler import estimate_message_tokens, llm_scheduler, record_queue_wait
+from services.ai.utils.retry_handler import classify_exception
 
 logger = logging.getLogger(__name__)
 
@@ -42,20 +51,88 @@ def extract_text_content(response) -> str:
     return str(content)
 
 
+@asynccontextmanager
+async def scheduled_llm_call(
+    agent_role: AgentRole | None,
+    messages: list,
+    model_name: str | None = None,
+) -> AsyncIterator[None]:
+    if agent_role is None:
+        yield
+        return
+
+    model_name = model_name or ai_settings.get_model_for_role(agent_role)
+    provider = ModelSelector.get_provider(model_name)
+    breaker = get_circuit_breaker(provider)
+
+    if held := await breaker.wait_until_ready():
+        record_queue_wait(held)
+        record_span("circuit_breaker_wait", "queue", held, provider=provider)
+
+    admitted = False
+    try:
+        async with llm_scheduler.reserve(
+            provider=provider,
+            model=ModelSelector.CONFIGURATIONS[model_name].name,
+            estimated_tokens=estimate_message_tokens(messages),
+            priority=llm_scheduler.priority_for(agent_role),
+        ):
+            admitted = True
+            try:
+                yield
+            except Exception as e:
+                classification = classify_exception(e)
+                if classification.retryable:
+                    breaker.record_failure(classification.retry_after)
+                else:
+                    breaker.record_success()
+                raise
+            except BaseException:
+                breaker.release_probe()
+                raise
+            else:
+                breaker.record_success()
+    except BaseException:
+        # A call cancelled while queued for a slot never ran, so it must not keep holding the probe.
+        if not admitted:
+            breaker.release_probe()
+        raise
+
+
+def _hedge_target(agent_role: AgentRole, llm_with_tools, bind_llm: Callable | None):
+    fallback_model = llm_hedger.fallback_model(agent_role)
+    if fallback_model is None or bind_llm is None:
+        return llm_with_tools, None
+    return bind_llm(ModelSelector.get_llm(agent_role, model_name=fallback_model)), fallback_model
+
+
 async def handle_tool_calling_in_node(
-    llm_with_tools, messages: list[dict[str, str]], tools: list, max_iterations: int = 5
+    llm_with_tools,
+    messages: list[dict[str, str]],
+    tools: list,
+    max_iterations: int = 5,
+    agent_role: AgentRole | None = None,
+    bind_llm: Callable | None = None,
 ):
     conversation = [
         {"role": msg["role"], "content": msg["content"]}
         for msg in messages if msg["role"] in ("system", "user", "assistant")
     ]
 
+    async def invoke(llm, model_name: str | None = None):
+        async with scheduled_llm_call(agent_role, conversation, model_name):
+            return await llm.ainvoke(conversation)
+
     iteration = 0
     while iteration < max_iterations:
         iteration += 1
         logger.debug(f"Tool calling iteration {iteration}")
 
-        response = await llm_with_tools.ainvoke(conversation)
+        response = await llm_hedger.run(
+            agent_role,
+            lambda: invoke(llm_with_tools),
+            lambda: invoke(*_hedge_target(agent_role, llm_with_tools, bind_llm)),
+        )
 
         if hasattr(response, "tool_calls") and response.tool_calls:
             logger.info(f"LLM requested {len(response.tool_calls)} tool calls")
@@ -14,6 +14,7 @@ from .node_base import (
     create_cost_entry,
     execute_node_with_error_handling,
     log_node_completion,
+    memoize_node,
 )
 from .prompt_components import get_hitl_instructions, get_workflow_context
 from .tool_calling_helper import handle_tool_calling_in_node
@@ -73,6 +74,24 @@ Translate the Season Plan strategy and Expert signals into concrete daily sessio
 """
 
 
+def weekly_planner_memo_inputs(state: TrainingAnalysisState) -> dict:
+    return {
+        "season_plan": extract_agent_content(state.get("season_plan")),
+        "athlete_name": state["athlete_name"],
+        "current_date": state["current_date"],
+        "week_dates": state["week_dates"],
+        "competitions": state["competitions"],
+        "planning_context": state["planning_context"],
+        "expert_insights": [
+            extract_expert_output(state.get(key), "for_weekly_planner")
+            for key in ("metrics_outputs", "activity_outputs", "physiology_outputs")
+        ],
+        "messages": state.get("weekly_planner_messages", []),
+        "hitl_enabled": state.get("hitl_enabled", True),
+    }
+
+
+@memoize_node("weekly_planner", AgentRole.WORKOUT, weekly_planner_memo_inputs)
 async def weekly_planner_node(state: TrainingAnalysisState) -> dict[str, list | str]:
     logger.info("Starting weekly planner node")
 
@@ -116,9 +135,11 @@ async def weekly_planner_node(state: TrainingAnalysisState) -> dict[str, list |
     
     base_messages = [{"role": "system", "content": system_prompt}, user_message]
     
-    base_llm = ModelSelector.get_llm(AgentRole.WORKOUT)
-    llm_with_tools = base_llm.bind_tools(tools) if tools else base_llm
-    llm_with_structure = llm_with_tools.with_structured_output(AgentOutput)
+    def bind_llm(llm):
+        llm_with_tools = llm.bind_tools(tools) if tools else llm
+        return llm_with_tools.with_structured_output(AgentOutput)
+
+    llm_with_structure = bind_llm(ModelSelector.get_llm(AgentRole.WORKOUT))
 
     async def call_weekly_planning():
         messages_with_qa = base_messages + qa_messages
@@ -128,6 +149,8 @@ async def weekly_planner_node(state: TrainingAnalysisState) -> dict[str, list |
                 messages=messages_with_qa,
                 tools=tools,
                 max_iterations=15,
+                agent_role=AgentRole.WORKOUT,
+                bind_llm=bind_llm,
             )
         return await llm_with_structure.ainvoke(messages_with_qa)
 
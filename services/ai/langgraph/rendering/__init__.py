@@ -0,0 +1,16 @@
+from .html_renderer import (
+    FormatterBackend,
+    render_analysis_html,
+    render_planning_html,
+    resolve_formatter_backends,
+)
+from .markdown_renderer import MarkdownRenderer, render_markdown
+
+__all__ = [
+    "FormatterBackend",
+    "MarkdownRenderer",
+    "render_analysis_html",
+    "render_markdown",
+    "render_planning_html",
+    "resolve_formatter_backends",
+]
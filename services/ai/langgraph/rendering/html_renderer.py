@@ -0,0 +1,81 @@
+import html
+from functools import cache
+from pathlib import Path
+from string import Template
+from typing import Any, Literal
+
+from .markdown_renderer import render_markdown
+
+FormatterBackend = Literal["llm", "local"]
+
+FORMATTER_ROLES = ("formatter", "plan_formatter")
+FORMATTER_BACKENDS = ("llm", "local")
+
+TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+
+@cache
+def load_template(name: str) -> Template:
+    return Template((TEMPLATES_DIR / name).read_text(encoding="utf-8"))
+
+
+@cache
+def load_report_css() -> str:
+    return (TEMPLATES_DIR / "report.css").read_text(encoding="utf-8").rstrip("\n")
+
+
+def resolve_formatter_backends(value: str | dict[str, str] | None) -> dict[str, FormatterBackend]:
+    if value is None:
+        return dict.fromkeys(FORMATTER_ROLES, "llm")
+
+    if isinstance(value, str):
+        value = dict.fromkeys(FORMATTER_ROLES, value)
+
+    if unknown := set(value) - set(FORMATTER_ROLES):
+        raise ValueError(f"Unknown formatter roles {sorted(unknown)}. Must be one of {FORMATTER_ROLES}.")
+
+    backends: dict[str, FormatterBackend] = {}
+    for role in FORMATTER_ROLES:
+        backend = str(value.get(role, "llm")).strip().lower()
+        if backend not in FORMATTER_BACKENDS:
+            raise ValueError(
+                f"Invalid formatter backend '{backend}' for {role}. Must be one of {FORMATTER_BACKENDS}."
+            )
+        backends[role] = backend
+
+    return backends
+
+
+def _subtitle(athlete_name: str, period: str) -> str:
+    return html.escape(" · ".join(part for part in (athlete_name, period) if part))
+
+
+def render_analysis_html(
+    synthesis_result: str,
+    athlete_name: str = "",
+    current_date: dict[str, Any] | None = None,
+) -> str:
+    return load_template("analysis.html").substitute(
+        title="Training Analysis Report",
+        subtitle=_subtitle(athlete_name, (current_date or {}).get("date", "")),
+        css=load_report_css(),
+        content=render_markdown(synthesis_result),
+    )
+
+
+def render_planning_html(
+    season_plan: str,
+    weekly_plan: str,
+    athlete_name: str = "",
+    week_dates: list[dict[str, Any]] | None = None,
+) -> str:
+    dates = [entry.get("date", "") for entry in week_dates or [] if entry.get("date")]
+    period = f"{dates[0]} – {dates[-1]}" if dates else ""
+
+    return load_template("planning.html").substitute(
+        title="Training Plan",
+        subtitle=_subtitle(athlete_name, period),
+        css=load_report_css(),
+        season_plan=render_markdown(season_plan),
+        weekly_plan=render_markdown(weekly_plan, checklist_prefix="wk"),
+    )
@@ -0,0 +1,252 @@
+import html
+import re
+from dataclasses import dataclass
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+RULE_PATTERN = re.compile(r"^\s*([-*_])(\s*\1){2,}\s*$")
+LIST_ITEM_PATTERN = re.compile(r"^(\s*)([-*+]|\d+[.)])\s+(.*)$")
+TABLE_SEPARATOR_PATTERN = re.compile(r"^\s*\|?\s*:?-+:?\s*(\|\s*:?-+:?\s*)*\|?\s*$")
+TASK_PATTERN = re.compile(r"^\[([ xX])\]\s+(.*)$")
+PLOT_LINE_PATTERN = re.compile(r"^\s*\[PLOT:[^\]]+\]\s*$")
+
+INLINE_TOKEN_PATTERN = re.compile(r"(`[^`]+`|\[PLOT:[^\]]+\])")
+BOLD_PATTERN = re.compile(r"\*\*(.+?)\*\*|(?<!\w)__(.+?)__(?!\w)")
+ITALIC_PATTERN = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])|(?<!\w)_(?!\s)(.+?)(?<!\s)_(?!\w)")
+LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+SAFE_LINK_PATTERN = re.compile(r"^(https?://|mailto:|#)", re.IGNORECASE)
+
+
+@dataclass
+class _ListItem:
+    indent: int
+    ordered: bool
+    text: str
+
+
+class MarkdownRenderer:
+    """Deterministic markdown-to-HTML conversion for the report subset the agents produce.
+
+    When `checklist_prefix` is set, every list item and table row gets a named checkbox.
+    """
+
+    def __init__(self, checklist_prefix: str | None = None):
+        self.checklist_prefix = checklist_prefix
+        self._checkbox_count = 0
+        self._heading_ids: dict[str, int] = {}
+
+    def render(self, text: str) -> str:
+        return "\n".join(self._render_blocks((text or "").replace("\r\n", "\n").split("\n")))
+
+    def _render_blocks(self, lines: list[str]) -> list[str]:
+        blocks: list[str] = []
+        paragraph: list[str] = []
+        i = 0
+
+        def flush_paragraph():
+            if paragraph:
+                blocks.append(f"<p>{self._inline(' '.join(line.strip() for line in paragraph))}</p>")
+                paragraph.clear()
+
+        while i < len(lines):
+            line = lines[i]
+            stripped = line.strip()
+
+            if not stripped:
+                flush_paragraph()
+                i += 1
+                continue
+
+            if stripped.startswith("```"):
+                flush_paragraph()
+                language = stripped[3:].strip()
+                code_lines = []
+                i += 1
+                while i < len(lines) and not lines[i].strip().startswith("```"):
+                    code_lines.append(lines[i])
+                    i += 1
+                class_attr = f' class="language-{html.escape(language)}"' if language else ""
+                blocks.append(f"<pre><code{class_attr}>{html.escape(chr(10).join(code_lines))}</code></pre>")
+                i += 1
+                continue
+
+            if heading := HEADING_PATTERN.match(stripped):
+                flush_paragraph()
+                level = len(heading.group(1))
+                content = heading.group(2)
+                blocks.append(f'<h{level} id="{self._heading_id(content)}">{self._inline(content)}</h{level}>')
+                i += 1
+                continue
+
+            if RULE_PATTERN.match(line):
+                flush_paragraph()
+                blocks.append("<hr>")
+                i += 1
+                continue
+
+            if PLOT_LINE_PATTERN.match(line):
+                flush_paragraph()
+                blocks.append(f'<div class="plot-slot">{stripped}</div>')
+                i += 1
+                continue
+
+            if "|" in stripped and i + 1 < len(lines) and TABLE_SEPARATOR_PATTERN.match(lines[i + 1]):
+                flush_paragraph()
+                table_lines = [line, lines[i + 1]]
+                i += 2
+                while i < len(lines) and "|" in lines[i] and lines[i].strip():
+                    table_lines.append(lines[i])
+                    i += 1
+                blocks.append(self._render_table(table_lines))
+                continue
+
+            if stripped.startswith(">"):
+                flush_paragraph()
+                quote_lines = []
+                while i < len(lines) and lines[i].strip().startswith(">"):
+                    quote_lines.append(re.sub(r"^\s*>\s?", "", lines[i]))
+                    i += 1
+                blocks.append("<blockquote>\n" + "\n".join(self._render_blocks(quote_lines)) + "\n</blockquote>")
+                continue
+
+            if LIST_ITEM_PATTERN.match(line):
+                flush_paragraph()
+                items: list[_ListItem] = []
+                while i < len(lines) and lines[i].strip():
+                    if match := LIST_ITEM_PATTERN.match(lines[i]):
+                        items.append(_ListItem(
+                            indent=len(match.group(1).expandtabs(4)),
+                            ordered=match.group(2)[0].isdigit(),
+                            text=match.group(3),
+                        ))
+                    elif lines[i][:1].isspace():
+                        items[-1].text += " " + lines[i].strip()
+                    else:
+                        break
+                    i += 1
+
+                position = 0
+                while position < len(items):
+                    list_html, position = self._render_list(items, position)
+                    blocks.append(list_html)
+                continue
+
+            paragraph.append(line)
+            i += 1
+
+        flush_paragraph()
+        return blocks
+
+    def _render_list(self, items: list[_ListItem], start: int) -> tuple[str, int]:
+        base_indent = items[start].indent
+        tag = "ol" if items[start].ordered else "ul"
+        parts = [f"<{tag}>"]
+        i = start
+
+        while i < len(items) and items[i].indent >= base_indent and items[i].ordered == items[start].ordered:
+            text = items[i].text
+            i += 1
+            nested = ""
+            if i < len(items) and items[i].indent > base_indent:
+                nested, i = self._render_list(items, i)
+            parts.append(f"<li>{self._render_list_item(text)}{nested}</li>")
+
+        parts.append(f"</{tag}>")
+        return "".join(parts), i
+
+    def _render_list_item(self, text: str) -> str:
+        checked = False
+        if task := TASK_PATTERN.match(text):
+            checked = task.group(1).lower() == "x"
+            text = task.group(2)
+        elif not self.checklist_prefix:
+            return self._inline(text)
+
+        return (
+            f'<label class="check-item">{self._checkbox(checked)} '
+            f"<span>{self._inline(text)}</span></label>"
+        )
+
+    def _render_table(self, table_lines: list[str]) -> str:
+        header = self._split_row(table_lines[0])
+        alignments = [self._alignment(cell) for cell in self._split_row(table_lines[1])]
+        checklist = bool(self.checklist_prefix)
+
+        def cell(tag: str, content: str, index: int) -> str:
+            align = alignments[index] if index < len(alignments) else None
+            style = f' style="text-align: {align}"' if align else ""
+            return f"<{tag}{style}>{self._inline(content)}</{tag}>"
+
+        head = "".join(cell("th", content, index) for index, content in enumerate(header))
+        rows = []
+        for row_line in table_lines[2:]:
+            cells = self._split_row(row_line)
+            cells += [""] * (len(header) - len(cells))
+            row = "".join(cell("td", content, index) for index, content in enumerate(cells[: len(header)]))
+            if checklist:
+                row = f'<td class="check-cell">{self._checkbox(False)}</td>{row}'
+            rows.append(f"<tr>{row}</tr>")
+
+        check_head = '<th class="check-cell"></th>' if checklist else ""
+        return (
+            '<div class="table-wrap"><table>\n'
+            f"<thead><tr>{check_head}{head}</tr></thead>\n"
+            "<tbody>\n" + "\n".join(rows) + "\n</tbody>\n"
+            "</table></div>"
+        )
+
+    def _checkbox(self, checked: bool) -> str:
+        self._checkbox_count += 1
+        name = f"{self.checklist_prefix or 'task'}-{self._checkbox_count:03d}"
+        return f'<input type="checkbox" name="{name}" value="done"{" checked" if checked else ""}>'
+
+    def _heading_id(self, text: str) -> str:
+        slug = re.sub(r"[^a-z0-9]+", "-", re.sub(r"[*_`]", "", text).lower()).strip("-") or "section"
+        count = self._heading_ids.get(slug, 0)
+        self._heading_ids[slug] = count + 1
+        return slug if count == 0 else f"{slug}-{count}"
+
+    @staticmethod
+    def _split_row(line: str) -> list[str]:
+        row = line.strip()
+        if row.startswith("|"):
+            row = row[1:]
+        if row.endswith("|"):
+            row = row[:-1]
+        return [cell.strip() for cell in row.split("|")]
+
+    @staticmethod
+    def _alignment(separator_cell: str) -> str | None:
+        if separator_cell.startswith(":") and separator_cell.endswith(":"):
+            return "center"
+        if separator_cell.endswith(":"):
+            return "right"
+        return None
+
+    @staticmethod
+    def _inline(text: str) -> str:
+        parts = []
+        for index, segment in enumerate(INLINE_TOKEN_PATTERN.split(text)):
+            if index % 2 == 1:
+                parts.append(
+                    f"<code>{html.escape(segment[1:-1])}</code>" if segment.startswith("`") else segment
+                )
+                continue
+
+            rendered = LINK_PATTERN.sub(MarkdownRenderer._link, html.escape(segment, quote=False))
+            rendered = BOLD_PATTERN.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", rendered)
+            rendered = ITALIC_PATTERN.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", rendered)
+            parts.append(rendered)
+
+        return "".join(parts)
+
+    @staticmethod
+    def _link(match: re.Match) -> str:
+        label, url = match.groups()
+        # Only web, mail and in-page links become anchors; javascript:, data: and the like stay text.
+        if not SAFE_LINK_PATTERN.match(url):
+            return label
+        return f'<a href="{url.replace(chr(34), "&quot;")}">{label}</a>'
+
+
+def render_markdown(text: str, checklist_prefix: str | None = None) -> str:
+    return MarkdownRenderer(checklist_prefix=checklist_prefix).render(text)
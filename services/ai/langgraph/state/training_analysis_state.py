@@ -19,6 +19,8 @@ class TrainingAnalysisState(MessagesState):
     plotting_enabled: bool
     hitl_enabled: bool
     skip_synthesis: bool
+    html_stream_dir: str | None
+    formatter_backends: dict[str, str]
 
     metrics_summary: str | None
     physiology_summary: str | None
@@ -71,6 +73,8 @@ def create_initial_state(
     plotting_enabled: bool = False,
     hitl_enabled: bool = True,
     skip_synthesis: bool = False,
+    html_stream_dir: str | None = None,
+    formatter_backends: dict[str, str] | None = None,
 ) -> TrainingAnalysisState:
     return TrainingAnalysisState(
         user_id=user_id,
@@ -85,6 +89,8 @@ def create_initial_state(
         plotting_enabled=plotting_enabled,
         hitl_enabled=hitl_enabled,
         skip_synthesis=skip_synthesis,
+        html_stream_dir=html_stream_dir,
+        formatter_backends=formatter_backends or {},
         execution_id=execution_id,
         metrics_summary=None,
         physiology_summary=None,
@@ -1,3 +1,10 @@
-from .langsmith_cost_extractor import LangSmithCostExtractor
+import importlib
 
 __all__ = ['LangSmithCostExtractor']
+
+
+def __getattr__(name: str):
+    # Resolved on first access so light utilities do not import langsmith.
+    if name == "LangSmithCostExtractor":
+        return importlib.import_module(".langsmith_cost_extractor", __name__).LangSmithCostExtractor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
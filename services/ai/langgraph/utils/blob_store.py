@@ -0,0 +1,139 @@
+import hashlib
+import logging
+import shutil
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .state_serde import STATE_SCHEMA_ALLOWLIST
+
+logger = logging.getLogger(__name__)
+
+BLOB_STORE_KEY = "blob_store"
+BLOB_REF_KEY = "$blob"
+BLOB_DIR_NAME = "blobs"
+
+
+def is_blob_ref(value: Any) -> bool:
+    return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+class BlobStore:
+    """Content-addressed store for large state payloads, kept in memory.
+
+    `put` returns a small handle dict that is safe to keep in graph state; only the handle
+    is copied into checkpoints and stream snapshots, and `get` turns it back into the value.
+    """
+
+    def __init__(self):
+        self.serde = JsonPlusSerializer(allowed_msgpack_modules=STATE_SCHEMA_ALLOWLIST)
+        self._blobs: dict[str, tuple[str, bytes]] = {}
+
+    def put(self, value: Any) -> dict[str, Any]:
+        type_, payload = self.serde.dumps_typed(value)
+        digest = hashlib.sha256(type_.encode() + b"\0" + payload).hexdigest()
+        if not self._contains(digest):
+            self._write(digest, type_, payload)
+        return {BLOB_REF_KEY: digest, "bytes": len(payload)}
+
+    def get(self, ref: dict[str, Any]) -> Any:
+        return self.serde.loads_typed(self._read(ref[BLOB_REF_KEY]))
+
+    def clear(self) -> None:
+        self._blobs.clear()
+
+    def _contains(self, digest: str) -> bool:
+        return digest in self._blobs
+
+    def _write(self, digest: str, type_: str, payload: bytes) -> None:
+        self._blobs[digest] = (type_, payload)
+
+    def _read(self, digest: str) -> tuple[str, bytes]:
+        if digest not in self._blobs:
+            raise KeyError(f"Blob {digest[:12]} not found in the execution's blob store")
+        return self._blobs[digest]
+
+
+class FileBlobStore(BlobStore):
+    """Blob store that writes one file per blob, so durable runs can be resumed."""
+
+    def __init__(self, directory: str | Path):
+        super().__init__()
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _path(self, digest: str) -> Path:
+        return self.directory / digest
+
+    def _contains(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def _write(self, digest: str, type_: str, payload: bytes) -> None:
+        tmp_path = self._path(digest).with_suffix(".tmp")
+        tmp_path.write_bytes(type_.encode() + b"\n" + payload)
+        tmp_path.replace(self._path(digest))
+
+    def _read(self, digest: str) -> tuple[str, bytes]:
+        try:
+            type_, _, payload = self._path(digest).read_bytes().partition(b"\n")
+        except FileNotFoundError:
+            raise KeyError(f"Blob {digest[:12]} not found in {self.directory}") from None
+        return type_.decode(), payload
+
+
+def get_blob_store(config: dict[str, Any] | None) -> BlobStore | None:
+    return ((config or {}).get("configurable") or {}).get(BLOB_STORE_KEY)
+
+
+def resolve_blob(value: Any, store: BlobStore | None) -> Any:
+    if not is_blob_ref(value):
+        return value
+    if store is None:
+        raise LookupError("State holds a blob handle but no blob store was passed in the run config")
+    return store.get(value)
+
+
+def offload_garmin_data(garmin_data: dict[str, Any], store: BlobStore) -> dict[str, Any]:
+    return {key: store.put(value) for key, value in garmin_data.items()}
+
+
+class GarminDataView(Mapping):
+    """Read-only view of `garmin_data` that loads each offloaded slice on first access."""
+
+    def __init__(self, garmin_data: dict[str, Any], store: BlobStore | None):
+        self._data = garmin_data
+        self._store = store
+        self._loaded: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._loaded:
+            self._loaded[key] = resolve_blob(self._data[key], self._store)
+        return self._loaded[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def offload_plot_html(plot_storage_data: dict[str, dict], store: BlobStore | None) -> dict[str, dict]:
+    if store is None:
+        return plot_storage_data
+    return {
+        plot_id: {**plot_data, "html_content": store.put(plot_data["html_content"])}
+        if isinstance(plot_data.get("html_content"), str) else plot_data
+        for plot_id, plot_data in plot_storage_data.items()
+    }
+
+
+def inline_plot_html(plot_storage_data: dict[str, dict], store: BlobStore | None) -> dict[str, dict]:
+    return {
+        plot_id: {**plot_data, "html_content": resolve_blob(plot_data.get("html_content"), store)}
+        for plot_id, plot_data in plot_storage_data.items()
+    }
@@ -0,0 +1,98 @@
+import logging
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+HtmlProgressCallback = Callable[[str, int], None]
+
+PROGRESS_CALLBACK_KEY = "html_progress_callback"
+
+
+def extract_chunk_text(chunk: Any) -> str:
+    content = chunk.content if hasattr(chunk, "content") else chunk
+
+    if isinstance(content, str):
+        return content
+
+    if isinstance(content, list):
+        return "".join(
+            item if isinstance(item, str) else item.get("text", "")
+            for item in content
+            if isinstance(item, str)
+            or (isinstance(item, dict) and item.get("type", "text") == "text")
+        )
+
+    return ""
+
+
+def get_html_progress_callback(config: dict[str, Any] | None) -> HtmlProgressCallback | None:
+    return ((config or {}).get("configurable") or {}).get(PROGRESS_CALLBACK_KEY)
+
+
+class StreamingHtmlWriter:
+    """Writes HTML progressively to `<name>.partial.html`, renamed atomically on completion."""
+
+    def __init__(
+        self,
+        target_path: Path,
+        label: str,
+        progress_callback: HtmlProgressCallback | None = None,
+    ):
+        self.target_path = Path(target_path)
+        self.partial_path = self.target_path.with_name(
+            f"{self.target_path.stem}.partial{self.target_path.suffix}"
+        )
+        self.label = label
+        self.progress_callback = progress_callback
+        self.bytes_written = 0
+        self._file = None
+
+    def __enter__(self) -> "StreamingHtmlWriter":
+        self.target_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = self.partial_path.open("w", encoding="utf-8")
+        logger.info(f"Streaming {self.label} to {self.partial_path}")
+        return self
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        self._file.write(text)
+        self._file.flush()
+        self.bytes_written += len(text.encode("utf-8"))
+
+        if self.progress_callback:
+            try:
+                self.progress_callback(self.label, self.bytes_written)
+            except Exception as e:
+                logger.warning(f"HTML progress callback failed for {self.label}: {e}")
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+
+        if exc_type is not None:
+            self.partial_path.unlink(missing_ok=True)
+            return
+
+        os.replace(self.partial_path, self.target_path)
+        logger.info(f"Streamed {self.bytes_written} bytes of {self.label} to {self.target_path}")
+
+
+async def stream_llm_html(
+    llm,
+    messages: list[dict[str, str]],
+    target_path: Path,
+    label: str,
+    progress_callback: HtmlProgressCallback | None = None,
+) -> str:
+    parts: list[str] = []
+
+    with StreamingHtmlWriter(target_path, label, progress_callback) as writer:
+        async for chunk in llm.astream(messages):
+            if text := extract_chunk_text(chunk):
+                parts.append(text)
+                writer.write(text)
+
+    return "".join(parts)
@@ -0,0 +1,240 @@
+import asyncio
+import inspect
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Protocol
+
+from services.ai.utils.execution_timeline import timeline_span
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_PROVIDER_KEY = "interaction_provider"
+
+NO_ANSWER = "No answer provided - proceed with your best judgement."
+
+
+class InteractionProvider(Protocol):
+    def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        ...
+
+
+class AsyncInteractionProvider(Protocol):
+    async def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        ...
+
+
+def get_interaction_provider(config: dict[str, Any] | None) -> InteractionProvider | AsyncInteractionProvider | None:
+    return ((config or {}).get("configurable") or {}).get(INTERACTION_PROVIDER_KEY)
+
+
+async def collect_answers(
+    provider: InteractionProvider | AsyncInteractionProvider,
+    questions: list[dict],
+    stage_name: str,
+) -> list[dict]:
+    # Blocking providers run in a worker thread so parallel branches keep streaming.
+    with timeline_span("hitl_wait", "hitl", stage=stage_name, questions=len(questions)):
+        if inspect.iscoroutinefunction(provider.collect_answers):
+            return await provider.collect_answers(questions, stage_name)
+        return await asyncio.to_thread(provider.collect_answers, questions, stage_name)
+
+
+def _answer_entry(qa: dict, answer: str) -> dict:
+    return {"agent": qa["agent"], "question": qa["question"]["message"], "answer": answer}
+
+
+def _print_stage_header(stage_name: str) -> None:
+    print(f"\n{'='*60}")
+    print(f"HITL INTERACTION REQUIRED - {stage_name}")
+    print(f"{'='*60}")
+
+
+def _print_question(qa: dict, index: int, total: int) -> None:
+    agent_name = qa["agent"].replace("_", " ").title()
+    question_data = qa["question"]
+
+    print(f"\nQuestion {index}/{total} from {agent_name}:")
+    print(f"  {question_data['message']}")
+    if question_data.get("context"):
+        print(f"  Context: {question_data['context']}")
+
+
+class ConsoleInteractionProvider:
+    def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        answers = []
+
+        _print_stage_header(stage_name)
+
+        for i, qa in enumerate(questions, 1):
+            _print_question(qa, i, len(questions))
+
+            user_answer = input("\n👤 Your answer: ").strip()
+
+            logger.info(f"User answered {qa['agent']} question {i}: {user_answer}")
+
+            answers.append(_answer_entry(qa, user_answer))
+
+        print(f"\n{'='*60}\n")
+        return answers
+
+
+class QueueInteractionProvider:
+    """Awaits one answer per question from an asyncio queue.
+
+    Anything that can put strings on the queue (a socket handler, a web UI, a test) can answer.
+    Questions still open when `timeout_seconds` runs out for the stage get `NO_ANSWER`.
+    """
+
+    def __init__(self, answers: asyncio.Queue | None = None, timeout_seconds: float | None = None):
+        self.answers = answers
+        self.timeout_seconds = timeout_seconds
+
+    async def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        if self.answers is None:
+            self.answers = asyncio.Queue()
+        self.announce(questions, stage_name)
+
+        deadline = None if self.timeout_seconds is None else time.monotonic() + self.timeout_seconds
+        answers = []
+        for i, qa in enumerate(questions, 1):
+            self.prompt(qa, i, len(questions))
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                answer = str(await asyncio.wait_for(self.answers.get(), remaining)).strip()
+            except TimeoutError:
+                logger.warning(f"{stage_name}: no answer within {self.timeout_seconds}s, continuing without")
+                answers.extend(_answer_entry(open_qa, NO_ANSWER) for open_qa in questions[i - 1:])
+                break
+            logger.info(f"User answered {qa['agent']} question {i}: {answer}")
+            answers.append(_answer_entry(qa, answer or NO_ANSWER))
+
+        return answers
+
+    def announce(self, questions: list[dict], stage_name: str) -> None:
+        logger.info(f"{stage_name}: waiting for {len(questions)} answers")
+
+    def prompt(self, qa: dict, index: int, total: int) -> None:
+        pass
+
+
+class _StdinLineReader:
+    """Daemon thread that forwards stdin lines to whichever event loop is currently asking."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._target: tuple[asyncio.AbstractEventLoop, asyncio.Queue] | None = None
+        self._thread: threading.Thread | None = None
+
+    def attach(self, queue: asyncio.Queue) -> None:
+        with self._lock:
+            self._target = (asyncio.get_running_loop(), queue)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="hitl-stdin", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        for line in sys.stdin:
+            with self._lock:
+                target = self._target
+            if target is None:
+                continue
+            loop, queue = target
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, line)
+            except RuntimeError:
+                logger.debug("Dropping console input received after its event loop closed")
+
+
+_stdin_reader = _StdinLineReader()
+
+
+class AsyncConsoleInteractionProvider(QueueInteractionProvider):
+    def __init__(self, timeout_seconds: float | None = None):
+        super().__init__(timeout_seconds=timeout_seconds)
+
+    async def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        # Fresh queue per stage: lines typed after a timeout must not answer the next stage.
+        self.answers = asyncio.Queue()
+        _stdin_reader.attach(self.answers)
+        answers = await super().collect_answers(questions, stage_name)
+        print(f"\n{'='*60}\n")
+        return answers
+
+    def announce(self, questions: list[dict], stage_name: str) -> None:
+        _print_stage_header(stage_name)
+        if self.timeout_seconds is not None:
+            print(f"(Unanswered questions are skipped after {self.timeout_seconds:g}s)")
+
+    def prompt(self, qa: dict, index: int, total: int) -> None:
+        _print_question(qa, index, total)
+        print("\n👤 Your answer: ", end="", flush=True)
+
+
+class FileInteractionProvider:
+    """Writes each stage's questions to a JSON file and polls for a matching answers file.
+
+    The answers file holds a list with one string per question (or objects with an "answer" key).
+    It is removed once read so the next round of the same stage waits for fresh answers.
+    """
+
+    def __init__(self, directory: str | Path, timeout_seconds: float | None = None, poll_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.timeout_seconds = timeout_seconds
+        self.poll_interval = poll_interval
+
+    def paths_for(self, stage_name: str) -> tuple[Path, Path]:
+        slug = re.sub(r"[^a-z0-9]+", "_", stage_name.lower()).strip("_")
+        return self.directory / f"hitl_questions_{slug}.json", self.directory / f"hitl_answers_{slug}.json"
+
+    async def collect_answers(self, questions: list[dict], stage_name: str) -> list[dict]:
+        questions_path, answers_path = self.paths_for(stage_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        questions_path.write_text(
+            json.dumps(
+                [
+                    {"index": i, "agent": qa["agent"], **qa["question"]}
+                    for i, qa in enumerate(questions, 1)
+                ],
+                indent=2,
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        logger.info(f"{stage_name}: {len(questions)} questions written to {questions_path}; awaiting {answers_path}")
+
+        deadline = None if self.timeout_seconds is None else time.monotonic() + self.timeout_seconds
+        while not answers_path.exists():
+            if deadline is not None and time.monotonic() >= deadline:
+                logger.warning(f"{stage_name}: no answers file within {self.timeout_seconds}s, continuing without")
+                return [_answer_entry(qa, NO_ANSWER) for qa in questions]
+            await asyncio.sleep(self.poll_interval)
+
+        raw_answers = json.loads(answers_path.read_text(encoding="utf-8"))
+        answers_path.unlink()
+        questions_path.unlink(missing_ok=True)
+
+        answers = []
+        for i, qa in enumerate(questions):
+            raw = raw_answers[i] if i < len(raw_answers) else None
+            answer = raw.get("answer") if isinstance(raw, dict) else raw
+            answers.append(_answer_entry(qa, str(answer).strip() if answer else NO_ANSWER))
+        return answers
+
+
+def create_interaction_provider(
+    kind: str = "console",
+    timeout_seconds: float | None = None,
+    directory: str | Path | None = None,
+) -> AsyncInteractionProvider:
+    if kind == "console":
+        return AsyncConsoleInteractionProvider(timeout_seconds=timeout_seconds)
+    if kind == "file":
+        if directory is None:
+            raise ValueError("The file interaction provider needs a directory")
+        return FileInteractionProvider(directory, timeout_seconds=timeout_seconds)
+    raise ValueError(f"Unknown HITL provider '{kind}' (expected 'console' or 'file')")
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import BaseMessage
+from pydantic import BaseModel
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from .state_serde import STATE_SCHEMA_ALLOWLIST
+
+logger = logging.getLogger(__name__)
+
+NODE_MEMO_KEY = "node_memo"
+NODE_MEMO_DB_NAME = "node_memo.sqlite"
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, BaseMessage):
+        return {"type": value.type, "content": value.content}
+    return str(value)
+
+
+def fingerprint_inputs(node_name: str, inputs: dict[str, Any]) -> str:
+    canonical = json.dumps({"node": node_name, "inputs": inputs}, sort_keys=True, default=_jsonable)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class NodeMemoStore:
+    """SQLite store of node state updates keyed by node name and input fingerprint.
+
+    Values go through the checkpoint serializer, so structured agent outputs come back as
+    the same schema classes. Only the newest `keep_per_node` entries per node are kept.
+    """
+
+    def __init__(self, db_path: str | Path, keep_per_node: int = 20):
+        self.db_path = Path(db_path)
+        self.keep_per_node = keep_per_node
+        self.serde = JsonPlusSerializer(allowed_msgpack_modules=STATE_SCHEMA_ALLOWLIST)
+        self.hits = 0
+        self.misses = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS node_memo (
+                    node TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (node, fingerprint)
+                )
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, node_name: str, fingerprint: str) -> dict[str, Any] | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT type, payload FROM node_memo WHERE node = ? AND fingerprint = ?",
+                (node_name, fingerprint),
+            ).fetchone()
+
+        if row is None:
+            self.misses += 1
+            return None
+
+        try:
+            update = self.serde.loads_typed((row[0], row[1]))
+        except Exception as e:
+            logger.warning(f"Discarding unreadable memo entry for {node_name}: {e}")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return update
+
+    def put(self, node_name: str, fingerprint: str, update: dict[str, Any]) -> None:
+        type_, payload = self.serde.dumps_typed(update)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO node_memo VALUES (?, ?, ?, ?, ?)",
+                (node_name, fingerprint, type_, payload, time.time()),
+            )
+            conn.execute(
+                """
+                DELETE FROM node_memo WHERE node = ? AND fingerprint NOT IN (
+                    SELECT fingerprint FROM node_memo WHERE node = ? ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (node_name, node_name, self.keep_per_node),
+            )
+
+
+def get_node_memo(config: dict[str, Any] | None) -> NodeMemoStore | None:
+    return ((config or {}).get("configurable") or {}).get(NODE_MEMO_KEY)
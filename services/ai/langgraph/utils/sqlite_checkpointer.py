@@ -0,0 +1,88 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any
+
+import aiosqlite
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+from .state_serde import STATE_SCHEMA_ALLOWLIST
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_DB_NAME = "checkpoints.sqlite"
+
+
+class CompactingSqliteSaver(AsyncSqliteSaver):
+    """SQLite checkpointer that keeps only the newest `keep_last` checkpoints per thread.
+
+    Resuming needs the latest checkpoint and its pending writes; older super-steps are
+    pruned as new ones are saved so full-state snapshots don't accumulate.
+    """
+
+    def __init__(self, conn: aiosqlite.Connection, *, keep_last: int = 2, serde=None):
+        super().__init__(conn, serde=serde or JsonPlusSerializer(allowed_msgpack_modules=STATE_SCHEMA_ALLOWLIST))
+        if keep_last < 1:
+            raise ValueError("keep_last must be at least 1")
+        self.keep_last = keep_last
+
+    async def aput(self, config, checkpoint, metadata, new_versions) -> dict[str, Any]:
+        next_config = await super().aput(config, checkpoint, metadata, new_versions)
+        await self.acompact(
+            str(next_config["configurable"]["thread_id"]),
+            next_config["configurable"]["checkpoint_ns"],
+        )
+        return next_config
+
+    async def acompact(self, thread_id: str, checkpoint_ns: str = "") -> int:
+        await self.setup()
+        async with self.lock:
+            cursor = await self.conn.execute(
+                """
+                DELETE FROM checkpoints
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+                    SELECT checkpoint_id FROM checkpoints
+                    WHERE thread_id = ? AND checkpoint_ns = ?
+                    ORDER BY checkpoint_id DESC LIMIT ?
+                )
+                """,
+                (thread_id, checkpoint_ns, thread_id, checkpoint_ns, self.keep_last),
+            )
+            removed = cursor.rowcount
+            await self.conn.execute(
+                """
+                DELETE FROM writes
+                WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id NOT IN (
+                    SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ?
+                )
+                """,
+                (thread_id, checkpoint_ns, thread_id, checkpoint_ns),
+            )
+            await self.conn.commit()
+
+        if removed:
+            logger.debug(f"Compacted {removed} checkpoints for thread {thread_id}")
+        return removed
+
+    async def avacuum(self) -> None:
+        await self.setup()
+        async with self.lock:
+            await self.conn.execute("VACUUM")
+
+
+@asynccontextmanager
+async def open_sqlite_checkpointer(db_path: str | Path, keep_last: int = 2) -> AsyncIterator[CompactingSqliteSaver]:
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    async with aiosqlite.connect(str(db_path)) as conn:
+        saver = CompactingSqliteSaver(conn, keep_last=keep_last)
+        await saver.setup()
+        logger.info(f"Using durable checkpoints at {db_path}")
+        try:
+            yield saver
+        finally:
+            await saver.avacuum()
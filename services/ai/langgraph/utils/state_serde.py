@@ -0,0 +1,11 @@
+import inspect
+
+from ..schemas import agent_outputs, expert_outputs
+
+# Structured agent outputs live in state; allow exactly those classes to be revived.
+STATE_SCHEMA_ALLOWLIST = [
+    (module.__name__, name)
+    for module in (agent_outputs, expert_outputs)
+    for name, obj in vars(module).items()
+    if inspect.isclass(obj) and obj.__module__ == module.__name__
+]
@@ -0,0 +1,109 @@
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+
+from services.ai.utils.cost_tracker import CostTracker
+
+from .langsmith_cost_extractor import NodeCostSummary, WorkflowCostSummary
+
+logger = logging.getLogger(__name__)
+
+UNATTRIBUTED_NODE = "unattributed"
+
+
+class UsageCostCallbackHandler(BaseCallbackHandler):
+    """Prices every LLM call from its `usage_metadata` as it completes.
+
+    Costs are attributed to the graph node that made the call (LangGraph's `langgraph_node`
+    run metadata) and priced locally with `CostTracker`, so totals are known while the workflow
+    runs and without a LangSmith account. `on_update` receives the running summary.
+    """
+
+    run_inline = True
+
+    def __init__(
+        self,
+        cost_tracker: CostTracker | None = None,
+        on_update: Callable[[WorkflowCostSummary], None] | None = None,
+    ):
+        self.cost_tracker = cost_tracker or CostTracker()
+        self.on_update = on_update
+        self._lock = threading.Lock()
+        self._runs: dict[UUID, tuple[str, str | None]] = {}
+        self._nodes: dict[tuple[str, str], NodeCostSummary] = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start(run_id, metadata, kwargs.get("invocation_params"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self._start(run_id, metadata, kwargs.get("invocation_params"))
+
+    def _start(self, run_id: UUID, metadata: dict | None, invocation_params: dict | None) -> None:
+        params = invocation_params or {}
+        node = (metadata or {}).get("langgraph_node", UNATTRIBUTED_NODE)
+        with self._lock:
+            self._runs[run_id] = (node, params.get("model") or params.get("model_name"))
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            self._runs.pop(run_id, None)
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        with self._lock:
+            node, requested_model = self._runs.pop(run_id, (UNATTRIBUTED_NODE, None))
+
+        for generation in (g for generations in response.generations for g in generations):
+            message = getattr(generation, "message", None)
+            usage = getattr(message, "usage_metadata", None)
+            if not usage:
+                continue
+            response_metadata = message.response_metadata or {}
+            model = response_metadata.get("model_name") or response_metadata.get("model") or requested_model
+            server_tool_use = (response_metadata.get("usage") or {}).get("server_tool_use")
+            self.record(node, model or "unknown", {**usage, "server_tool_use": server_tool_use or {}})
+
+    def record(self, node: str, model: str, usage: dict[str, Any]) -> None:
+        priced = self.cost_tracker.calculate_cost_from_usage_metadata({model: usage})
+        cost = priced[0].cost_usd if priced else 0.0
+        web_searches = priced[0].web_search_requests if priced else 0
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+
+        with self._lock:
+            entry = self._nodes.setdefault(
+                (node, model), NodeCostSummary(name=node, run_id="", model=model, cost_usd=0.0, tokens=0)
+            )
+            entry.cost_usd += cost
+            entry.tokens += usage.get("total_tokens", input_tokens + output_tokens)
+            entry.input_tokens += input_tokens
+            entry.output_tokens += output_tokens
+            entry.web_search_requests += web_searches
+
+        if self.on_update:
+            try:
+                self.on_update(self.summary())
+            except Exception as e:
+                logger.warning(f"Cost update callback failed: {e}")
+
+    def summary(
+        self, trace_id: str = "", root_run_id: str = "", execution_time: float = 0.0
+    ) -> WorkflowCostSummary:
+        with self._lock:
+            node_costs = [NodeCostSummary(**vars(entry)) for entry in self._nodes.values()]
+
+        return WorkflowCostSummary(
+            trace_id=trace_id,
+            root_run_id=root_run_id,
+            total_cost_usd=sum(node.cost_usd for node in node_costs),
+            total_tokens=sum(node.tokens for node in node_costs),
+            total_input_tokens=sum(node.input_tokens for node in node_costs),
+            total_output_tokens=sum(node.output_tokens for node in node_costs),
+            total_web_searches=sum(node.web_search_requests for node in node_costs),
+            node_costs=node_costs,
+            execution_time_seconds=execution_time,
+        )
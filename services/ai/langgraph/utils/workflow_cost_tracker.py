@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 from collections.abc import Awaitable, Callable
@@ -6,6 +7,7 @@ from datetime import datetime
 from typing import Any
 
 from .langsmith_cost_extractor import LangSmithCostExtractor, WorkflowCostSummary
+from .usage_cost_tracker import UsageCostCallbackHandler
 
 logger = logging.getLogger(__name__)
 
@@ -18,14 +20,24 @@ class WorkflowExecution:
     end_time: datetime | None = None
     execution_time_seconds: float = 0.0
     cost_summary: WorkflowCostSummary | None = None
+    langsmith_reconciliation: asyncio.Task | None = None
 
 
 class WorkflowCostTracker:
+    """Runs a workflow while pricing its LLM calls in-process from their usage metadata.
 
-    def __init__(self, project_name: str = "garmin_ai_coach_analysis"):
+    With `reconcile_with_langsmith`, the trace's LangSmith costs are fetched afterwards in a
+    background task (`execution.langsmith_reconciliation`) instead of delaying the result.
+    """
+
+    def __init__(self, project_name: str = "garmin_ai_coach_analysis", reconcile_with_langsmith: bool = False):
         self.project_name = project_name
+        self.reconcile_with_langsmith = reconcile_with_langsmith
         self.cost_extractor = LangSmithCostExtractor()
 
+    def _on_cost_update(self, cost_summary: WorkflowCostSummary) -> None:
+        pass
+
     async def run_workflow_with_cost_tracking(
         self,
         workflow_app,
@@ -33,6 +45,8 @@ class WorkflowCostTracker:
         thread_id: str,
         user_id: str = None,
         progress_callback: Callable[[str, WorkflowCostSummary], Awaitable[None]] | None = None,
+        configurable: dict[str, Any] | None = None,
+        callbacks: list | None = None,
     ) -> tuple[dict[str, Any], WorkflowExecution]:
 
         root_run_id = uuid.uuid4()
@@ -44,6 +58,7 @@ class WorkflowCostTracker:
         )
 
         final_state = dict(initial_state) if initial_state else {}
+        usage_handler = UsageCostCallbackHandler(on_update=self._on_cost_update)
 
         try:
             logger.info(
@@ -53,6 +68,7 @@ class WorkflowCostTracker:
             config = {
                 "run_id": root_run_id,
                 "run_name": "garmin_ai_coach_workflow",
+                "callbacks": [usage_handler, *(callbacks or [])],
                 "tags": [
                     f"user:{user_id}" if user_id else "user:unknown",
                     "app:garmin_ai_coach",
@@ -65,8 +81,9 @@ class WorkflowCostTracker:
                 },
             }
 
+            config["configurable"] = dict(configurable or {})
             if thread_id:
-                config["configurable"] = {"thread_id": thread_id}
+                config["configurable"]["thread_id"] = thread_id
 
             prev_lengths = {'analysis_html': None, 'planning_html': None}
 
@@ -95,26 +112,20 @@ class WorkflowCostTracker:
                 execution.end_time - execution.start_time
             ).total_seconds()
 
-            try:
-                logger.info(f"Extracting costs for deterministic trace: {execution.trace_id}")
-                cost_summary = self.cost_extractor.extract_workflow_costs_by_trace(
-                    execution.trace_id, execution.execution_time_seconds
-                )
-                cost_summary.root_run_id = execution.root_run_id
-                execution.cost_summary = cost_summary
+            cost_summary = usage_handler.summary(
+                execution.trace_id, execution.root_run_id, execution.execution_time_seconds
+            )
+            execution.cost_summary = cost_summary
 
-                if progress_callback and cost_summary.total_cost_usd > 0:
-                    await progress_callback("workflow_complete", cost_summary)
+            if progress_callback and cost_summary.total_cost_usd > 0:
+                await progress_callback("workflow_complete", cost_summary)
 
-                logger.info(
-                    f"Workflow execution complete: ${cost_summary.total_cost_usd:.4f} ({cost_summary.total_tokens} tokens)"
-                )
+            logger.info(
+                f"Workflow execution complete: ${cost_summary.total_cost_usd:.4f} ({cost_summary.total_tokens} tokens)"
+            )
 
-            except Exception as e:
-                logger.error(f"Error extracting costs for trace {execution.trace_id}: {e}")
-                execution.cost_summary = self.cost_extractor._zero_workflow_summary(
-                    execution.trace_id
-                )
+            if self.reconcile_with_langsmith and self.cost_extractor.client:
+                execution.langsmith_reconciliation = asyncio.create_task(self.reconcile_costs(execution))
 
         except Exception as e:
             logger.error(f"Error in workflow execution: {e}")
@@ -122,11 +133,27 @@ class WorkflowCostTracker:
             execution.execution_time_seconds = (
                 execution.end_time - execution.start_time
             ).total_seconds()
-            execution.cost_summary = self.cost_extractor._zero_workflow_summary(execution.trace_id)
+            execution.cost_summary = usage_handler.summary(
+                execution.trace_id, execution.root_run_id, execution.execution_time_seconds
+            )
             raise
 
         return final_state, execution
 
+    async def reconcile_costs(self, execution: WorkflowExecution) -> WorkflowCostSummary:
+        remote = await asyncio.to_thread(
+            self.cost_extractor.extract_workflow_costs_by_trace,
+            execution.trace_id,
+            execution.execution_time_seconds,
+        )
+        local = execution.cost_summary
+        logger.info(
+            f"LangSmith reconciliation for trace {execution.trace_id}: "
+            f"local ${local.total_cost_usd:.4f} / {local.total_tokens} tokens, "
+            f"LangSmith ${remote.total_cost_usd:.4f} / {remote.total_tokens} tokens"
+        )
+        return remote
+
     def get_legacy_cost_summary(self, execution: WorkflowExecution) -> dict[str, Any]:
         if not execution.cost_summary:
             return {'total_cost_usd': 0.0, 'total_tokens': 0, 'agents': [], 'model_breakdown': {}}
@@ -184,12 +211,28 @@ class WorkflowCostTracker:
 
 class ProgressIntegratedCostTracker(WorkflowCostTracker):
 
-    def __init__(self, project_name: str = "garmin_ai_coach_analysis", progress_manager=None):
-        super().__init__(project_name)
+    def __init__(
+        self,
+        project_name: str = "garmin_ai_coach_analysis",
+        progress_manager=None,
+        reconcile_with_langsmith: bool = False,
+    ):
+        super().__init__(project_name, reconcile_with_langsmith)
         self.progress_manager = progress_manager
 
+    def _on_cost_update(self, cost_summary: WorkflowCostSummary) -> None:
+        if self.progress_manager and hasattr(self.progress_manager, 'analysis_stats'):
+            self.progress_manager.analysis_stats['total_cost_usd'] = cost_summary.total_cost_usd
+            self.progress_manager.analysis_stats['total_tokens'] = cost_summary.total_tokens
+
     async def run_workflow_with_progress(
-        self, workflow_app, initial_state: dict[str, Any], thread_id: str, user_id: str = None
+        self,
+        workflow_app,
+        initial_state: dict[str, Any],
+        thread_id: str,
+        user_id: str = None,
+        configurable: dict[str, Any] | None = None,
+        callbacks: list | None = None,
     ) -> tuple[dict[str, Any], WorkflowExecution]:
 
         async def progress_callback(_event: str, cost_summary: WorkflowCostSummary):
@@ -207,5 +250,5 @@ class ProgressIntegratedCostTracker(WorkflowCostTracker):
                 )
 
         return await self.run_workflow_with_cost_tracking(
-            workflow_app, initial_state, thread_id, user_id, progress_callback
+            workflow_app, initial_state, thread_id, user_id, progress_callback, configurable, callbacks
         )
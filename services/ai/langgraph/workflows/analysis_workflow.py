@@ -1,9 +1,15 @@
 import logging
+import tempfile
+from contextlib import ExitStack
 from datetime import datetime
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
+from services.ai.runtime_registry import runtime_registry
+from services.ai.tools.plotting.plot_datasets import PLOT_DATASETS_KEY, write_plot_datasets
+from services.ai.tools.plotting.plot_result_cache import PLOT_CACHE_KEY, PlotResultCache
+
 from ..config.langsmith_config import LangSmithConfig
 from ..nodes.activity_expert_node import activity_expert_node
 from ..nodes.activity_summarizer_node import activity_summarizer_node
@@ -16,6 +22,7 @@ from ..nodes.physiology_summarizer_node import physiology_summarizer_node
 from ..nodes.plot_resolution_node import plot_resolution_node
 from ..nodes.synthesis_node import synthesis_node
 from ..state.training_analysis_state import TrainingAnalysisState, create_initial_state
+from ..utils.blob_store import BLOB_STORE_KEY, BlobStore, offload_garmin_data
 
 logger = logging.getLogger(__name__)
 
@@ -74,24 +81,35 @@ async def run_training_analysis(
     plotting_enabled: bool = False,
 ) -> dict:
     execution_id = f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-    config = {"configurable": {"thread_id": execution_id}}
+    blob_store = BlobStore()
+    config = {"configurable": {"thread_id": execution_id, BLOB_STORE_KEY: blob_store}}
     
-    async for chunk in create_analysis_workflow().astream(
-        create_initial_state(
-            user_id=user_id,
-            athlete_name=athlete_name,
-            garmin_data=garmin_data,
-            analysis_context=analysis_context,
-            competitions=competitions,
-            current_date=current_date,
-            execution_id=execution_id,
-            plotting_enabled=plotting_enabled,
-        ),
-        config=config,
-        stream_mode="values",
-    ):
-        logger.info(f"Workflow step: {list(chunk.keys()) if chunk else 'None'}")
-        final_state = chunk
+    app = runtime_registry.get_graph("analysis", create_analysis_workflow)
+    with ExitStack() as stack:
+        if plotting_enabled:
+            dataset_dir = stack.enter_context(tempfile.TemporaryDirectory(prefix="plot_datasets_"))
+            write_plot_datasets(garmin_data, dataset_dir)
+            config["configurable"][PLOT_DATASETS_KEY] = dataset_dir
+            config["configurable"][PLOT_CACHE_KEY] = PlotResultCache()
+        try:
+            async for chunk in app.astream(
+                create_initial_state(
+                    user_id=user_id,
+                    athlete_name=athlete_name,
+                    garmin_data=offload_garmin_data(garmin_data, blob_store),
+                    analysis_context=analysis_context,
+                    competitions=competitions,
+                    current_date=current_date,
+                    execution_id=execution_id,
+                    plotting_enabled=plotting_enabled,
+                ),
+                config=config,
+                stream_mode="values",
+            ):
+                logger.info(f"Workflow step: {list(chunk.keys()) if chunk else 'None'}")
+                final_state = chunk
+        finally:
+            app.checkpointer.delete_thread(execution_id)
 
     return final_state
 
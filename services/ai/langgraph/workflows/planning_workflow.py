@@ -1,9 +1,22 @@
+import asyncio
 import logging
+import shutil
+import tempfile
+import uuid
+from contextlib import AsyncExitStack
 from datetime import datetime
+from pathlib import Path
 
 from langgraph.checkpoint.memory import MemorySaver
 from langgraph.graph import END, START, StateGraph
 
+from services.ai.runtime_registry import runtime_registry
+from services.ai.tools.plotting.plot_datasets import MANIFEST_NAME, PLOT_DATASETS_KEY, write_plot_datasets
+from services.ai.tools.plotting.plot_result_cache import PLOT_CACHE_KEY, PlotResultCache
+from services.ai.tools.plotting.plot_worker_pool import plot_worker_pool
+from services.ai.utils.batch_execution import BatchCoordinator, batch_execution
+from services.ai.utils.execution_timeline import ExecutionTimeline, activate_timeline, graph_edges
+
 from ..config.langsmith_config import LangSmithConfig
 from ..nodes.activity_expert_node import activity_expert_node
 from ..nodes.activity_summarizer_node import activity_summarizer_node
@@ -20,6 +33,10 @@ from ..nodes.season_planner_node import season_planner_node
 from ..nodes.synthesis_node import synthesis_node
 from ..nodes.weekly_planner_node import weekly_planner_node
 from ..state.training_analysis_state import TrainingAnalysisState, create_initial_state
+from ..utils.blob_store import BLOB_DIR_NAME, BLOB_STORE_KEY, BlobStore, FileBlobStore, offload_garmin_data
+from ..utils.html_stream_writer import PROGRESS_CALLBACK_KEY, HtmlProgressCallback
+from ..utils.interaction_providers import INTERACTION_PROVIDER_KEY, AsyncInteractionProvider, InteractionProvider
+from ..utils.node_memo import NODE_MEMO_KEY, NodeMemoStore
 from ..utils.workflow_cost_tracker import ProgressIntegratedCostTracker
 
 logger = logging.getLogger(__name__)
@@ -69,13 +86,14 @@ async def run_weekly_planning(
     plots: list | None = None,
     available_plots: list | None = None,
 ) -> dict:
-    execution_id = f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_planning"
-    config = {"configurable": {"thread_id": execution_id}}
+    execution_id = f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_planning"
+    blob_store = BlobStore()
+    config = {"configurable": {"thread_id": execution_id, BLOB_STORE_KEY: blob_store}}
     
     initial_state = create_initial_state(
         user_id=user_id,
         athlete_name=athlete_name,
-        garmin_data=garmin_data,
+        garmin_data=offload_garmin_data(garmin_data, blob_store),
         planning_context=planning_context,
         competitions=competitions,
         current_date=current_date,
@@ -90,9 +108,13 @@ async def run_weekly_planning(
         "available_plots": available_plots or [],
     })
 
-    async for chunk in create_planning_workflow().astream(initial_state, config=config, stream_mode="values"):
-        logger.info(f"Planning workflow step: {list(chunk.keys()) if chunk else 'None'}")
-        final_state = chunk
+    app = runtime_registry.get_graph("planning", create_planning_workflow)
+    try:
+        async for chunk in app.astream(initial_state, config=config, stream_mode="values"):
+            logger.info(f"Planning workflow step: {list(chunk.keys()) if chunk else 'None'}")
+            final_state = chunk
+    finally:
+        app.checkpointer.delete_thread(execution_id)
 
     return final_state
 
@@ -172,28 +194,125 @@ async def run_complete_analysis_and_planning(
     plotting_enabled: bool = False,
     hitl_enabled: bool = True,
     skip_synthesis: bool = False,
+    html_stream_dir: str | None = None,
+    html_progress_callback: HtmlProgressCallback | None = None,
+    formatter_backends: dict[str, str] | None = None,
+    checkpoint_db: str | None = None,
+    resume_execution_id: str | None = None,
+    interaction_provider: InteractionProvider | AsyncInteractionProvider | None = None,
+    node_memo_db: str | None = None,
+    plot_cache_db: str | None = None,
+    timeline_path: str | None = None,
 ) -> dict:
-    execution_id = f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_complete"
+    if resume_execution_id and not checkpoint_db:
+        raise ValueError("Resuming a workflow requires a checkpoint database")
+
+    # The suffix keeps runs started within the same second on separate checkpoint threads.
+    execution_id = (
+        resume_execution_id or f"{user_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:8]}_complete"
+    )
     cost_tracker = ProgressIntegratedCostTracker(f"garmin_ai_coach_{user_id}", progress_manager)
+    timeline = ExecutionTimeline(execution_id)
+
+    app = runtime_registry.get_graph(
+        "integrated_analysis_and_planning", create_integrated_analysis_and_planning_workflow
+    )
+    if plotting_enabled:
+        # Workers import plotly/pandas while the summarizers run, ready for the experts' first plot.
+        plot_worker_pool.warm_up()
+
+    # Resumed runs need the blobs their checkpoints point at, so durable runs keep them on disk
+    # (one directory per execution) until the run completes.
+    blob_store = (
+        FileBlobStore(Path(checkpoint_db).parent / BLOB_DIR_NAME / execution_id) if checkpoint_db else BlobStore()
+    )
+
+    async with AsyncExitStack() as stack:
+        if checkpoint_db:
+            # The sqlite stack is only needed for durable runs.
+            from ..utils.sqlite_checkpointer import open_sqlite_checkpointer
+
+            checkpointer = await stack.enter_async_context(open_sqlite_checkpointer(checkpoint_db))
+            app = app.copy(update={"checkpointer": checkpointer})
+            logger.info(f"Checkpointing execution {execution_id} (resume with --resume {execution_id})")
 
-    final_state, execution = await cost_tracker.run_workflow_with_progress(
-        create_integrated_analysis_and_planning_workflow(),
-        create_initial_state(
-            user_id=user_id,
-            athlete_name=athlete_name,
-            garmin_data=garmin_data,
-            analysis_context=analysis_context,
-            planning_context=planning_context,
-            competitions=competitions,
-            current_date=current_date,
-            week_dates=week_dates,
-            execution_id=execution_id,
-            plotting_enabled=plotting_enabled,
-            hitl_enabled=hitl_enabled,
-            skip_synthesis=skip_synthesis,
-        ),
-        execution_id,
-        user_id,
+        dataset_dir = None
+        plot_cache = PlotResultCache(plot_cache_db) if plotting_enabled else None
+        if plotting_enabled:
+            if checkpoint_db:
+                dataset_dir = Path(checkpoint_db).parent / "plot_datasets" / execution_id
+            else:
+                dataset_dir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="plot_datasets_")))
+            # Resumed runs skip extraction and keep the datasets written by the original run.
+            if garmin_data or not (dataset_dir / MANIFEST_NAME).exists():
+                await asyncio.to_thread(write_plot_datasets, garmin_data, dataset_dir)
+
+        if resume_execution_id:
+            snapshot = await app.aget_state({"configurable": {"thread_id": execution_id}})
+            if not snapshot.values:
+                raise ValueError(f"No checkpoint found for execution '{execution_id}' in {checkpoint_db}")
+            logger.info(
+                f"Resuming execution {execution_id} at: {', '.join(snapshot.next) or 'already completed'}"
+            )
+            initial_state = None
+        else:
+            initial_state = create_initial_state(
+                user_id=user_id,
+                athlete_name=athlete_name,
+                garmin_data=offload_garmin_data(garmin_data, blob_store),
+                analysis_context=analysis_context,
+                planning_context=planning_context,
+                competitions=competitions,
+                current_date=current_date,
+                week_dates=week_dates,
+                execution_id=execution_id,
+                plotting_enabled=plotting_enabled,
+                hitl_enabled=hitl_enabled,
+                skip_synthesis=skip_synthesis,
+                html_stream_dir=html_stream_dir,
+                formatter_backends=formatter_backends,
+            )
+
+        completed = False
+        try:
+            with activate_timeline(timeline):
+                final_state, execution = await cost_tracker.run_workflow_with_progress(
+                    app,
+                    initial_state,
+                    execution_id,
+                    user_id,
+                    configurable={
+                        key: value
+                        for key, value in (
+                            (BLOB_STORE_KEY, blob_store),
+                            (PLOT_DATASETS_KEY, dataset_dir and str(dataset_dir)),
+                            (PLOT_CACHE_KEY, plot_cache),
+                            (PROGRESS_CALLBACK_KEY, html_progress_callback),
+                            (INTERACTION_PROVIDER_KEY, interaction_provider),
+                            (NODE_MEMO_KEY, NodeMemoStore(node_memo_db) if node_memo_db else None),
+                        )
+                        if value is not None
+                    },
+                    callbacks=[timeline.callback_handler()],
+                )
+            completed = not (await app.aget_state({"configurable": {"thread_id": execution_id}})).next
+        finally:
+            if not checkpoint_db:
+                app.checkpointer.delete_thread(execution_id)
+            elif completed:
+                # Only failed or interrupted runs can be resumed; finished ones leave no state behind.
+                await app.checkpointer.adelete_thread(execution_id)
+                blob_store.clear()
+                if dataset_dir:
+                    shutil.rmtree(dataset_dir, ignore_errors=True)
+            if plot_cache:
+                logger.info(f"Plot cache: {plot_cache.get_stats()}")
+            if timeline_path:
+                timeline.write_chrome_trace(timeline_path)
+
+    critical_path = timeline.critical_path(graph_edges(app))
+    logger.info(
+        f"Critical path ({critical_path['duration_seconds']}s): {' -> '.join(critical_path['path']) or 'n/a'}"
     )
 
     if execution.cost_summary:
@@ -204,6 +323,7 @@ async def run_complete_analysis_and_planning(
             "execution_time_seconds": execution.execution_time_seconds,
             "total_cost_usd": execution.cost_summary.total_cost_usd,
             "total_tokens": execution.cost_summary.total_tokens,
+            "critical_path": critical_path,
         }
         logger.info(
             f"Workflow complete for user {user_id}: "
@@ -213,6 +333,28 @@ async def run_complete_analysis_and_planning(
     else:
         logger.warning(f"No cost data available for user {user_id} workflow")
         final_state["cost_summary"] = {"total_cost_usd": 0.0, "total_tokens": 0}
-        final_state["execution_metadata"] = {}
+        final_state["execution_metadata"] = {"critical_path": critical_path}
 
     return final_state
+
+
+async def run_batch_analysis_and_planning(
+    jobs: list[dict],
+    coordinator: BatchCoordinator,
+) -> list[dict | BaseException]:
+    """Run non-interactive workflows for several athletes with their LLM calls batched per stage.
+
+    Each job holds the keyword arguments for `run_complete_analysis_and_planning`. Results come
+    back in job order; a failed athlete yields its exception instead of stopping the others.
+    """
+    if any(job.get("hitl_enabled", True) for job in jobs):
+        raise ValueError("Batch execution requires hitl_enabled=False for every job")
+    user_ids = [job["user_id"] for job in jobs]
+    if len(set(user_ids)) != len(user_ids):
+        raise ValueError("Batch execution requires a distinct user_id per job")
+
+    logger.info(f"Starting batch execution for {len(jobs)} athletes")
+    async with batch_execution(coordinator):
+        return await asyncio.gather(
+            *(run_complete_analysis_and_planning(**job) for job in jobs), return_exceptions=True
+        )
@@ -1,12 +1,15 @@
 import logging
+from collections.abc import Callable
 from dataclasses import dataclass
-
-from langchain_anthropic import ChatAnthropic
-from langchain_openai import ChatOpenAI
+from typing import TYPE_CHECKING, Any
 
 from core.config import get_config
 
 from .ai_settings import AgentRole, ai_settings
+from .runtime_registry import HTTP_POOL_LIMITS, provider_for_base_url, runtime_registry
+
+if TYPE_CHECKING:
+    from langchain_anthropic import ChatAnthropic
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +22,9 @@ class ModelConfiguration:
 
 class ModelSelector:
 
+    # When set, get_llm returns llm_factory(role, model_name) instead of a provider client (benchmarks).
+    llm_factory: Callable[[AgentRole, str], Any] | None = None
+
     CONFIGURATIONS: dict[str, ModelConfiguration] = {
         # OpenAI Models
         "gpt-4o": ModelConfiguration(name="gpt-4o", base_url="https://api.openai.com/v1"),
@@ -69,8 +75,29 @@ class ModelSelector:
     }
 
     @classmethod
-    def get_llm(cls, role: AgentRole):
-        model_name = ai_settings.get_model_for_role(role)
+    def get_provider(cls, model_name: str) -> str:
+        return provider_for_base_url(cls.CONFIGURATIONS[model_name].base_url)
+
+    @staticmethod
+    def _create_anthropic_llm(params: dict) -> "ChatAnthropic":
+        # Provider SDKs load on first use; config validation only needs CONFIGURATIONS.
+        import anthropic
+
+        from .anthropic_chat import ChatAnthropicWithHttpClient
+
+        http_async_client = None
+        coordinator = runtime_registry.batch_coordinator
+        if coordinator is not None and coordinator.supports("anthropic"):
+            http_async_client = anthropic.DefaultAsyncHttpxClient(
+                transport=coordinator.transport_for("anthropic", HTTP_POOL_LIMITS)
+            )
+        return ChatAnthropicWithHttpClient(**params, http_async_client=http_async_client)
+
+    @classmethod
+    def get_llm(cls, role: AgentRole, model_name: str | None = None):
+        model_name = model_name or ai_settings.get_model_for_role(role)
+        if cls.llm_factory is not None:
+            return cls.llm_factory(role, model_name)
         model_config = cls.CONFIGURATIONS[model_name]
         config = get_config()
         
@@ -78,7 +105,7 @@ class ModelSelector:
             "anthropic": config.anthropic_api_key,
             "openrouter": config.openrouter_api_key,
         }
-        api_key = next((api_key_map[k] for k in api_key_map if k in model_config.base_url), config.openai_api_key)
+        api_key = api_key_map.get(cls.get_provider(model_name), config.openai_api_key)
 
         logger.info(f"Configuring LLM for role {role.value} with model {model_config.name}")
 
@@ -129,7 +156,17 @@ class ModelSelector:
                 logger.info(log_msg.format(role=role.value))
 
         if "anthropic" in model_config.base_url:
-            return ChatAnthropic(**llm_params)
+            return runtime_registry.get_llm(model_name, llm_params, cls._create_anthropic_llm)
         
+        from langchain_openai import ChatOpenAI
+
         llm_params["base_url"] = model_config.base_url
-        return ChatOpenAI(**llm_params)
+        return runtime_registry.get_llm(
+            model_name,
+            llm_params,
+            lambda params: ChatOpenAI(
+                **params,
+                http_client=runtime_registry.get_http_client(model_config.base_url),
+                http_async_client=runtime_registry.get_async_http_client(model_config.base_url),
+            ),
+        )
@@ -0,0 +1,149 @@
+import asyncio
+import json
+import logging
+import threading
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+import httpx
+
+from .ai_settings import ai_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+HTTP_POOL_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=120.0)
+
+
+def provider_for_base_url(base_url: str) -> str:
+    return next((provider for provider in ("anthropic", "openrouter") if provider in base_url), "openai")
+
+
+class RuntimeRegistry:
+    """Process-wide cache of warm runtime objects.
+
+    LLM clients are keyed by (model, params) and share one keep-alive HTTP pool per
+    base URL. Compiled workflow graphs are memoized per variant. Everything except the
+    sync HTTP pools is dropped when `ai_settings.reload()` bumps its generation, and the
+    async pools are additionally tied to the event loop they were created on. While a
+    batch coordinator is set, new async pools route batchable requests through it.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._generation = ai_settings.generation
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._llms: dict[tuple[str, str], Any] = {}
+        self._graphs: dict[str, Any] = {}
+        self._http_clients: dict[str, httpx.Client] = {}
+        self._async_http_clients: dict[str, httpx.AsyncClient] = {}
+        self._closing: set[asyncio.Future] = set()
+        self.batch_coordinator = None
+        self.stats = {"llm_hits": 0, "llm_misses": 0, "graph_hits": 0, "graph_misses": 0}
+
+    def get_llm(self, model_name: str, params: dict[str, Any], factory: Callable[[dict[str, Any]], T]) -> T:
+        key = (model_name, json.dumps(params, sort_keys=True, default=str))
+
+        with self._lock:
+            self._sync_generation()
+            self._sync_loop()
+            if (llm := self._llms.get(key)) is not None:
+                self.stats["llm_hits"] += 1
+                return llm
+
+            self.stats["llm_misses"] += 1
+            llm = self._llms[key] = factory(params)
+            return llm
+
+    def get_graph(self, variant: str, factory: Callable[[], T]) -> T:
+        with self._lock:
+            self._sync_generation()
+            if (graph := self._graphs.get(variant)) is not None:
+                self.stats["graph_hits"] += 1
+                return graph
+
+            self.stats["graph_misses"] += 1
+            graph = self._graphs[variant] = factory()
+            logger.info(f"Compiled and cached workflow graph '{variant}'")
+            return graph
+
+    def get_http_client(self, base_url: str) -> httpx.Client:
+        if (client := self._http_clients.get(base_url)) is None:
+            import openai
+
+            client = self._http_clients[base_url] = openai.DefaultHttpxClient(limits=HTTP_POOL_LIMITS)
+        return client
+
+    def get_async_http_client(self, base_url: str) -> httpx.AsyncClient:
+        if (client := self._async_http_clients.get(base_url)) is None:
+            import openai
+
+            transport = None
+            if self.batch_coordinator is not None:
+                transport = self.batch_coordinator.transport_for(provider_for_base_url(base_url), HTTP_POOL_LIMITS)
+            client = self._async_http_clients[base_url] = openai.DefaultAsyncHttpxClient(
+                limits=HTTP_POOL_LIMITS, transport=transport
+            )
+        return client
+
+    def set_batch_coordinator(self, coordinator) -> None:
+        with self._lock:
+            self.batch_coordinator = coordinator
+            self._llms.clear()
+            self._async_http_clients.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._llms.clear()
+            self._graphs.clear()
+            self._async_http_clients.clear()
+            for client in self._http_clients.values():
+                client.close()
+            self._http_clients.clear()
+
+    def _sync_generation(self) -> None:
+        if self._generation != ai_settings.generation:
+            logger.info("AI settings reloaded - dropping cached LLM clients and workflow graphs")
+            self._generation = ai_settings.generation
+            self._llms.clear()
+            self._graphs.clear()
+
+    def _sync_loop(self) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        if loop is not self._loop:
+            if self._loop is not None:
+                logger.debug("Event loop changed - dropping loop-bound LLM clients and HTTP pools")
+            self._close_async_http_clients(self._loop, loop)
+            self._loop = loop
+            self._llms.clear()
+
+    def _close_async_http_clients(
+        self, owner: asyncio.AbstractEventLoop | None, current: asyncio.AbstractEventLoop
+    ) -> None:
+        clients = list(self._async_http_clients.values())
+        self._async_http_clients.clear()
+        if not clients:
+            return
+
+        # Close on the loop that owns the pools while it still runs (another thread); once it
+        # has finished, release their sockets from the current loop instead.
+        if owner is not None and owner.is_running():
+            closing = asyncio.wrap_future(asyncio.run_coroutine_threadsafe(_aclose_all(clients), owner), loop=current)
+        else:
+            closing = current.create_task(_aclose_all(clients))
+        self._closing.add(closing)
+        closing.add_done_callback(self._closing.discard)
+
+
+async def _aclose_all(clients: list[httpx.AsyncClient]) -> None:
+    for result in await asyncio.gather(*(client.aclose() for client in clients), return_exceptions=True):
+        if isinstance(result, Exception):
+            logger.debug(f"Failed to close a stale async HTTP pool: {result}")
+
+
+runtime_registry = RuntimeRegistry()
@@ -0,0 +1,127 @@
+"""Shrinks plotly figures before they are exported to report HTML.
+
+This module only depends on numpy: plot workers load it by file path, outside the package.
+"""
+from typing import Any
+
+import numpy as np
+
+DEFAULT_MAX_POINTS = 1000
+DEFAULT_SIGNIFICANT_DIGITS = 4
+DOWNSAMPLED_TRACE_TYPES = {"scatter", "scattergl"}
+# Arrays with one entry per point, as plotly property paths; decimation keeps them aligned with x/y.
+PER_POINT_ATTRIBUTES = (
+    "x", "y", "ids", "text", "hovertext", "hovertemplate", "textposition", "customdata",
+    "marker.color", "marker.size", "marker.symbol", "marker.opacity", "marker.line.color", "marker.line.width",
+    "error_x.array", "error_x.arrayminus", "error_y.array", "error_y.arrayminus",
+)
+ROUNDED_ATTRIBUTES = ("y", "z", "open", "high", "low", "close", "base")
+# Positions are never rounded: collapsing nearby x values would distort the plot.
+LOSSLESS_ATTRIBUTES = ("x", "width")
+
+
+def _as_positions(x: Any, n: int) -> np.ndarray:
+    if x is None:
+        return np.arange(n, dtype=float)
+    values = np.asarray(x)
+    if values.dtype.kind in "iuf":
+        return values.astype(float)
+    try:
+        return values.astype("datetime64[ns]").astype("int64").astype(float)
+    except (TypeError, ValueError):
+        return np.arange(n, dtype=float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of the points kept by Largest-Triangle-Three-Buckets downsampling."""
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (threshold - 2)
+    kept = np.empty(threshold, dtype=int)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = int(i * every) + 1, int((i + 1) * every) + 1
+        next_start, next_stop = stop, min(int((i + 2) * every) + 1, n)
+        avg_x = x[next_start:next_stop].mean()
+        avg_y = y[next_start:next_stop].mean()
+        areas = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = kept[i + 1] = start + int(np.argmax(areas))
+    return kept
+
+
+def round_significant(values: np.ndarray, digits: int) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    finite = np.isfinite(values) & (values != 0)
+    magnitude = np.zeros_like(values)
+    magnitude[finite] = np.floor(np.log10(np.abs(values[finite])))
+    factor = 10.0 ** (digits - 1 - magnitude)
+    return np.where(finite, np.round(values * factor) / factor, values)
+
+
+def pack_array(values: np.ndarray) -> np.ndarray | list | None:
+    """Integer arrays in the smallest dtype, which plotly emits as base64 typed arrays.
+
+    Other values stay a plain list: short decimals are smaller as JSON text than as float64,
+    and float32 would show rounding noise in hover labels.
+    """
+    if values.dtype.kind == "f" and not (np.isfinite(values).all() and np.equal(np.mod(values, 1), 0).all()):
+        return values.tolist()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if values.min() >= info.min and values.max() <= info.max:
+            return values.astype(dtype)
+    return None
+
+
+def _numeric(values: Any) -> np.ndarray | None:
+    if values is None or isinstance(values, str):
+        return None
+    array = np.asarray(values)
+    if array.dtype.kind in "iuf" and array.ndim >= 1:
+        return array
+    if array.dtype == object and array.ndim == 1:
+        try:
+            return array.astype(float)
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def optimize_figure(
+    fig: Any,
+    max_points: int = DEFAULT_MAX_POINTS,
+    significant_digits: int = DEFAULT_SIGNIFICANT_DIGITS,
+) -> dict[str, int]:
+    """Downsample long line traces to `max_points`, round values and pack arrays, in place."""
+    stats = {"points_before": 0, "points_after": 0, "traces_downsampled": 0, "arrays_packed": 0}
+    for trace in fig.data:
+        y = _numeric(getattr(trace, "y", None)) if trace.type in DOWNSAMPLED_TRACE_TYPES else None
+        if y is not None and y.ndim == 1:
+            stats["points_before"] += len(y)
+            if len(y) > max_points:
+                positions = _as_positions(trace.x, len(y))
+                keep = lttb_indices(positions, np.nan_to_num(y), max_points)
+                for name in PER_POINT_ATTRIBUTES:
+                    values = trace[name]
+                    if values is not None and np.ndim(values) == 1 and len(values) == len(y):
+                        trace[name] = np.asarray(values)[keep]
+                stats["traces_downsampled"] += 1
+            stats["points_after"] += len(trace.y)
+
+        for name in ROUNDED_ATTRIBUTES + LOSSLESS_ATTRIBUTES:
+            values = _numeric(getattr(trace, name, None))
+            if values is None or values.ndim != 1 or len(values) < 8:
+                continue
+            if name in ROUNDED_ATTRIBUTES:
+                values = round_significant(values, significant_digits)
+            elif values.dtype.kind == "f" and not np.equal(np.mod(values, 1), 0).all():
+                continue
+            if (packed := pack_array(values)) is not None:
+                trace[name] = packed
+                stats["arrays_packed"] += 1
+    return stats
@@ -2,17 +2,26 @@ import logging
 
 from langchain_core.tools import tool
 
+from .plot_result_cache import PlotResultCache
 from .plot_storage import PlotStorage
-from .production_secure_executor import run_plot_code_get_html
+from .production_secure_executor import arun_plot_code_get_html
 
 logger = logging.getLogger(__name__)
 
 
 class LangGraphPlottingTool:
 
-    def __init__(self, plot_storage: PlotStorage, agent_name: str = "unknown"):
+    def __init__(
+        self,
+        plot_storage: PlotStorage,
+        agent_name: str = "unknown",
+        dataset_dir: str | None = None,
+        cache: PlotResultCache | None = None,
+    ):
         self.plot_storage = plot_storage
         self.agent_name = agent_name
+        self.dataset_dir = dataset_dir
+        self.cache = cache
         logger.info(f"Initialized LangGraph plotting tool for agent: {agent_name}")
 
     def _count_agent_plots(self, agent_name: str) -> int:
@@ -24,7 +33,7 @@ class LangGraphPlottingTool:
     def create_plotting_tool(self):
 
         @tool("python_plotting_tool", return_direct=False)
-        def python_plotting_tool(python_code: str, description: str) -> dict:
+        async def python_plotting_tool(python_code: str, description: str) -> dict:
             """
             Execute complete Python code to create interactive Plotly visualizations.
 
@@ -40,6 +49,17 @@ class LangGraphPlottingTool:
             Available imports: plotly.graph_objects, plotly.express, plotly.io, pandas,
             numpy, datetime, math, statistics, json, collections, re
 
+            DATA: Do not paste data values into the code. Call load_dataset(name), which is
+            already defined and returns a pandas DataFrame ('date'/'start_time' parsed):
+            - "training_load_history": date, acute_load, chronic_load, acwr
+            - "vo2_max_history": sport, date, value
+            - "activities": activity_id, activity_type, activity_name, start_time, distance,
+              duration, average_hr, max_hr, activity_training_load, avg_power, ...
+            - "recovery": date, sleep_duration_total/deep/light/rem/awake,
+              sleep_quality_overall_score, sleep_resting_heart_rate, stress_avg_level, ...
+            Example: import plotly.express as px; df = load_dataset("training_load_history");
+            fig = px.line(df, x="date", y="acwr")
+
             RETURNS:
             - Success: {"ok": True, "plot_id": "...", "message": "..."}
             - Error: {"ok": False, "error": "...", "hint": "..."}
@@ -70,14 +90,16 @@ class LangGraphPlottingTool:
                     }
 
                 logger.info(f"Agent {self.agent_name} executing plotting code")
-                result = run_plot_code_get_html(python_code)
+                result = await arun_plot_code_get_html(
+                    python_code, dataset_dir=self.dataset_dir, cache=self.cache
+                )
 
                 if not result["ok"]:
                     logger.error(f"Agent {self.agent_name} plotting failed: {result['error']}")
                     return {
                         "ok": False,
                         "error": result['error'],
-                        "hint": "Check: 1) Syntax errors, 2) Import statements (import plotly.graph_objects as go), 3) 'fig' variable creation, 4) Date handling with datetime, 5) Data references"
+                        "hint": "Check: 1) Syntax errors, 2) Import statements (import plotly.graph_objects as go), 3) 'fig' variable creation, 4) Date handling with datetime, 5) Data references (load_dataset names and columns)"
                     }
 
                 html_content = result["html"]
@@ -94,7 +116,8 @@ class LangGraphPlottingTool:
                     html_content=html_content,
                     description=description,
                     agent_name=self.agent_name,
-                    data_summary="Custom plotting code",
+                    data_summary="Custom plotting code (cached)" if result.get("cached") else "Custom plotting code",
+                    optimization=result.get("stats"),
                 )
 
                 logger.info(f"Agent {self.agent_name} created plot {plot_id}")
@@ -118,6 +141,11 @@ class LangGraphPlottingTool:
 
         return python_plotting_tool
 
-def create_plotting_tools(plot_storage: PlotStorage, agent_name: str = "unknown"):
-    langgraph_tool = LangGraphPlottingTool(plot_storage, agent_name)
+def create_plotting_tools(
+    plot_storage: PlotStorage,
+    agent_name: str = "unknown",
+    dataset_dir: str | None = None,
+    cache: PlotResultCache | None = None,
+):
+    langgraph_tool = LangGraphPlottingTool(plot_storage, agent_name, dataset_dir, cache)
     return langgraph_tool.create_plotting_tool()
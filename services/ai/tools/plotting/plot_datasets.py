@@ -0,0 +1,83 @@
+import hashlib
+import json
+import logging
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PLOT_DATASETS_KEY = "plot_dataset_dir"
+MANIFEST_NAME = "manifest.json"
+
+
+def _flatten(record: Mapping[str, Any], prefix: str = "") -> dict[str, Any]:
+    flat: dict[str, Any] = {}
+    for key, value in record.items():
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{prefix}{key}_"))
+        elif not isinstance(value, list):
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def _training_load_history(garmin_data: Mapping[str, Any]) -> list[dict]:
+    return [dict(row) for row in garmin_data.get("training_load_history") or []]
+
+
+def _vo2_max_history(garmin_data: Mapping[str, Any]) -> list[dict]:
+    history = garmin_data.get("vo2_max_history") or {}
+    return [{"sport": sport, **row} for sport, rows in history.items() for row in rows or []]
+
+
+def _activities(garmin_data: Mapping[str, Any]) -> list[dict]:
+    activities = garmin_data.get("all_activities") or garmin_data.get("recent_activities") or []
+    return [
+        _flatten({key: activity.get(key) for key in ("activity_id", "activity_type", "activity_name", "start_time")})
+        | _flatten(activity.get("summary") or {})
+        for activity in activities
+    ]
+
+
+def _recovery(garmin_data: Mapping[str, Any]) -> list[dict]:
+    return [_flatten(row) for row in garmin_data.get("recovery_indicators") or []]
+
+
+DATASET_BUILDERS: dict[str, Callable[[Mapping[str, Any]], list[dict]]] = {
+    "training_load_history": _training_load_history,
+    "vo2_max_history": _vo2_max_history,
+    "activities": _activities,
+    "recovery": _recovery,
+}
+
+
+def write_plot_datasets(garmin_data: Mapping[str, Any], directory: str | Path) -> dict[str, dict]:
+    """Write each derived table as `<name>.json` records plus a manifest of rows, columns and hashes.
+
+    The plotting workers only ever read these files, so generated code references the data by
+    name instead of carrying it inline.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest: dict[str, dict] = {}
+    for name, build in DATASET_BUILDERS.items():
+        try:
+            rows = build(garmin_data)
+        except Exception as e:
+            logger.warning(f"Skipping plot dataset '{name}': {e}")
+            continue
+        payload = json.dumps(rows, default=str)
+        (directory / f"{name}.json").write_text(payload, encoding="utf-8")
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        manifest[name] = {
+            "rows": len(rows),
+            "columns": columns,
+            "sha256": hashlib.sha256(payload.encode("utf-8")).hexdigest(),
+        }
+    (directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    logger.info(f"Wrote {len(manifest)} plot datasets to {directory}")
+    return manifest
+
+
+def get_plot_dataset_dir(config: dict[str, Any] | None) -> str | None:
+    return ((config or {}).get("configurable") or {}).get(PLOT_DATASETS_KEY)
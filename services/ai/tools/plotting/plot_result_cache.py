@@ -0,0 +1,110 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import textwrap
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+from .plot_datasets import MANIFEST_NAME
+
+logger = logging.getLogger(__name__)
+
+PLOT_CACHE_KEY = "plot_cache"
+PLOT_CACHE_DB_NAME = "plot_cache.sqlite"
+
+
+def dataset_version(dataset_dir: str | Path | None) -> str:
+    if not dataset_dir:
+        return ""
+    try:
+        return hashlib.sha256((Path(dataset_dir) / MANIFEST_NAME).read_bytes()).hexdigest()
+    except FileNotFoundError:
+        return ""
+
+
+def plot_cache_key(code: str, dataset_dir: str | Path | None = None) -> str:
+    normalized = textwrap.dedent(code).strip()
+    return hashlib.sha256(f"{dataset_version(dataset_dir)}\0{normalized}".encode()).hexdigest()
+
+
+class PlotResultCache:
+    """HTML and optimizer stats of successful plot runs keyed by normalized code and dataset version.
+
+    One instance is shared by every agent of an execution; with `db_path` entries also
+    survive across runs, keeping only the newest `keep` of them.
+    """
+
+    def __init__(self, db_path: str | Path | None = None, keep: int = 200):
+        self.db_path = Path(db_path) if db_path else None
+        self.keep = keep
+        self._entries: dict[str, dict[str, Any]] = {}
+        self.hits = 0
+        self.misses = 0
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS plot_cache (
+                        key TEXT PRIMARY KEY,
+                        html TEXT NOT NULL,
+                        created_at REAL NOT NULL,
+                        stats TEXT NOT NULL DEFAULT '{}'
+                    )
+                    """
+                )
+                # Caches written before stats were stored lack the column.
+                if "stats" not in {row[1] for row in conn.execute("PRAGMA table_info(plot_cache)")}:
+                    conn.execute("ALTER TABLE plot_cache ADD COLUMN stats TEXT NOT NULL DEFAULT '{}'")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        entry = self._entries.get(key)
+        if entry is None and self.db_path:
+            with self._connect() as conn:
+                row = conn.execute("SELECT html, stats FROM plot_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                entry = self._entries[key] = {"html": row[0], "stats": json.loads(row[1])}
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key: str, html: str, stats: dict[str, Any] | None = None) -> None:
+        self._entries[key] = {"html": html, "stats": stats or {}}
+        if not self.db_path:
+            return
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO plot_cache (key, html, created_at, stats) VALUES (?, ?, ?, ?)",
+                (key, html, time.time(), json.dumps(stats or {})),
+            )
+            conn.execute(
+                """
+                DELETE FROM plot_cache WHERE key NOT IN (
+                    SELECT key FROM plot_cache ORDER BY created_at DESC LIMIT ?
+                )
+                """,
+                (self.keep,),
+            )
+
+    def get_stats(self) -> dict[str, Any]:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def get_plot_cache(config: dict[str, Any] | None) -> PlotResultCache | None:
+    return ((config or {}).get("configurable") or {}).get(PLOT_CACHE_KEY)
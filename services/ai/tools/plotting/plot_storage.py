@@ -1,6 +1,6 @@
 import logging
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any
 
@@ -15,6 +15,7 @@ class PlotMetadata:
     created_at: datetime
     html_content: str
     data_summary: str
+    optimization: dict[str, int] = field(default_factory=dict)
 
 
 class PlotStorage:
@@ -31,7 +32,12 @@ class PlotStorage:
         return f"{agent_name}_{timestamp}_{self.plot_counter:03d}"
 
     def store_plot(
-        self, html_content: str, description: str, agent_name: str, data_summary: str = ""
+        self,
+        html_content: str,
+        description: str,
+        agent_name: str,
+        data_summary: str = "",
+        optimization: dict[str, int] | None = None,
     ) -> str:
         plot_id = self.generate_plot_id(agent_name)
 
@@ -42,6 +48,7 @@ class PlotStorage:
             created_at=datetime.now(),
             html_content=html_content,
             data_summary=data_summary,
+            optimization=optimization or {},
         )
 
         self.plots[plot_id] = metadata
@@ -0,0 +1,249 @@
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from services.ai.utils.execution_timeline import timeline_span
+
+logger = logging.getLogger(__name__)
+
+FIGURE_OPTIMIZER_PATH = Path(__file__).with_name("figure_optimizer.py")
+
+# Runs in each worker: import the plotting stack once, then execute one job per request line.
+# Responses go to a duplicate of the original stdout; fd 1 is pointed at stderr so prints in
+# generated code cannot corrupt the protocol. Jobs may name a read-only dataset directory, whose
+# tables the code loads with `load_dataset(name)`; parsed tables stay cached for later jobs.
+# Figures are shrunk by figure_optimizer (loaded from the path in argv) before export.
+WORKER_SOURCE = r"""
+import builtins, importlib.util, json, os, sys, traceback
+
+protocol_out = os.fdopen(os.dup(1), "w", encoding="utf-8")
+os.dup2(2, 1)
+
+import datetime, math, statistics, collections, re
+import numpy
+import pandas
+import plotly.express
+import plotly.graph_objects
+import plotly.io as pio
+
+spec = importlib.util.spec_from_file_location("figure_optimizer", sys.argv[1])
+figure_optimizer = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(figure_optimizer)
+
+def reply(message):
+    protocol_out.write(json.dumps(message) + "\n")
+    protocol_out.flush()
+
+datasets = {}
+
+def dataset_loader(dataset_dir):
+    def load_dataset(name):
+        if not dataset_dir:
+            raise RuntimeError("No datasets are available for this plot.")
+        path = os.path.join(dataset_dir, os.path.basename(name) + ".json")
+        if not os.path.exists(path):
+            with open(os.path.join(dataset_dir, "manifest.json"), encoding="utf-8") as f:
+                raise KeyError(f"Unknown dataset {name!r}; available: {', '.join(json.load(f))}")
+        key = (path, os.stat(path).st_mtime_ns)
+        if key not in datasets:
+            with open(path, encoding="utf-8") as f:
+                frame = pandas.DataFrame(json.load(f))
+            for column in ("date", "start_time"):
+                if column in frame:
+                    frame[column] = pandas.to_datetime(frame[column], errors="coerce")
+            datasets[key] = frame
+        return datasets[key].copy()
+    return load_dataset
+
+reply({"ready": True})
+for line in sys.stdin:
+    request = json.loads(line)
+    namespace = {
+        "__name__": "__main__",
+        "__builtins__": builtins,
+        "load_dataset": dataset_loader(request.get("dataset_dir")),
+    }
+    try:
+        exec(compile(request["code"], "<plot>", "exec"), namespace)
+        if "fig" not in namespace:
+            raise RuntimeError("No variable named 'fig' was defined.")
+        fig = namespace["fig"]
+        try:
+            stats = figure_optimizer.optimize_figure(fig)
+        except Exception:
+            stats = {}
+        html = pio.to_html(fig, include_plotlyjs="cdn", full_html=False)
+        if html.strip():
+            reply({"ok": True, "html": html, "stats": stats})
+        else:
+            reply({"ok": False, "error": "No HTML output generated"})
+    except BaseException:
+        reply({"ok": False, "error": traceback.format_exc()})
+"""
+
+
+class _Worker:
+
+    def __init__(self, startup_timeout_s: float):
+        self.workdir = tempfile.TemporaryDirectory(prefix="plot_worker_")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-c", WORKER_SOURCE, str(FIGURE_OPTIMIZER_PATH)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.workdir.name,
+            env={"PYTHONWARNINGS": "ignore"},  # keep it quiet
+            text=True,
+            encoding="utf-8",
+        )
+        self.jobs = 0
+        if self._read_line(startup_timeout_s) is None:
+            self.close()
+            raise RuntimeError(f"Plot worker did not start within {startup_timeout_s}s")
+
+    def _read_line(self, timeout_s: float) -> dict | None:
+        timer = threading.Timer(timeout_s, self.proc.kill)
+        timer.start()
+        try:
+            line = self.proc.stdout.readline()
+        finally:
+            timer.cancel()
+        return json.loads(line) if line else None
+
+    def run(self, code: str, timeout_s: float, dataset_dir: str | None = None) -> dict | None:
+        self.jobs += 1
+        try:
+            self.proc.stdin.write(json.dumps({"code": code, "dataset_dir": dataset_dir}) + "\n")
+            self.proc.stdin.flush()
+        except OSError:
+            return None
+        return self._read_line(timeout_s)
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def close(self) -> None:
+        if self.alive:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            stream.close()
+        self.workdir.cleanup()
+
+
+class PlotWorkerPool:
+    """Pool of warm plotting subprocesses that already have plotly, pandas and numpy imported.
+
+    Each worker executes jobs one at a time, isolated from the coach process, and is replaced
+    after `max_jobs_per_worker` jobs, a timeout or a crash. `run` blocks; `arun` runs it in a
+    thread so async callers keep the event loop free.
+    """
+
+    def __init__(self, size: int = 2, max_jobs_per_worker: int = 25, startup_timeout_s: float = 60.0):
+        self.size = size
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.startup_timeout_s = startup_timeout_s
+        self._idle: queue.LifoQueue[_Worker] = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers: set[_Worker] = set()
+        self.stats = {"jobs": 0, "workers_started": 0, "workers_recycled": 0, "timeouts": 0}
+
+    def warm_up(self) -> None:
+        def start_one():
+            with self._slots:
+                self._release(self._spawn())
+
+        for _ in range(self.size - self._idle.qsize()):
+            threading.Thread(target=start_one, name="plot-worker-warmup", daemon=True).start()
+
+    def run(self, code: str, timeout_s: float = 6, dataset_dir: str | None = None) -> dict[str, Any]:
+        user_code = textwrap.dedent(code).strip()
+        started = time.monotonic()
+
+        with self._slots:
+            queued = time.monotonic() - started
+            try:
+                worker = self._acquire()
+            except Exception as e:
+                logger.error(f"Plot worker failed to start: {e}")
+                return {"ok": False, "error": f"Execution failed: {e}"}
+
+            sent = time.monotonic()
+            with timeline_span("plot_subprocess", "plot", queued_s=round(queued, 3), worker_jobs=worker.jobs):
+                result = worker.run(user_code, timeout_s, dataset_dir and str(dataset_dir))
+            self.stats["jobs"] += 1
+
+            if result is None:
+                # Only time spent in the worker counts towards the timeout, not the wait for a slot.
+                elapsed = time.monotonic() - sent
+                self._discard(worker)
+                if elapsed >= timeout_s:
+                    self.stats["timeouts"] += 1
+                    logger.error(f"Code execution timed out after {timeout_s} seconds")
+                    return {"ok": False, "error": f"Code execution timed out after {timeout_s} seconds"}
+                logger.error("Plot worker exited while running code")
+                return {"ok": False, "error": "Execution failed: plotting worker exited unexpectedly"}
+
+            if worker.jobs >= self.max_jobs_per_worker:
+                self._discard(worker)
+            else:
+                self._release(worker)
+
+        if not result["ok"]:
+            logger.error(f"Plot execution failed: {result['error']}")
+        return result
+
+    async def arun(self, code: str, timeout_s: float = 6, dataset_dir: str | None = None) -> dict[str, Any]:
+        return await asyncio.to_thread(self.run, code, timeout_s, dataset_dir)
+
+    def close(self) -> None:
+        with self._lock:
+            workers, self._workers = self._workers, set()
+        for worker in workers:
+            worker.close()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.startup_timeout_s)
+        with self._lock:
+            self._workers.add(worker)
+        self.stats["workers_started"] += 1
+        return worker
+
+    def _acquire(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return self._spawn()
+            if worker.alive:
+                return worker
+            self._discard(worker)
+
+    def _release(self, worker: _Worker) -> None:
+        self._idle.put(worker)
+
+    def _discard(self, worker: _Worker) -> None:
+        with self._lock:
+            self._workers.discard(worker)
+        self.stats["workers_recycled"] += 1
+        worker.close()
+
+
+# Workers start lazily, on `warm_up` or the first job.
+plot_worker_pool = PlotWorkerPool(size=min(4, os.cpu_count() or 1))
+atexit.register(plot_worker_pool.close)
@@ -1,87 +1,73 @@
 import logging
-import os
-import subprocess
-import sys
-import tempfile
-import textwrap
 
-logger = logging.getLogger(__name__)
-
-PY_TEMPLATE = r"""
-import builtins
-import types
-import sys
-
-# Allow all imports - no restrictions
-
-# ---- User code
-{user_code}
-
-# ---- Extract HTML
-import plotly.io as pio
-if "fig" not in globals():
-    raise RuntimeError("No variable named 'fig' was defined.")
-_html = pio.to_html(fig, include_plotlyjs="cdn", full_html=False)
-print(_html)
-"""
+from .plot_result_cache import PlotResultCache, plot_cache_key
+from .plot_worker_pool import PlotWorkerPool, plot_worker_pool
 
+logger = logging.getLogger(__name__)
 
-def run_plot_code_get_html(code: str, timeout_s: int = 6):
-
-    user_code = textwrap.dedent(code).strip()
-    program = PY_TEMPLATE.format(user_code=user_code)
 
-    with tempfile.TemporaryDirectory() as tmp:
-        runner = os.path.join(tmp, "runner.py")
-        with open(runner, "w", encoding="utf-8") as f:
-            f.write(program)
+def _cache_lookup(code: str, dataset_dir: str | None, cache: PlotResultCache | None) -> tuple[str | None, dict | None]:
+    if cache is None:
+        return None, None
+    key = plot_cache_key(code, dataset_dir)
+    entry = cache.get(key)
+    if entry is None:
+        return key, None
+    logger.info("Plot cache hit - skipping execution")
+    return key, {"ok": True, **entry, "cached": True}
 
-        try:
-            proc = subprocess.run(
-                [sys.executable, runner],
-                check=False,
-                input=b"",
-                capture_output=True,
-                timeout=timeout_s,
-                cwd=tmp,
-                env={"PYTHONWARNINGS": "ignore"},  # keep it quiet
-            )
 
-            if proc.returncode != 0:
-                error_output = proc.stderr.decode("utf-8", "ignore") or proc.stdout.decode(
-                    "utf-8", "ignore"
-                )
-                logger.error(
-                    f"Subprocess execution failed with return code {proc.returncode}: {error_output}"
-                )
-                return {"ok": False, "error": error_output}
+def _cache_store(key: str | None, result: dict, cache: PlotResultCache | None) -> dict:
+    if key and result["ok"]:
+        cache.put(key, result["html"], result.get("stats"))
+    return result
 
-            html_output = proc.stdout.decode("utf-8")
-            if not html_output.strip():
-                return {"ok": False, "error": "No HTML output generated"}
 
-            return {"ok": True, "html": html_output}
+def run_plot_code_get_html(
+    code: str,
+    timeout_s: int = 6,
+    dataset_dir: str | None = None,
+    cache: PlotResultCache | None = None,
+):
+    key, cached = _cache_lookup(code, dataset_dir, cache)
+    if cached:
+        return cached
+    return _cache_store(key, plot_worker_pool.run(code, timeout_s, dataset_dir), cache)
 
-        except subprocess.TimeoutExpired:
-            logger.error(f"Code execution timed out after {timeout_s} seconds")
-            return {"ok": False, "error": f"Code execution timed out after {timeout_s} seconds"}
 
-        except Exception as e:
-            logger.error(f"Subprocess execution failed: {e}")
-            return {"ok": False, "error": f"Execution failed: {str(e)}"}
+async def arun_plot_code_get_html(
+    code: str,
+    timeout_s: int = 6,
+    dataset_dir: str | None = None,
+    cache: PlotResultCache | None = None,
+):
+    key, cached = _cache_lookup(code, dataset_dir, cache)
+    if cached:
+        return cached
+    return _cache_store(key, await plot_worker_pool.arun(code, timeout_s, dataset_dir), cache)
 
 
 class ProductionSecureExecutor:
+    """Front end to the shared pool of warm, sandboxed plotting workers."""
 
-    def __init__(self, timeout_s: int = 6):
+    def __init__(self, timeout_s: int = 6, pool: PlotWorkerPool | None = None):
         self.timeout_s = timeout_s
+        self.pool = pool or plot_worker_pool
         logger.info(f"Initialized ProductionSecureExecutor with {timeout_s}s timeout")
 
+    def warm_up(self) -> None:
+        self.pool.warm_up()
+
     def execute_plotting_code(self, code: str) -> tuple[bool, str, str]:
         logger.info("Executing plotting code in secure subprocess")
+        return self._unpack(self.pool.run(code, self.timeout_s))
 
-        result = run_plot_code_get_html(code, self.timeout_s)
+    async def aexecute_plotting_code(self, code: str) -> tuple[bool, str, str]:
+        logger.info("Executing plotting code in secure subprocess")
+        return self._unpack(await self.pool.arun(code, self.timeout_s))
 
+    @staticmethod
+    def _unpack(result: dict) -> tuple[bool, str, str]:
         if result["ok"]:
             logger.info("Plotting code executed successfully")
             return True, result["html"], ""
@@ -9,12 +9,19 @@ logger = logging.getLogger(__name__)
 
 class PlotReferenceResolver:
     PLOT_PATTERN = r"\[PLOT:([^\]]+)\]"
+    # Loader scripts that pio.to_html(include_plotlyjs="cdn") puts in every plot.
+    PLOTLYJS_PATTERN = re.compile(
+        r"<script>window\.PlotlyConfig = \{MathJaxConfig: 'local'\};</script>\s*"
+        r"|<script[^>]*src=\"https://cdn\.plot\.ly/[^\"]*\"[^>]*></script>"
+    )
 
     def __init__(self, plot_storage: PlotStorage):
         self.plot_storage = plot_storage
+        self.size_stats = {"plot_html_bytes": 0, "embedded_plot_bytes": 0, "plotlyjs_loads": 0}
 
     def resolve_plot_references(self, text: str) -> str:
         resolved_plots = set()
+        self.size_stats = {"plot_html_bytes": 0, "embedded_plot_bytes": 0, "plotlyjs_loads": 0}
         
         def replace_plot_reference(match):
             plot_id = match.group(1)
@@ -37,7 +44,14 @@ class PlotReferenceResolver:
         plot_html = self.plot_storage.get_plot_html(plot_id)
         
         if plot_html:
-            return self._wrap_plot_html(plot_id, plot_html)
+            loaders = "".join(self.PLOTLYJS_PATTERN.findall(plot_html))
+            body = self.PLOTLYJS_PATTERN.sub("", plot_html)
+            # Plotly.js is loaded once, ahead of the first plot in the document.
+            prefix = loaders if loaders and not self.size_stats["plotlyjs_loads"] else ""
+            self.size_stats["plotlyjs_loads"] += bool(prefix)
+            self.size_stats["plot_html_bytes"] += len(plot_html)
+            self.size_stats["embedded_plot_bytes"] += len(prefix) + len(body)
+            return prefix + self._wrap_plot_html(plot_id, body)
         
         plot_metadata = self.plot_storage.get_plot(plot_id)
         logger.warning(f"Plot {plot_id} not found, using fallback")
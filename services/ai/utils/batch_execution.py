@@ -0,0 +1,297 @@
+import asyncio
+import importlib
+import itertools
+import json
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import anthropic
+import httpx
+import openai
+
+from core.config import get_config
+from services.ai.runtime_registry import runtime_registry
+from services.ai.utils.llm_hedging import HedgePolicy, llm_hedger
+from services.ai.utils.llm_scheduler import llm_scheduler
+
+logger = logging.getLogger(__name__)
+
+BATCHABLE_PATHS: dict[str, tuple[str, ...]] = {
+    "openai": ("/v1/chat/completions", "/v1/responses"),
+    "anthropic": ("/v1/messages",),
+}
+
+TERMINAL_OPENAI_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    path: str
+    body: dict[str, Any]
+    future: asyncio.Future = field(repr=False)
+
+
+class BatchBackend(Protocol):
+    async def execute(self, path: str, requests: list[BatchRequest]) -> dict[str, tuple[int, dict]]:
+        ...
+
+
+class OpenAIBatchBackend:
+    """Runs requests through the OpenAI Batch API (JSONL upload, batch job, output file)."""
+
+    def __init__(self, client, poll_interval: float = 30.0, completion_window: str = "24h"):
+        self.client = client
+        self.poll_interval = poll_interval
+        self.completion_window = completion_window
+
+    async def execute(self, path: str, requests: list[BatchRequest]) -> dict[str, tuple[int, dict]]:
+        lines = [
+            json.dumps({"custom_id": request.custom_id, "method": "POST", "url": path, "body": request.body})
+            for request in requests
+        ]
+        input_file = await self.client.files.create(
+            file=("batch_input.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl"),
+            purpose="batch",
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=path,
+            completion_window=self.completion_window,
+        )
+        logger.info(f"Submitted OpenAI batch {batch.id} with {len(requests)} requests to {path}")
+
+        while batch.status not in TERMINAL_OPENAI_STATUSES:
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.client.batches.retrieve(batch.id)
+        logger.info(f"OpenAI batch {batch.id} finished with status '{batch.status}'")
+
+        results: dict[str, tuple[int, dict]] = {}
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            content = await self.client.files.content(file_id)
+            for line in content.text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if response := entry.get("response"):
+                    results[entry["custom_id"]] = (response["status_code"], response["body"])
+                else:
+                    results[entry["custom_id"]] = (500, {"error": entry.get("error") or {"message": "Batch request failed"}})
+        return results
+
+
+class AnthropicBatchBackend:
+    """Runs requests through the Anthropic Message Batches API."""
+
+    def __init__(self, client, poll_interval: float = 30.0):
+        self.client = client
+        self.poll_interval = poll_interval
+
+    async def execute(self, path: str, requests: list[BatchRequest]) -> dict[str, tuple[int, dict]]:
+        batch = await self.client.messages.batches.create(
+            requests=[{"custom_id": request.custom_id, "params": request.body} for request in requests]
+        )
+        logger.info(f"Submitted Anthropic message batch {batch.id} with {len(requests)} requests")
+
+        while batch.processing_status != "ended":
+            await asyncio.sleep(self.poll_interval)
+            batch = await self.client.messages.batches.retrieve(batch.id)
+        logger.info(f"Anthropic message batch {batch.id} ended")
+
+        results: dict[str, tuple[int, dict]] = {}
+        async for entry in await self.client.messages.batches.results(batch.id):
+            if entry.result.type == "succeeded":
+                results[entry.custom_id] = (200, entry.result.message.model_dump(mode="json"))
+            elif entry.result.type == "errored":
+                results[entry.custom_id] = (500, entry.result.error.model_dump(mode="json"))
+            else:
+                results[entry.custom_id] = (
+                    500,
+                    {"type": "error", "error": {"type": "api_error", "message": f"Batch request {entry.result.type}"}},
+                )
+        return results
+
+
+class BatchCoordinator:
+    """Collects concurrent LLM requests into provider batch jobs.
+
+    Requests are grouped per (provider, endpoint) and a group is submitted once no new
+    request has arrived for `collect_window_seconds`. When every queued athlete's graph
+    is waiting on the same stage, that stage therefore becomes one batch job.
+    """
+
+    def __init__(
+        self,
+        backends: dict[str, BatchBackend],
+        collect_window_seconds: float = 5.0,
+        max_batch_size: int = 10_000,
+    ):
+        self.backends = backends
+        self.collect_window_seconds = collect_window_seconds
+        self.max_batch_size = max_batch_size
+        self._ids = itertools.count(1)
+        self._pending: dict[tuple[str, str], list[BatchRequest]] = {}
+        self._timers: dict[tuple[str, str], asyncio.TimerHandle] = {}
+        self._jobs: set[asyncio.Task] = set()
+        self.batches: list[dict[str, Any]] = []
+
+    def supports(self, provider: str) -> bool:
+        return provider in self.backends
+
+    def is_batchable(self, provider: str, request: httpx.Request) -> bool:
+        return (
+            self.supports(provider)
+            and request.method == "POST"
+            and request.url.path in BATCHABLE_PATHS.get(provider, ())
+        )
+
+    def transport_for(self, provider: str, limits: httpx.Limits | None = None) -> "BatchingTransport | None":
+        return BatchingTransport(provider, self, limits) if self.supports(provider) else None
+
+    async def submit(self, provider: str, path: str, body: dict[str, Any]) -> tuple[int, dict]:
+        loop = asyncio.get_running_loop()
+        key = (provider, path)
+        request = BatchRequest(f"req-{next(self._ids)}", path, body, loop.create_future())
+        pending = self._pending.setdefault(key, [])
+        pending.append(request)
+
+        if timer := self._timers.pop(key, None):
+            timer.cancel()
+        if len(pending) >= self.max_batch_size:
+            self._flush(key)
+        else:
+            self._timers[key] = loop.call_later(self.collect_window_seconds, self._flush, key)
+
+        return await request.future
+
+    def _flush(self, key: tuple[str, str]) -> None:
+        self._timers.pop(key, None)
+        requests = self._pending.pop(key, [])
+        if not requests:
+            return
+        job = asyncio.create_task(self._run_batch(key, requests))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _run_batch(self, key: tuple[str, str], requests: list[BatchRequest]) -> None:
+        provider, path = key
+        self.batches.append({"provider": provider, "path": path, "requests": len(requests)})
+        try:
+            results = await self.backends[provider].execute(path, requests)
+        except Exception as e:
+            logger.error(f"{provider} batch for {path} failed: {e}")
+            for request in requests:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+
+        for request in requests:
+            if request.future.done():
+                continue
+            if request.custom_id in results:
+                request.future.set_result(results[request.custom_id])
+            else:
+                request.future.set_exception(RuntimeError(f"{provider} batch returned no result for {request.custom_id}"))
+
+    async def aclose(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        for key in list(self._pending):
+            self._flush(key)
+        if self._jobs:
+            await asyncio.gather(*self._jobs, return_exceptions=True)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "batches": len(self.batches),
+            "batched_requests": sum(batch["requests"] for batch in self.batches),
+            "per_batch": list(self.batches),
+        }
+
+
+def _httpx_module(request):
+    # The openai SDK ships its own httpx fork while anthropic uses httpx; answer in the caller's flavour.
+    return importlib.import_module(type(request).__module__.partition(".")[0])
+
+
+class BatchingTransport(httpx.AsyncBaseTransport):
+    """Routes batchable POSTs for one provider through a `BatchCoordinator`.
+
+    Streaming requests and every other endpoint go to a regular pooled transport.
+    """
+
+    def __init__(self, provider: str, coordinator: BatchCoordinator, limits: httpx.Limits | None = None):
+        self.provider = provider
+        self.coordinator = coordinator
+        self.limits = limits
+        self.transport = None
+
+    async def handle_async_request(self, request):
+        http = _httpx_module(request)
+        if self.coordinator.is_batchable(self.provider, request):
+            body = json.loads(await request.aread())
+            if not body.get("stream"):
+                status_code, payload = await self.coordinator.submit(self.provider, request.url.path, body)
+                return http.Response(status_code, json=payload, request=request)
+
+        if self.transport is None:
+            self.transport = http.AsyncHTTPTransport(limits=self.limits or http.Limits())
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        if self.transport is not None:
+            await self.transport.aclose()
+
+
+@asynccontextmanager
+async def batch_execution(coordinator: BatchCoordinator) -> AsyncIterator[BatchCoordinator]:
+    """Route LLM calls made inside the block through `coordinator`.
+
+    Scheduler admission control and request hedging are suspended meanwhile: both would
+    hold requests back from the collection window or duplicate them into the next batch.
+    """
+    scheduler_enabled, hedge_policy = llm_scheduler.enabled, llm_hedger.policy
+    llm_scheduler.enabled = False
+    llm_hedger.configure(HedgePolicy())
+    runtime_registry.set_batch_coordinator(coordinator)
+    try:
+        yield coordinator
+    finally:
+        runtime_registry.set_batch_coordinator(None)
+        llm_scheduler.enabled = scheduler_enabled
+        llm_hedger.configure(hedge_policy)
+        await coordinator.aclose()
+        logger.info(f"Batch execution finished: {coordinator.get_stats()['batches']} batch jobs")
+
+
+def parse_batch_settings(settings: dict[str, Any] | None) -> dict[str, Any]:
+    settings = settings or {}
+    return {
+        "collect_window_seconds": float(settings.get("collect_window_seconds", 5.0)),
+        "poll_interval_seconds": float(settings.get("poll_interval_seconds", 60.0)),
+        "completion_window": str(settings.get("completion_window", "24h")),
+    }
+
+
+def create_batch_coordinator(
+    collect_window_seconds: float = 5.0,
+    poll_interval_seconds: float = 60.0,
+    completion_window: str = "24h",
+) -> BatchCoordinator:
+    # Providers without a batch endpoint (OpenRouter) or without a key keep calling directly.
+    config = get_config()
+    backends: dict[str, BatchBackend] = {}
+    if config.openai_api_key:
+        backends["openai"] = OpenAIBatchBackend(
+            openai.AsyncOpenAI(api_key=config.openai_api_key), poll_interval_seconds, completion_window
+        )
+    if config.anthropic_api_key:
+        backends["anthropic"] = AnthropicBatchBackend(
+            anthropic.AsyncAnthropic(api_key=config.anthropic_api_key), poll_interval_seconds
+        )
+    return BatchCoordinator(backends, collect_window_seconds=collect_window_seconds)
@@ -0,0 +1,93 @@
+import asyncio
+import logging
+import time
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Shared back-off gate for one provider.
+
+    A transient failure that carries a Retry-After hint pauses every caller until the hint
+    expires. `failure_threshold` consecutive failures open the circuit for `reset_timeout`
+    seconds, after which a single probe call decides whether it closes again.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self.blocked_until = 0.0
+        self._probe_in_flight = False
+
+    async def wait_until_ready(self) -> float:
+        waited = 0.0
+        while (delay := self._admission_delay()) > 0:
+            if waited == 0.0:
+                logger.info(f"Circuit for {self.name} is {self.state.value}; holding call for {delay:.1f}s")
+            await asyncio.sleep(delay)
+            waited += delay
+        return waited
+
+    def record_success(self) -> None:
+        if self.state is not CircuitState.CLOSED:
+            logger.info(f"Circuit for {self.name} closed after successful probe")
+        self.state = CircuitState.CLOSED
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        now = time.monotonic()
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        if self.state is CircuitState.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state is not CircuitState.OPEN:
+                logger.warning(
+                    f"Circuit for {self.name} opened after {self.consecutive_failures} consecutive failures"
+                )
+            self.state = CircuitState.OPEN
+            self.blocked_until = max(self.blocked_until, now + self.reset_timeout)
+
+    def release_probe(self) -> None:
+        self._probe_in_flight = False
+
+    def _admission_delay(self) -> float:
+        remaining = self.blocked_until - time.monotonic()
+        if remaining > 0:
+            return remaining
+
+        if self.state is CircuitState.OPEN:
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state is CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                return min(1.0, self.reset_timeout)
+            self._probe_in_flight = True
+
+        return 0.0
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    if (breaker := _breakers.get(provider)) is None:
+        breaker = _breakers[provider] = CircuitBreaker(provider)
+    return breaker
+
+
+def reset_circuit_breakers() -> None:
+    _breakers.clear()
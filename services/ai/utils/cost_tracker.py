@@ -1,5 +1,6 @@
 import json
 import logging
+import re
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -7,6 +8,8 @@ from typing import Any
 
 logger = logging.getLogger(__name__)
 
+DATED_SNAPSHOT_PATTERN = re.compile(r"-(\d{4}-\d{2}-\d{2}|\d{8})$")
+
 
 @dataclass
 class ModelUsage:
@@ -56,7 +59,13 @@ class CostTracker:
             "anthropic:claude-4-opus": "claude-opus-4-1-20250805",
             "anthropic:claude-4-sonnet": "claude-4-sonnet",
         }
-        return name_mappings.get(model_name, model_name)
+        name = name_mappings.get(model_name, model_name).removeprefix("openrouter/")
+        if name in self.pricing_data:
+            return name
+        # Responses report dated snapshots (e.g. gpt-4o-2024-08-06); price them as the base model.
+        # Other variants (gpt-4.1-mini) have their own rates and must not inherit a shorter name's.
+        base = DATED_SNAPSHOT_PATTERN.sub("", name)
+        return base if base in self.pricing_data else name
 
     def calculate_cost_from_usage_metadata(
         self, usage_metadata: dict[str, Any]
@@ -0,0 +1,295 @@
+import json
+import logging
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables.config import var_child_runnable_config
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_FILE_NAME = "timeline.json"
+WORKFLOW_TRACK = "workflow"
+
+_active_timeline: ContextVar["ExecutionTimeline | None"] = ContextVar("execution_timeline", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    track: str
+    start: float
+    end: float | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+def _current_node() -> str:
+    config = var_child_runnable_config.get() or {}
+    return (config.get("metadata") or {}).get("langgraph_node", WORKFLOW_TRACK)
+
+
+class ExecutionTimeline:
+    """Spans recorded during one workflow execution.
+
+    Graph nodes, LLM calls and tool calls come from `callback_handler()`; plot subprocesses,
+    retries, scheduler queueing and HITL waits record themselves through `timeline_span` while
+    the timeline is active. Each span lands on the track of the graph node it ran under.
+    """
+
+    def __init__(self, execution_id: str):
+        self.execution_id = execution_id
+        self.origin = time.perf_counter()
+        self.spans: list[Span] = []
+        self._lock = threading.Lock()
+
+    def start_span(self, name: str, category: str, track: str | None = None, **attributes: Any) -> Span:
+        span = Span(name, category, track or _current_node(), time.perf_counter(), attributes=attributes)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def add_span(self, name: str, category: str, duration: float, **attributes: Any) -> Span:
+        span = self.start_span(name, category, **attributes)
+        span.start, span.end = span.start - duration, span.start
+        return span
+
+    def callback_handler(self) -> "TimelineCallbackHandler":
+        return TimelineCallbackHandler(self)
+
+    def node_runs(self) -> list[Span]:
+        with self._lock:
+            runs = [span for span in self.spans if span.category == "node" and span.end is not None]
+        return sorted(runs, key=lambda span: span.start)
+
+    def critical_path(self, edges: Iterable[tuple[str, str]] | None = None, tolerance: float = 0.005) -> dict:
+        """Chain of node runs that bounded wall time, plus each node's slack.
+
+        A run's predecessor on the path is the upstream run that finished last before it started.
+        Upstream means a source of the node's static `edges`; nodes without any were reached through
+        `Command` and depend on the last router (a node without static out-edges) to finish before
+        they started. With `edges=None` every earlier run counts. Slack is how much later a node
+        could have finished without delaying the run.
+        """
+        runs = self.node_runs()
+        if not runs:
+            return {"path": [], "duration_seconds": 0.0, "nodes": {}}
+        sources: dict[str, set[str]] = {}
+        for source, target in edges or []:
+            sources.setdefault(target, set()).add(source)
+        routers = {run.name for run in runs} - {source for targets in sources.values() for source in targets}
+
+        def predecessors(index: int) -> list[int]:
+            run = runs[index]
+            finished = [i for i in range(index) if runs[i].end <= run.start + tolerance]
+            if run.name in sources:
+                return [i for i in finished if runs[i].name in sources[run.name]]
+            if edges is None or not finished:
+                return finished
+            routed_from = [i for i in finished if runs[i].name in routers] or finished
+            return [max(routed_from, key=lambda i: runs[i].end)]
+
+        graph = {index: predecessors(index) for index in range(len(runs))}
+        successors: dict[int, list[int]] = {index: [] for index in graph}
+        for index, upstream in graph.items():
+            for predecessor in upstream:
+                successors[predecessor].append(index)
+
+        run_start, run_end = runs[0].start, max(run.end for run in runs)
+        latest_finish: dict[int, float] = {}
+        for index in reversed(graph):
+            latest_finish[index] = min(
+                (latest_finish[s] - runs[s].duration for s in successors[index]),
+                default=run_end,
+            )
+
+        path = [max(graph, key=lambda i: runs[i].end)]
+        while graph[path[-1]]:
+            path.append(max(graph[path[-1]], key=lambda i: runs[i].end))
+        path.reverse()
+
+        nodes: dict[str, dict[str, Any]] = {}
+        for index, run in enumerate(runs):
+            slack = max(0.0, latest_finish[index] - run.end)
+            entry = nodes.setdefault(
+                run.name, {"start_seconds": round(run.start - self.origin, 3), "runs": 0, "duration_seconds": 0.0}
+            )
+            entry["runs"] += 1
+            entry["duration_seconds"] = round(entry["duration_seconds"] + run.duration, 3)
+            entry["slack_seconds"] = round(min(entry.get("slack_seconds", slack), slack), 3)
+
+        return {
+            "path": [runs[index].name for index in path],
+            "duration_seconds": round(run_end - run_start, 3),
+            "nodes": nodes,
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        with self._lock:
+            spans = [span for span in self.spans if span.end is not None]
+
+        tracks = {WORKFLOW_TRACK: 0}
+        for span in sorted(spans, key=lambda s: s.start):
+            tracks.setdefault(span.track, len(tracks))
+
+        events: list[dict[str, Any]] = [
+            {"ph": "M", "name": "thread_name", "pid": 1, "tid": tid, "args": {"name": track}}
+            for track, tid in tracks.items()
+        ]
+        events += [
+            {
+                "ph": "X",
+                "name": span.name,
+                "cat": span.category,
+                "pid": 1,
+                "tid": tracks[span.track],
+                "ts": round((span.start - self.origin) * 1e6),
+                "dur": round(span.duration * 1e6),
+                "args": span.attributes,
+            }
+            for span in spans
+        ]
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "metadata": {"execution_id": self.execution_id},
+        }
+
+    def write_chrome_trace(self, path: str | Path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_chrome_trace(), default=str), encoding="utf-8")
+        logger.info(f"Execution timeline written to {path} (open in chrome://tracing or ui.perfetto.dev)")
+        return path
+
+
+@contextmanager
+def activate_timeline(timeline: ExecutionTimeline) -> Iterator[ExecutionTimeline]:
+    token = _active_timeline.set(timeline)
+    try:
+        yield timeline
+    finally:
+        _active_timeline.reset(token)
+
+
+def get_active_timeline() -> ExecutionTimeline | None:
+    return _active_timeline.get()
+
+
+@contextmanager
+def timeline_span(name: str, category: str, **attributes: Any) -> Iterator[Span | None]:
+    timeline = _active_timeline.get()
+    if timeline is None:
+        yield None
+        return
+    span = timeline.start_span(name, category, **attributes)
+    try:
+        yield span
+    except BaseException as e:
+        span.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        span.end = time.perf_counter()
+
+
+def record_span(name: str, category: str, duration: float, **attributes: Any) -> None:
+    if (timeline := _active_timeline.get()) is not None:
+        timeline.add_span(name, category, duration, **attributes)
+
+
+class TimelineCallbackHandler(BaseCallbackHandler):
+    """Turns LangChain run events into node, LLM and tool spans."""
+
+    run_inline = True
+
+    def __init__(self, timeline: ExecutionTimeline):
+        self.timeline = timeline
+        self._open: dict[UUID, Span] = {}
+
+    def _begin(self, run_id: UUID, name: str, category: str, metadata: dict | None, **attributes: Any) -> None:
+        track = (metadata or {}).get("langgraph_node", WORKFLOW_TRACK)
+        self._open[run_id] = self.timeline.start_span(name, category, track=track, **attributes)
+
+    def _finish(self, run_id: UUID, **attributes: Any) -> Span | None:
+        span = self._open.pop(run_id, None)
+        if span is not None:
+            span.end = time.perf_counter()
+            span.attributes.update(attributes)
+        return span
+
+    def on_chain_start(self, serialized, inputs, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        if node and kwargs.get("name") == node and "langgraph_step" in metadata:
+            self._begin(run_id, node, "node", metadata, step=metadata["langgraph_step"])
+
+    def on_chain_end(self, outputs, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=type(error).__name__)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        params = kwargs.get("invocation_params") or {}
+        model = params.get("model") or params.get("model_name") or "llm"
+        self._begin(run_id, f"llm:{model}", "llm", metadata, model=model)
+
+    def on_llm_start(self, serialized, prompts, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        self.on_chat_model_start(serialized, prompts, run_id=run_id, metadata=metadata, **kwargs)
+
+    def on_llm_new_token(self, token: str, *, run_id: UUID, **kwargs: Any) -> None:
+        if (span := self._open.get(run_id)) is not None and "first_token_at" not in span.attributes:
+            span.attributes["first_token_at"] = time.perf_counter()
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        span = self._finish(run_id)
+        if span is None:
+            return
+        first_token_at = span.attributes.pop("first_token_at", None)
+        output_tokens = sum(
+            (getattr(g, "message", None) and (g.message.usage_metadata or {}).get("output_tokens", 0)) or 0
+            for generations in response.generations
+            for g in generations
+        )
+        generating = span.end - (first_token_at or span.start)
+        if first_token_at is not None:
+            span.attributes["time_to_first_token_s"] = round(first_token_at - span.start, 3)
+        if output_tokens:
+            span.attributes["output_tokens"] = output_tokens
+            span.attributes["tokens_per_second"] = round(output_tokens / generating, 1) if generating > 0 else None
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=type(error).__name__)
+
+    def on_tool_start(self, serialized, input_str, *, run_id: UUID, metadata=None, **kwargs: Any) -> None:
+        name = kwargs.get("name") or (serialized or {}).get("name") or "tool"
+        self._begin(run_id, f"tool:{name}", "tool", metadata)
+
+    def on_tool_end(self, output, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_tool_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, error=type(error).__name__)
+
+
+def graph_edges(app: Any) -> list[tuple[str, str]] | None:
+    """Static edges of a compiled StateGraph, including each source of a join edge."""
+    try:
+        builder = app.builder
+        edges = list(builder.edges)
+        edges += [(source, target) for sources, target in builder.waiting_edges for source in sources]
+    except AttributeError as e:
+        logger.debug(f"Graph edges unavailable, inferring node dependencies from timing: {e}")
+        return None
+    return edges
@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict, deque
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from services.ai.ai_settings import AgentRole
+from services.ai.model_config import ModelSelector
+from services.ai.utils.llm_scheduler import track_queue_wait
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_hedge_events: ContextVar[list[tuple[bool, bool]] | None] = ContextVar("llm_hedge_events", default=None)
+
+
+@dataclass
+class HedgePolicy:
+    enabled: bool = False
+    percentile: float = 95.0
+    min_samples: int = 5
+    min_delay_seconds: float = 10.0
+    history_size: int = 50
+    roles: set[AgentRole] | None = None
+    fallback_models: dict[AgentRole, str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        if not 0 < self.percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if self.min_samples < 1 or self.history_size < self.min_samples:
+            raise ValueError("history_size must be at least min_samples, which must be positive")
+        if self.min_delay_seconds < 0:
+            raise ValueError("min_delay_seconds must not be negative")
+
+
+def _track_hedge_events() -> list[tuple[bool, bool]]:
+    events = _hedge_events.get()
+    if events is None:
+        events = []
+        _hedge_events.set(events)
+    return events
+
+
+def consume_hedge_stats() -> dict[str, int]:
+    events = _hedge_events.get() or []
+    _hedge_events.set(None)
+    return {
+        "hedge_eligible_calls": len(events),
+        "hedged_calls": sum(1 for hedged, _ in events if hedged),
+        "hedge_wins": sum(1 for _, won in events if won),
+    }
+
+
+class LLMHedger:
+    """Issues a backup request when an LLM call outlives its role's usual latency.
+
+    Latencies are kept per role; once `min_samples` are known, a call still running after
+    the configured percentile (never earlier than `min_delay_seconds`) gets a duplicate on the
+    same model or the role's fallback model. The first to finish wins and the other is cancelled.
+    """
+
+    def __init__(self, policy: HedgePolicy | None = None):
+        self._latencies: dict[AgentRole, deque[float]] = {}
+        self._stats: dict[AgentRole, dict[str, int]] = defaultdict(lambda: {"calls": 0, "hedged": 0, "hedge_wins": 0})
+        self.configure(policy)
+
+    def configure(self, policy: HedgePolicy | None = None) -> None:
+        self.policy = policy or HedgePolicy()
+        self._latencies.clear()
+        self._stats.clear()
+
+    def applies_to(self, role: AgentRole | None) -> bool:
+        return (
+            self.policy.enabled
+            and role is not None
+            and (self.policy.roles is None or role in self.policy.roles)
+        )
+
+    def fallback_model(self, role: AgentRole) -> str | None:
+        return self.policy.fallback_models.get(role)
+
+    def record_latency(self, role: AgentRole, seconds: float) -> None:
+        history = self._latencies.get(role)
+        if history is None:
+            history = self._latencies[role] = deque(maxlen=self.policy.history_size)
+        history.append(seconds)
+
+    def hedge_delay(self, role: AgentRole) -> float | None:
+        history = self._latencies.get(role)
+        if not history or len(history) < self.policy.min_samples:
+            return None
+
+        ordered = sorted(history)
+        index = min(len(ordered) - 1, math.ceil(self.policy.percentile / 100 * len(ordered)) - 1)
+        return max(ordered[index], self.policy.min_delay_seconds)
+
+    async def run(
+        self,
+        role: AgentRole | None,
+        primary: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]],
+    ) -> T:
+        if not self.applies_to(role):
+            return await primary()
+
+        started = time.monotonic()
+        delay = self.hedge_delay(role)
+        stats = self._stats[role]
+        stats["calls"] += 1
+
+        # Child tasks copy this context, so bind the accumulators first or their queue
+        # waits never reach the node's cost entry.
+        track_queue_wait()
+        events = _track_hedge_events()
+
+        primary_task = asyncio.ensure_future(primary())
+        try:
+            done, _ = await asyncio.wait({primary_task}, timeout=delay)
+        except BaseException:
+            primary_task.cancel()
+            raise
+
+        if done:
+            events.append((False, False))
+            if primary_task.exception() is None:
+                self.record_latency(role, time.monotonic() - started)
+            return primary_task.result()
+
+        logger.info(f"{role.value} call exceeded {delay:.1f}s (p{self.policy.percentile:g}); sending hedged request")
+        stats["hedged"] += 1
+        hedge_task = asyncio.ensure_future(hedge())
+        winner, error = await self._first_success(primary_task, hedge_task)
+
+        hedge_won = winner is hedge_task
+        if hedge_won:
+            stats["hedge_wins"] += 1
+            logger.info(f"Hedged request won for {role.value}")
+        self.record_latency(role, time.monotonic() - started)
+        events.append((True, hedge_won))
+
+        if winner is None:
+            raise error
+        return winner.result()
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            role.value: {
+                **counts,
+                "hedge_rate": round(counts["hedged"] / counts["calls"], 3) if counts["calls"] else 0.0,
+                "hedge_delay_seconds": self.hedge_delay(role),
+            }
+            for role, counts in self._stats.items()
+        }
+
+    @staticmethod
+    async def _first_success(*tasks: asyncio.Future) -> tuple[asyncio.Future | None, BaseException | None]:
+        pending = set(tasks)
+        first_error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in tasks:
+                    if task not in done:
+                        continue
+                    if task.exception() is None:
+                        return task, None
+                    first_error = first_error or task.exception()
+            return None, first_error
+        finally:
+            for task in pending:
+                task.cancel()
+
+
+def parse_hedging_settings(settings: dict[str, Any] | None) -> HedgePolicy:
+    settings = dict(settings or {})
+
+    def to_role(role_name: str) -> AgentRole:
+        try:
+            return AgentRole(role_name)
+        except ValueError as e:
+            valid = ", ".join(role.value for role in AgentRole)
+            raise ValueError(f"Invalid hedging role '{role_name}' (roles: {valid})") from e
+
+    if (roles := settings.pop("roles", None)) is not None:
+        settings["roles"] = {to_role(name) for name in roles}
+    fallback_models = {}
+    for role_name, model_name in (settings.pop("fallback_models", None) or {}).items():
+        if model_name not in ModelSelector.CONFIGURATIONS:
+            valid = ", ".join(ModelSelector.CONFIGURATIONS)
+            raise ValueError(f"Unknown fallback model '{model_name}' for {role_name} (models: {valid})")
+        fallback_models[to_role(role_name)] = model_name
+    settings["fallback_models"] = fallback_models
+    return HedgePolicy(**settings)
+
+
+llm_hedger = LLMHedger()
@@ -0,0 +1,289 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from services.ai.ai_settings import AgentRole
+
+from .execution_timeline import record_span
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+MESSAGE_OVERHEAD_TOKENS = 4
+
+DEFAULT_PRIORITY = 5
+
+DEFAULT_ROLE_PRIORITIES: dict[AgentRole, int] = {
+    # Lower runs first. Everything downstream waits on the summarizers and experts,
+    # and the planning chain is longer than synthesis -> formatter.
+    AgentRole.SUMMARIZER: 0,
+    AgentRole.METRICS_EXPERT: 1,
+    AgentRole.PHYSIOLOGY_EXPERT: 1,
+    AgentRole.ACTIVITY_EXPERT: 1,
+    AgentRole.SEASON_PLANNER: 2,
+    AgentRole.WORKOUT: 2,
+    AgentRole.SYNTHESIS: 3,
+    AgentRole.FORMATTER: 4,
+}
+
+_queue_wait_seconds: ContextVar[list[float] | None] = ContextVar("llm_queue_wait_seconds", default=None)
+
+
+@dataclass
+class LLMBudget:
+    max_concurrency: int = 4
+    requests_per_minute: int | None = None
+    tokens_per_minute: int | None = None
+
+    def __post_init__(self):
+        if self.max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        for name in ("requests_per_minute", "tokens_per_minute"):
+            if (value := getattr(self, name)) is not None and value < 1:
+                raise ValueError(f"{name} must be positive or null")
+
+
+DEFAULT_BUDGETS: dict[str, LLMBudget] = {
+    "openai": LLMBudget(max_concurrency=8, requests_per_minute=500),
+    "anthropic": LLMBudget(max_concurrency=4, requests_per_minute=50),
+    "openrouter": LLMBudget(max_concurrency=8),
+}
+
+
+@dataclass
+class _Lane:
+    budget: LLMBudget
+    loop: asyncio.AbstractEventLoop
+    active: int = 0
+    waiters: list[tuple[int, int, asyncio.Future, int]] = field(default_factory=list)
+    request_times: deque[float] = field(default_factory=deque)
+    token_log: deque[tuple[float, int]] = field(default_factory=deque)
+    tokens_in_window: int = 0
+    timer: asyncio.TimerHandle | None = None
+    requests: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+def estimate_message_tokens(messages: list[Any]) -> int:
+    total = 0
+    for message in messages:
+        content = message.get("content", "") if isinstance(message, dict) else getattr(message, "content", message)
+        total += len(content if isinstance(content, str) else str(content)) // CHARS_PER_TOKEN
+        total += MESSAGE_OVERHEAD_TOKENS
+    return total
+
+
+def track_queue_wait() -> list[float]:
+    """Bind the current context's wait accumulator so tasks spawned from it report into it."""
+    waits = _queue_wait_seconds.get()
+    if waits is None:
+        waits = []
+        _queue_wait_seconds.set(waits)
+    return waits
+
+
+def record_queue_wait(seconds: float) -> None:
+    track_queue_wait().append(seconds)
+
+
+def consume_queue_wait() -> float:
+    waits = _queue_wait_seconds.get()
+    if not waits:
+        return 0.0
+    _queue_wait_seconds.set(None)
+    return sum(waits)
+
+
+class LLMScheduler:
+    """Process-wide admission control for LLM calls.
+
+    Each (provider, model) lane enforces its own concurrency, request-per-minute and
+    token-per-minute budget over a sliding window. Waiting calls are admitted by
+    priority, then arrival order.
+    """
+
+    def __init__(
+        self,
+        budgets: dict[str, LLMBudget] | None = None,
+        role_priorities: dict[AgentRole, int] | None = None,
+        enabled: bool = True,
+        window_seconds: float = 60.0,
+    ):
+        self.window_seconds = window_seconds
+        self._sequence = itertools.count()
+        self._lanes: dict[str, _Lane] = {}
+        self.configure(budgets, role_priorities, enabled)
+
+    def configure(
+        self,
+        budgets: dict[str, LLMBudget] | None = None,
+        role_priorities: dict[AgentRole, int] | None = None,
+        enabled: bool = True,
+    ) -> None:
+        self.budgets = {**DEFAULT_BUDGETS, **(budgets or {})}
+        self.role_priorities = {**DEFAULT_ROLE_PRIORITIES, **(role_priorities or {})}
+        self.enabled = enabled
+        self._lanes.clear()
+
+    def priority_for(self, role: AgentRole | None) -> int:
+        return self.role_priorities.get(role, DEFAULT_PRIORITY)
+
+    def budget_for(self, provider: str, model: str) -> LLMBudget:
+        return self.budgets.get(f"{provider}/{model}") or self.budgets.get(provider) or LLMBudget()
+
+    @asynccontextmanager
+    async def reserve(
+        self,
+        provider: str,
+        model: str,
+        estimated_tokens: int = 0,
+        priority: int = DEFAULT_PRIORITY,
+    ) -> AsyncIterator[float]:
+        if not self.enabled:
+            yield 0.0
+            return
+
+        lane = self._lane(provider, model)
+        if lane.budget.tokens_per_minute:
+            estimated_tokens = min(estimated_tokens, lane.budget.tokens_per_minute)
+
+        started = time.monotonic()
+        admitted = lane.loop.create_future()
+        heapq.heappush(lane.waiters, (priority, next(self._sequence), admitted, estimated_tokens))
+        self._dispatch(lane)
+
+        try:
+            await admitted
+        except asyncio.CancelledError:
+            if admitted.done() and not admitted.cancelled():
+                self._release(lane)
+            raise
+
+        waited = time.monotonic() - started
+        lane.requests += 1
+        lane.total_wait += waited
+        lane.max_wait = max(lane.max_wait, waited)
+        record_queue_wait(waited)
+        if waited > 0.001:
+            record_span("llm_queue", "queue", waited, provider=provider, model=model)
+        if waited >= 1.0:
+            logger.info(f"LLM call to {provider}/{model} waited {waited:.1f}s for scheduler admission")
+
+        try:
+            yield waited
+        finally:
+            self._release(lane)
+
+    def get_stats(self) -> dict[str, dict[str, Any]]:
+        return {
+            key: {
+                "requests": lane.requests,
+                "active": lane.active,
+                "queued": sum(1 for waiter in lane.waiters if not waiter[2].done()),
+                "total_wait_seconds": round(lane.total_wait, 3),
+                "max_wait_seconds": round(lane.max_wait, 3),
+            }
+            for key, lane in self._lanes.items()
+        }
+
+    def _lane(self, provider: str, model: str) -> _Lane:
+        key = f"{provider}/{model}"
+        loop = asyncio.get_running_loop()
+        lane = self._lanes.get(key)
+        if lane is None or lane.loop is not loop:
+            lane = self._lanes[key] = _Lane(budget=self.budget_for(provider, model), loop=loop)
+        return lane
+
+    def _release(self, lane: _Lane) -> None:
+        lane.active -= 1
+        self._dispatch(lane)
+
+    def _dispatch(self, lane: _Lane) -> None:
+        now = time.monotonic()
+        self._expire_window(lane, now)
+
+        while lane.waiters:
+            _, _, admitted, tokens = lane.waiters[0]
+            if admitted.done():
+                heapq.heappop(lane.waiters)
+                continue
+
+            if lane.active >= lane.budget.max_concurrency:
+                return
+
+            if (delay := self._rate_delay(lane, tokens, now)) > 0:
+                self._schedule_dispatch(lane, delay)
+                return
+
+            heapq.heappop(lane.waiters)
+            lane.active += 1
+            lane.request_times.append(now)
+            lane.token_log.append((now, tokens))
+            lane.tokens_in_window += tokens
+            admitted.set_result(None)
+
+    def _expire_window(self, lane: _Lane, now: float) -> None:
+        cutoff = now - self.window_seconds
+        while lane.request_times and lane.request_times[0] <= cutoff:
+            lane.request_times.popleft()
+        while lane.token_log and lane.token_log[0][0] <= cutoff:
+            lane.tokens_in_window -= lane.token_log.popleft()[1]
+
+    def _rate_delay(self, lane: _Lane, tokens: int, now: float) -> float:
+        delay = 0.0
+        budget = lane.budget
+
+        if budget.requests_per_minute and len(lane.request_times) >= budget.requests_per_minute:
+            delay = lane.request_times[0] + self.window_seconds - now
+
+        if budget.tokens_per_minute and lane.tokens_in_window + tokens > budget.tokens_per_minute:
+            remaining = lane.tokens_in_window
+            for issued_at, issued_tokens in lane.token_log:
+                remaining -= issued_tokens
+                if remaining + tokens <= budget.tokens_per_minute:
+                    delay = max(delay, issued_at + self.window_seconds - now)
+                    break
+
+        return delay
+
+    def _schedule_dispatch(self, lane: _Lane, delay: float) -> None:
+        if lane.timer is not None:
+            return
+
+        def on_timer():
+            lane.timer = None
+            self._dispatch(lane)
+
+        lane.timer = lane.loop.call_later(delay, on_timer)
+
+
+def parse_scheduler_settings(settings: dict[str, Any] | None) -> dict[str, Any]:
+    settings = settings or {}
+
+    role_priorities = {}
+    for role_name, priority in (settings.get("priorities") or {}).items():
+        try:
+            role_priorities[AgentRole(role_name)] = int(priority)
+        except ValueError as e:
+            valid = ", ".join(role.value for role in AgentRole)
+            raise ValueError(f"Invalid scheduler priority for '{role_name}' (roles: {valid})") from e
+
+    return {
+        "budgets": {
+            key: LLMBudget(**(budget or {})) for key, budget in (settings.get("budgets") or {}).items()
+        },
+        "role_priorities": role_priorities,
+        "enabled": bool(settings.get("enabled", True)),
+    }
+
+
+llm_scheduler = LLMScheduler()
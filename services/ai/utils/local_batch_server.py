@@ -0,0 +1,224 @@
+import itertools
+import json
+import time
+from collections.abc import Callable
+from email import policy
+from email.parser import BytesParser
+from typing import Any
+
+import anthropic
+import httpx
+import openai
+
+LOCAL_BATCH_URL = "http://batch.local"
+
+
+def chat_completion_body(model: str, text: str) -> dict[str, Any]:
+    return {
+        "id": "chatcmpl-local",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [
+            {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+        ],
+        "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+    }
+
+
+def anthropic_message_body(model: str, text: str) -> dict[str, Any]:
+    return {
+        "id": "msg_local",
+        "type": "message",
+        "role": "assistant",
+        "model": model,
+        "content": [{"type": "text", "text": text}],
+        "stop_reason": "end_turn",
+        "stop_sequence": None,
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+
+
+def _last_user_text(body: dict[str, Any]) -> str:
+    content = next(
+        (message["content"] for message in reversed(body.get("messages", [])) if message.get("role") == "user"),
+        "",
+    )
+    if isinstance(content, list):
+        content = " ".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return content
+
+
+def echo_responder(path: str, body: dict[str, Any]) -> dict[str, Any]:
+    text = f"Batch reply to: {_last_user_text(body)}"
+    if path == "/v1/messages":
+        return anthropic_message_body(body.get("model", ""), text)
+    return chat_completion_body(body.get("model", ""), text)
+
+
+class LocalBatchServer:
+    """In-process stand-in for the OpenAI Batch and Anthropic Message Batches APIs.
+
+    It speaks just enough of both protocols for the SDK clients returned by
+    `openai_client()` / `anthropic_client()`: uploads, batch creation, polling and result
+    download. Each batch stays in progress for `polls_until_complete` status checks, then
+    every request is answered by `responder(path, body)`.
+    """
+
+    def __init__(
+        self,
+        responder: Callable[[str, dict[str, Any]], dict[str, Any]] = echo_responder,
+        polls_until_complete: int = 1,
+    ):
+        self.responder = responder
+        self.polls_until_complete = polls_until_complete
+        self._ids = itertools.count(1)
+        self.files: dict[str, bytes] = {}
+        self.batches: dict[str, dict[str, Any]] = {}
+
+    def openai_client(self) -> openai.AsyncOpenAI:
+        return openai.AsyncOpenAI(
+            api_key="local",
+            base_url=f"{LOCAL_BATCH_URL}/v1",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle)),
+        )
+
+    def anthropic_client(self) -> anthropic.AsyncAnthropic:
+        return anthropic.AsyncAnthropic(
+            api_key="local",
+            base_url=LOCAL_BATCH_URL,
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(self.handle)),
+        )
+
+    @property
+    def submitted(self) -> list[dict[str, Any]]:
+        return [
+            {"id": batch_id, "endpoint": batch["endpoint"], "requests": len(batch["requests"])}
+            for batch_id, batch in self.batches.items()
+        ]
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        parts = path.strip("/").split("/")
+
+        if request.method == "POST" and path == "/v1/files":
+            return self._upload_file(request)
+        if request.method == "GET" and path.startswith("/v1/files/") and path.endswith("/content"):
+            return httpx.Response(200, content=self.files[parts[2]])
+        if request.method == "POST" and path == "/v1/batches":
+            return self._create_openai_batch(json.loads(request.content))
+        if request.method == "GET" and path.startswith("/v1/batches/"):
+            return httpx.Response(200, json=self._openai_batch(parts[2]))
+        if request.method == "POST" and path == "/v1/messages/batches":
+            return self._create_anthropic_batch(json.loads(request.content))
+        if request.method == "GET" and path.startswith("/v1/messages/batches/") and path.endswith("/results"):
+            return httpx.Response(200, content=self._anthropic_results(parts[3]))
+        if request.method == "GET" and path.startswith("/v1/messages/batches/"):
+            return httpx.Response(200, json=self._anthropic_batch(parts[3]))
+        return httpx.Response(404, json={"error": {"message": f"No local batch route for {request.method} {path}"}})
+
+    def _upload_file(self, request: httpx.Request) -> httpx.Response:
+        header = f"Content-Type: {request.headers['content-type']}\r\n\r\n".encode()
+        message = BytesParser(policy=policy.HTTP).parsebytes(header + request.content)
+        content = next(part.get_payload(decode=True) for part in message.iter_parts() if part.get_filename())
+        file_id = f"file-{next(self._ids)}"
+        self.files[file_id] = content
+        return httpx.Response(200, json=self._file_object(file_id, "batch"))
+
+    def _file_object(self, file_id: str, purpose: str) -> dict[str, Any]:
+        return {
+            "id": file_id,
+            "object": "file",
+            "bytes": len(self.files[file_id]),
+            "created_at": int(time.time()),
+            "filename": f"{file_id}.jsonl",
+            "purpose": purpose,
+            "status": "processed",
+        }
+
+    def _new_batch(self, endpoint: str, requests: list[dict[str, Any]]) -> str:
+        batch_id = f"batch-{next(self._ids)}"
+        self.batches[batch_id] = {"endpoint": endpoint, "requests": requests, "polls": 0, "results": None}
+        return batch_id
+
+    def _advance(self, batch_id: str) -> bool:
+        batch = self.batches[batch_id]
+        batch["polls"] += 1
+        if batch["results"] is None and batch["polls"] >= self.polls_until_complete:
+            batch["results"] = [
+                (request["custom_id"], self.responder(batch["endpoint"], request["body"]))
+                for request in batch["requests"]
+            ]
+        return batch["results"] is not None
+
+    def _create_openai_batch(self, payload: dict[str, Any]) -> httpx.Response:
+        requests = [
+            json.loads(line) for line in self.files[payload["input_file_id"]].decode("utf-8").splitlines() if line
+        ]
+        batch_id = self._new_batch(payload["endpoint"], requests)
+        self.batches[batch_id]["input_file_id"] = payload["input_file_id"]
+        return httpx.Response(200, json=self._openai_batch_object(batch_id, "validating", None))
+
+    def _openai_batch(self, batch_id: str) -> dict[str, Any]:
+        if not self._advance(batch_id):
+            return self._openai_batch_object(batch_id, "in_progress", None)
+
+        batch = self.batches[batch_id]
+        if "output_file_id" not in batch:
+            output_file_id = batch["output_file_id"] = f"file-{next(self._ids)}"
+            self.files[output_file_id] = "\n".join(
+                json.dumps({"custom_id": custom_id, "response": {"status_code": 200, "body": body}, "error": None})
+                for custom_id, body in batch["results"]
+            ).encode("utf-8")
+        return self._openai_batch_object(batch_id, "completed", batch["output_file_id"])
+
+    def _openai_batch_object(self, batch_id: str, status: str, output_file_id: str | None) -> dict[str, Any]:
+        batch = self.batches[batch_id]
+        return {
+            "id": batch_id,
+            "object": "batch",
+            "endpoint": batch["endpoint"],
+            "input_file_id": batch.get("input_file_id", ""),
+            "completion_window": "24h",
+            "status": status,
+            "output_file_id": output_file_id,
+            "error_file_id": None,
+            "created_at": int(time.time()),
+            "request_counts": {"total": len(batch["requests"]), "completed": 0, "failed": 0},
+        }
+
+    def _create_anthropic_batch(self, payload: dict[str, Any]) -> httpx.Response:
+        requests = [{"custom_id": entry["custom_id"], "body": entry["params"]} for entry in payload["requests"]]
+        batch_id = self._new_batch("/v1/messages", requests)
+        return httpx.Response(200, json=self._anthropic_batch_object(batch_id, "in_progress"))
+
+    def _anthropic_batch(self, batch_id: str) -> dict[str, Any]:
+        return self._anthropic_batch_object(batch_id, "ended" if self._advance(batch_id) else "in_progress")
+
+    def _anthropic_batch_object(self, batch_id: str, status: str) -> dict[str, Any]:
+        total = len(self.batches[batch_id]["requests"])
+        ended = status == "ended"
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": status,
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total if ended else 0,
+                "errored": 0,
+                "canceled": 0,
+                "expired": 0,
+            },
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "ended_at": "2025-01-01T00:01:00Z" if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{LOCAL_BATCH_URL}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _anthropic_results(self, batch_id: str) -> bytes:
+        return "\n".join(
+            json.dumps({"custom_id": custom_id, "result": {"type": "succeeded", "message": body}})
+            for custom_id, body in self.batches[batch_id]["results"]
+        ).encode("utf-8")
@@ -1,15 +1,42 @@
 import asyncio
 import logging
 import random
-from collections.abc import Callable
+import re
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from email.utils import parsedate_to_datetime
 from functools import wraps
 from typing import Any
 
 import anthropic
+import httpx
+import openai
 from langgraph.errors import GraphInterrupt
 
+from .execution_timeline import timeline_span
+
 logger = logging.getLogger(__name__)
 
+RETRYABLE_STATUS_CODES = frozenset({408, 409, 425, 429, 500, 502, 503, 504, *range(520, 530)})
+
+TRANSIENT_ERROR_TYPES = frozenset({"overloaded_error", "rate_limit_error", "api_error"})
+
+# (reset header, remaining header) pairs sent by OpenAI, Anthropic and OpenRouter
+RATE_LIMIT_RESET_HEADERS = (
+    ("x-ratelimit-reset-requests", "x-ratelimit-remaining-requests"),
+    ("x-ratelimit-reset-tokens", "x-ratelimit-remaining-tokens"),
+    ("anthropic-ratelimit-requests-reset", "anthropic-ratelimit-requests-remaining"),
+    ("anthropic-ratelimit-tokens-reset", "anthropic-ratelimit-tokens-remaining"),
+    ("anthropic-ratelimit-input-tokens-reset", "anthropic-ratelimit-input-tokens-remaining"),
+    ("anthropic-ratelimit-output-tokens-reset", "anthropic-ratelimit-output-tokens-remaining"),
+    ("x-ratelimit-reset", "x-ratelimit-remaining"),
+)
+
+DURATION_PART_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
 
 class RetryableError(Exception):
     pass
@@ -19,6 +46,15 @@ class APIOverloadError(RetryableError):
     pass
 
 
+@dataclass
+class ErrorClassification:
+    retryable: bool
+    provider: str | None = None
+    status_code: int | None = None
+    retry_after: float | None = None
+    reason: str = ""
+
+
 class RetryConfig:
 
     def __init__(
@@ -29,6 +65,9 @@ class RetryConfig:
         exponential_base: float = 2.0,
         jitter: bool = True,
         retryable_exceptions: set[type[Exception]] = None,
+        retryable_status_codes: frozenset[int] = RETRYABLE_STATUS_CODES,
+        respect_retry_after: bool = True,
+        max_retry_after: float = 300.0,
     ):
         self.max_retries = max_retries
         self.base_delay = base_delay
@@ -38,10 +77,22 @@ class RetryConfig:
         self.retryable_exceptions = retryable_exceptions or {
             anthropic.APIStatusError,
             anthropic.RateLimitError,
+            anthropic.APIConnectionError,
+            openai.RateLimitError,
+            openai.InternalServerError,
+            openai.APIConnectionError,
+            httpx.TransportError,
             APIOverloadError,
         }
+        self.retryable_status_codes = retryable_status_codes
+        self.respect_retry_after = respect_retry_after
+        self.max_retry_after = max_retry_after
+
+    def calculate_delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after and self.respect_retry_after:
+            delay = min(retry_after, self.max_retry_after)
+            return delay + (random.uniform(0, delay * 0.1) if self.jitter else 0.0)
 
-    def calculate_delay(self, attempt: int) -> float:
         delay = min(self.base_delay * (self.exponential_base**attempt), self.max_delay)
         if self.jitter:
             jitter_range = delay * 0.1
@@ -49,6 +100,105 @@ class RetryConfig:
         return max(delay, 0.1)
 
 
+def provider_for_host(host: str | None) -> str | None:
+    if not host:
+        return None
+    return next((provider for provider in ("anthropic", "openrouter") if provider in host), "openai")
+
+
+def _parse_reset_value(value: str, now: float) -> float | None:
+    value = value.strip()
+    try:
+        number = float(value)
+    except ValueError:
+        number = None
+
+    if number is not None:
+        if number > 1e12:
+            return number / 1000 - now
+        if number > 1e9:
+            return number - now
+        return number
+
+    if parts := DURATION_PART_PATTERN.findall(value):
+        return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() - now
+    except ValueError:
+        pass
+
+    try:
+        return parsedate_to_datetime(value).timestamp() - now
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_retry_after(headers: Mapping[str, str] | None, now: float | None = None) -> float | None:
+    if not headers:
+        return None
+    now = time.time() if now is None else now
+
+    if (retry_after_ms := headers.get("retry-after-ms")) is not None:
+        try:
+            return max(float(retry_after_ms) / 1000, 0.0)
+        except ValueError:
+            pass
+
+    if (retry_after := headers.get("retry-after")) is not None:
+        if (seconds := _parse_reset_value(retry_after, now)) is not None:
+            return max(seconds, 0.0)
+
+    resets, exhausted = [], []
+    for reset_header, remaining_header in RATE_LIMIT_RESET_HEADERS:
+        if (value := headers.get(reset_header)) is None:
+            continue
+        if (seconds := _parse_reset_value(value, now)) is None or seconds <= 0:
+            continue
+        resets.append(seconds)
+        if headers.get(remaining_header) == "0":
+            exhausted.append(seconds)
+
+    candidates = exhausted or resets
+    return max(candidates) if candidates else None
+
+
+def _anthropic_error_type(exception: Exception) -> str:
+    body = getattr(exception, "body", None)
+    error = body.get("error", {}) if isinstance(body, dict) else getattr(body, "error", {})
+    return error.get("type", "") if isinstance(error, dict) else ""
+
+
+def classify_exception(exception: Exception, config: "RetryConfig | None" = None) -> ErrorClassification:
+    config = config or DEFAULT_CONFIG
+
+    if isinstance(exception, anthropic.AnthropicError):
+        provider = "anthropic"
+    else:
+        try:
+            provider = provider_for_host(exception.request.url.host)
+        except (AttributeError, RuntimeError):
+            provider = None
+
+    if isinstance(exception, (anthropic.APIStatusError, openai.APIStatusError, httpx.HTTPStatusError)):
+        response = exception.response
+        status_code = response.status_code
+        error_type = _anthropic_error_type(exception) if isinstance(exception, anthropic.APIStatusError) else ""
+        return ErrorClassification(
+            retryable=status_code in config.retryable_status_codes or error_type in TRANSIENT_ERROR_TYPES,
+            provider=provider,
+            status_code=status_code,
+            retry_after=parse_retry_after(response.headers),
+            reason=error_type or f"HTTP {status_code}",
+        )
+
+    return ErrorClassification(
+        retryable=any(isinstance(exception, exc_type) for exc_type in config.retryable_exceptions),
+        provider=provider,
+        reason=type(exception).__name__,
+    )
+
+
 async def retry_with_backoff(
     func: Callable, config: RetryConfig = None, context: str = "operation"
 ) -> Any:
@@ -68,30 +218,23 @@ async def retry_with_backoff(
 
         except Exception as e:
             last_exception = e
+            classification = classify_exception(e, config)
 
-            is_retryable = any(isinstance(e, exc_type) for exc_type in config.retryable_exceptions)
-
-            if isinstance(e, anthropic.APIStatusError):
-                error_type = (
-                    getattr(e.body, "error", {}).get("type", "") if hasattr(e, "body") else ""
-                )
-                if error_type in ["overloaded_error", "rate_limit_error"]:
-                    is_retryable = True
-                    logger.warning(f"{context} failed with {error_type}: {e}")
-                else:
-                    logger.error(f"{context} failed with non-retryable API error: {e}")
-                    break
-
-            if not is_retryable:
-                logger.error(f"{context} failed with non-retryable error: {e}")
+            if not classification.retryable:
+                logger.error(f"{context} failed with non-retryable error ({classification.reason}): {e}")
                 break
 
             if attempt < config.max_retries:
-                delay = config.calculate_delay(attempt)
+                delay = config.calculate_delay(attempt, classification.retry_after)
+                hint = " (provider Retry-After)" if classification.retry_after else ""
                 logger.info(
-                    f"{context} failed (attempt {attempt + 1}), retrying in {delay:.1f}s: {e}"
+                    f"{context} failed (attempt {attempt + 1}, {classification.reason}), "
+                    f"retrying in {delay:.1f}s{hint}: {e}"
                 )
-                await asyncio.sleep(delay)
+                with timeline_span(
+                    "retry_backoff", "retry", context=context, attempt=attempt + 1, reason=classification.reason
+                ):
+                    await asyncio.sleep(delay)
             else:
                 logger.error(f"{context} failed after {config.max_retries + 1} attempts: {e}")
 
@@ -129,9 +272,7 @@ QUICK_RETRY_CONFIG = RetryConfig(max_retries=2, base_delay=0.5, max_delay=10.0)
 def is_anthropic_overload_error(exception: Exception) -> bool:
     return (
         isinstance(exception, anthropic.APIStatusError)
-        and hasattr(exception, "body")
-        and hasattr(exception.body, "error")
-        and exception.body.error.get("type", "") == "overloaded_error"
+        and _anthropic_error_type(exception) == "overloaded_error"
     )
 
 
@@ -0,0 +1,284 @@
+import json
+import logging
+import math
+import sqlite3
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any
+
+from services.outside.client import OutsideApiGraphQlClient
+from services.outside.models import CalendarNode
+
+logger = logging.getLogger(__name__)
+
+CALENDAR_MIRROR_DB_NAME = "calendar_mirror.sqlite"
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LAT = 111.32
+
+
+@dataclass(frozen=True)
+class CandidateRace:
+    event_id: int
+    app_type: str
+    name: str | None
+    start_date: str
+    end_date: str | None
+    city: str | None
+    state: str | None
+    latitude: float
+    longitude: float
+    event_types: list[str]
+    distance_km: float
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlambda = math.radians(lat2 - lat1), math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude: float, longitude: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the circle; longitudes span everything near the poles."""
+    dlat = radius_km / KM_PER_DEGREE_LAT
+    cos_lat = math.cos(math.radians(latitude))
+    dlon = 180.0 if cos_lat < 1e-6 else min(180.0, radius_km / (KM_PER_DEGREE_LAT * cos_lat))
+    return latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon
+
+
+def _iso_day(value: datetime | None) -> str | None:
+    return value.date().isoformat() if value else None
+
+
+class CalendarMirror:
+    """Local SQLite copy of the Outside calendar for race discovery without remote searches.
+
+    `sync` mirrors the calendar nodes of named regions (each a `searchParameters` dict for
+    `athleticEventCalendar`), skipping regions synced within `max_age_hours` and dropping events
+    that left a region or already ended. Nodes are indexed by start date and, through an SQLite
+    R-tree (a latitude/longitude B-tree where the R-tree module is missing), by position, so
+    `find_candidates` answers radius + date-window queries locally.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS calendar_nodes (
+                    rowid INTEGER PRIMARY KEY,
+                    node_id TEXT NOT NULL UNIQUE,
+                    event_id INTEGER NOT NULL,
+                    app_type TEXT NOT NULL,
+                    name TEXT,
+                    city TEXT,
+                    state TEXT,
+                    latitude REAL,
+                    longitude REAL,
+                    start_date TEXT,
+                    end_date TEXT,
+                    event_types TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS calendar_nodes_start_date ON calendar_nodes (start_date);
+                CREATE TABLE IF NOT EXISTS calendar_regions (
+                    region TEXT NOT NULL,
+                    node_id TEXT NOT NULL,
+                    synced_at REAL NOT NULL,
+                    PRIMARY KEY (region, node_id)
+                );
+                CREATE TABLE IF NOT EXISTS calendar_sync_state (
+                    region TEXT PRIMARY KEY,
+                    synced_at REAL NOT NULL,
+                    nodes INTEGER NOT NULL
+                );
+                """
+            )
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS calendar_rtree "
+                    "USING rtree(id, min_lat, max_lat, min_lon, max_lon)"
+                )
+                self.spatial_index = "rtree"
+            except sqlite3.OperationalError:
+                conn.execute(
+                    "CREATE INDEX IF NOT EXISTS calendar_nodes_position ON calendar_nodes (latitude, longitude)"
+                )
+                self.spatial_index = "btree"
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def sync(
+        self,
+        client: OutsideApiGraphQlClient,
+        regions: dict[str, dict[str, Any]],
+        app_types: list[str] | None = None,
+        max_age_hours: float = 24.0,
+        page_size: int = 100,
+        prefetch: int = 2,
+    ) -> dict[str, int | None]:
+        """Refresh stale regions; returns the nodes stored per region (None when still fresh)."""
+        wanted = {app_type.upper() for app_type in app_types} if app_types else None
+        now = time.time()
+        with self._connect() as conn:
+            synced = dict(conn.execute("SELECT region, synced_at FROM calendar_sync_state").fetchall())
+
+        results: dict[str, int | None] = {}
+        for region, params in regions.items():
+            if now - synced.get(region, 0.0) < max_age_hours * 3600:
+                results[region] = None
+                continue
+            nodes = [
+                node
+                for node in client.iter_calendar(params, page_size=page_size, prefetch=prefetch)
+                if wanted is None or node.app_type.upper() in wanted
+            ]
+            self._store_region(region, nodes, time.time())
+            results[region] = len(nodes)
+            logger.info("Calendar mirror: synced %d events for region '%s'", len(nodes), region)
+
+        self._prune(date.today().isoformat())
+        return results
+
+    def _store_region(self, region: str, nodes: list[CalendarNode], synced_at: float) -> None:
+        with self._connect() as conn:
+            for node in nodes:
+                event_types = list(node.event.event_types or []) if node.event else []
+                start_date = _iso_day(node.start_date) or (_iso_day(node.event.date) if node.event else None)
+                conn.execute(
+                    """
+                    INSERT INTO calendar_nodes (
+                        node_id, event_id, app_type, name, city, state, latitude, longitude,
+                        start_date, end_date, event_types
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (node_id) DO UPDATE SET
+                        event_id = excluded.event_id, app_type = excluded.app_type, name = excluded.name,
+                        city = excluded.city, state = excluded.state, latitude = excluded.latitude,
+                        longitude = excluded.longitude, start_date = excluded.start_date,
+                        end_date = excluded.end_date, event_types = excluded.event_types
+                    """,
+                    (
+                        node.id, node.event_id, node.app_type, node.name, node.city, node.state,
+                        node.latitude, node.longitude, start_date, _iso_day(node.end_date) or start_date,
+                        json.dumps(event_types),
+                    ),
+                )
+                if self.spatial_index == "rtree":
+                    (rowid,) = conn.execute("SELECT rowid FROM calendar_nodes WHERE node_id = ?", (node.id,)).fetchone()
+                    conn.execute("DELETE FROM calendar_rtree WHERE id = ?", (rowid,))
+                    if node.latitude is not None and node.longitude is not None:
+                        conn.execute(
+                            "INSERT INTO calendar_rtree VALUES (?, ?, ?, ?, ?)",
+                            (rowid, node.latitude, node.latitude, node.longitude, node.longitude),
+                        )
+                conn.execute(
+                    "INSERT OR REPLACE INTO calendar_regions VALUES (?, ?, ?)", (region, node.id, synced_at)
+                )
+
+            conn.execute(
+                "DELETE FROM calendar_regions WHERE region = ? AND synced_at < ?", (region, synced_at)
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO calendar_sync_state VALUES (?, ?, ?)", (region, synced_at, len(nodes))
+            )
+
+    def _prune(self, today: str) -> None:
+        """Drop events that ended before `today` or no longer belong to any region."""
+        with self._connect() as conn:
+            stale = (
+                "SELECT {} FROM calendar_nodes "
+                "WHERE end_date < ? OR node_id NOT IN (SELECT node_id FROM calendar_regions)"
+            )
+            if self.spatial_index == "rtree":
+                conn.execute(f"DELETE FROM calendar_rtree WHERE id IN ({stale.format('rowid')})", (today,))
+            conn.execute(f"DELETE FROM calendar_regions WHERE node_id IN ({stale.format('node_id')})", (today,))
+            conn.execute(f"DELETE FROM calendar_nodes WHERE rowid IN ({stale.format('rowid')})", (today,))
+
+    def find_candidates(
+        self,
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        start: date | str,
+        end: date | str,
+        app_types: list[str] | None = None,
+        event_types: list[str] | None = None,
+        limit: int | None = None,
+    ) -> list[CandidateRace]:
+        """Mirrored races starting between `start` and `end` (inclusive) within `radius_km`, by date."""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        start, end = str(start), str(end)
+        if self.spatial_index == "rtree":
+            query = """
+                SELECT n.* FROM calendar_rtree r JOIN calendar_nodes n ON n.rowid = r.id
+                WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+                  AND n.start_date BETWEEN ? AND ?
+            """
+        else:
+            query = """
+                SELECT n.* FROM calendar_nodes n
+                WHERE n.latitude BETWEEN ? AND ? AND n.longitude BETWEEN ? AND ?
+                  AND n.start_date BETWEEN ? AND ?
+            """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(query, (min_lat, max_lat, min_lon, max_lon, start, end)).fetchall()
+
+        wanted_apps = {app_type.upper() for app_type in app_types} if app_types else None
+        wanted_types = {event_type.lower() for event_type in event_types} if event_types else None
+        candidates: list[CandidateRace] = []
+        for row in rows:
+            types = json.loads(row["event_types"])
+            if wanted_apps is not None and row["app_type"].upper() not in wanted_apps:
+                continue
+            if wanted_types is not None and not wanted_types & {t.lower() for t in types}:
+                continue
+            distance = haversine_km(latitude, longitude, row["latitude"], row["longitude"])
+            if distance > radius_km:
+                continue
+            candidates.append(
+                CandidateRace(
+                    event_id=row["event_id"],
+                    app_type=row["app_type"],
+                    name=row["name"],
+                    start_date=row["start_date"],
+                    end_date=row["end_date"],
+                    city=row["city"],
+                    state=row["state"],
+                    latitude=row["latitude"],
+                    longitude=row["longitude"],
+                    event_types=types,
+                    distance_km=round(distance, 1),
+                )
+            )
+
+        candidates.sort(key=lambda race: (race.start_date, race.distance_km))
+        return candidates[:limit] if limit is not None else candidates
+
+    def find_competitions(self, priority: str = "C", **query: Any) -> list[dict[str, Any]]:
+        """`find_candidates` results as entries for the workflow's `competitions` list."""
+        priority = str(priority or "C").strip().upper()
+        competitions = []
+        for race in self.find_candidates(**query):
+            competition = {
+                "name": race.name or f"Outside Event {race.event_id}",
+                "date": race.start_date,
+                "race_type": race.event_types[0] if race.event_types else "AthleteReg Event",
+                "priority": priority if priority in {"A", "B", "C"} else "C",
+                "target_time": "",
+            }
+            if location := ", ".join(x for x in (race.city, race.state) if x):
+                competition["location"] = location
+            competitions.append(competition)
+        return competitions
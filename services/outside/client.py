@@ -1,6 +1,12 @@
+import asyncio
+import importlib.util
 import json
 import logging
-from collections.abc import Callable, Iterable
+import queue
+import threading
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date as _date
 from datetime import datetime
 from typing import Any
 
@@ -15,9 +21,16 @@ from services.outside.models import (
     PageInfo,
     SanctioningBody,
 )
+from services.outside.response_cache import OutsideResponseCache
 
+# HTTP/2 needs the optional `h2` package (httpx[http2]); without it the async client speaks HTTP/1.1.
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+ASYNC_POOL_LIMITS = httpx.Limits(max_connections=16, max_keepalive_connections=8, keepalive_expiry=30.0)
+
+
+class _OutsideApiGraphQlBase:
+    """Queries, response handling and mapping shared by the sync and async clients."""
 
-class OutsideApiGraphQlClient:
     _EVENT_BASE_FIELDS = (
         "eventId name eventUrl staticUrl vanityUrl appType city state zip "
         "date eventEndDate openRegDate closeRegDate isOpen isHighlighted "
@@ -28,38 +41,7 @@ class OutsideApiGraphQlClient:
         "name raceRecId startTime distance distanceUnit appType eventId raceDates "
         "}"
     )
-    _ALLOWED_APP_TYPES = {"BIKEREG", "RUNREG", "TRIREG", "SKIREG"}
-
-    def __init__(
-        self,
-        app_type: str = "BIKEREG",
-        endpoint: str = "https://outsideapi.com/fed-gw/graphql",
-        client: httpx.Client | None = None,
-        timeout_s: float = 20.0,
-        headers: dict[str, str] | None = None,
-    ):
-        self.app_type = self._normalize_and_validate_app_type(app_type)
-        self.endpoint = endpoint
-        base_headers = headers or {"User-Agent": "garmin-ai-coach/1.0"}
-        self._client = client or httpx.Client(timeout=timeout_s, headers=base_headers)
-        self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.info("Initialized OutsideApiGraphQlClient for app_type=%s", self.app_type)
-
-    def get_event(self, event_id: int, precache: bool = False) -> Event | None:
-        selection = self._EVENT_BASE_FIELDS + (f" {self._CATEGORIES_FIELDS}" if precache else "")
-        query = f"""
-        query($appType: ApplicationType!, $id: Int!) {{
-          athleticEvent(appType: $appType, id: $id) {{
-            {selection}
-          }}
-        }}
-        """
-        data = self._gql(query, {"appType": self.app_type, "id": int(event_id)})
-        node = ((data or {}).get("athleticEvent")) if data else None
-        return self._map_event(node, precache_categories=precache)
-
-    def get_event_categories(self, event_id: int) -> list[EventCategory]:
-        query = """
+    _CATEGORIES_QUERY = """
             query($appType: ApplicationType!, $id: Int!) {
               athleticEvent(appType: $appType, id: $id) {
                 categories {
@@ -75,105 +57,78 @@ class OutsideApiGraphQlClient:
               }
             }
             """
-        data = self._gql(query, {"appType": self.app_type, "id": int(event_id)}) or {}
-        cats = ((data.get("athleticEvent") or {}).get("categories")) or []
-        out: list[EventCategory] = []
-        for c in cats:
-            if isinstance(c, dict):
-                out.append(self._map_category(c))
-        return out
+    _ALLOWED_APP_TYPES = {"BIKEREG", "RUNREG", "TRIREG", "SKIREG"}
+    _APP_SECTIONS = {
+        "bikereg": "BIKEREG",
+        "runreg": "RUNREG",
+        "trireg": "TRIREG",
+        "skireg": "SKIREG",
+    }
+    _MAX_CONCURRENT_REQUESTS = 8
+
+    app_type: str
+    logger: logging.Logger
+    _cache: OutsideResponseCache | None = None
+
+    def _cached(self, query: str, variables: dict[str, Any]) -> dict[str, Any] | None:
+        return self._cache.get(self.app_type, query, variables) if self._cache is not None else None
+
+    def _store(self, query: str, variables: dict[str, Any], data: dict[str, Any]) -> dict[str, Any]:
+        if self._cache is not None:
+            self._cache.put(self.app_type, query, variables, data)
+        return data
+
+    def _event_query(self, precache: bool) -> str:
+        selection = self._EVENT_BASE_FIELDS + (f" {self._CATEGORIES_FIELDS}" if precache else "")
+        return f"""
+        query($appType: ApplicationType!, $id: Int!) {{
+          athleticEvent(appType: $appType, id: $id) {{
+            {selection}
+          }}
+        }}
+        """
 
-    def get_events(
-        self, event_ids: list[int], batch_size: int = 25, precache: bool = False
-    ) -> list[Event | None]:
-        results: list[Event | None] = []
+    def _events_query(self, chunk: list[int], precache: bool) -> tuple[str, dict[str, Any]]:
         selection_extra = f" {self._CATEGORIES_FIELDS}" if precache else ""
-        for chunk in self._chunks(event_ids, batch_size):
-            alias_vars = {}
-            var_defs = ["$appType: ApplicationType!"]
-            selections = []
-            for i, eid in enumerate(chunk):
-                var_name = f"id_{i}"
-                alias = f"e_{i}"
-                var_defs.append(f"${var_name}: Int!")
-                selections.append(
-                    f"""{alias}: athleticEvent(appType: $appType, id: ${var_name}) {{
-                            {self._EVENT_BASE_FIELDS}{selection_extra}
-                        }}"""
-                )
-                alias_vars[var_name] = int(eid)
+        alias_vars = {}
+        var_defs = ["$appType: ApplicationType!"]
+        selections = []
+        for i, eid in enumerate(chunk):
+            var_name = f"id_{i}"
+            alias = f"e_{i}"
+            var_defs.append(f"${var_name}: Int!")
+            selections.append(
+                f"""{alias}: athleticEvent(appType: $appType, id: ${var_name}) {{
+                        {self._EVENT_BASE_FIELDS}{selection_extra}
+                    }}"""
+            )
+            alias_vars[var_name] = int(eid)
 
-            query = f"query({', '.join(var_defs)}) {{\n" + "\n".join(selections) + "\n}"
-            variables = {"appType": self.app_type, **alias_vars}
-            data = self._gql(query, variables) or {}
+        query = f"query({', '.join(var_defs)}) {{\n" + "\n".join(selections) + "\n}"
+        return query, {"appType": self.app_type, **alias_vars}
 
-            for i, _eid in enumerate(chunk):
-                node = data.get(f"e_{i}")
-                results.append(
-                    self._map_event(node, precache_categories=precache) if node else None
-                )
+    def _events_from_batch(
+        self, data: dict[str, Any], chunk: list[int], precache: bool
+    ) -> list[Event | None]:
+        results: list[Event | None] = []
+        for i, _eid in enumerate(chunk):
+            node = data.get(f"e_{i}")
+            results.append(self._map_event(node, precache_categories=precache) if node else None)
         return results
 
-    def get_event_by_url(self, url: str, precache: bool = False) -> Event | None:
+    def _event_by_url_query(self, precache: bool) -> str:
         selection = self._EVENT_BASE_FIELDS + (f" {self._CATEGORIES_FIELDS}" if precache else "")
-        query = f"""
+        return f"""
         query($url: String) {{
           athleticEventByURL(url: $url) {{
             {selection}
           }}
         }}
         """
-        data = self._gql(query, {"url": url})
-        node = ((data or {}).get("athleticEventByURL")) if data else None
-        return self._map_event(node, precache_categories=precache) if node else None
 
-    def get_event_types(self, type_priorities: list[int] | None = None) -> list[EventType]:
-        query = """
-        query($appType: ApplicationType!, $typePriorities: [Int!]) {
-          athleticEventTypes(appType: $appType, typePriorities: $typePriorities) {
-            typeID typeDesc typePriority filterableOnCalendar mapKeyColor displayStatusOnMap
-          }
-        }
-        """
-        vars_ = {"appType": self.app_type, "typePriorities": type_priorities}
-        data = self._gql(query, vars_) or {}
-        items = data.get("athleticEventTypes") or []
-        return [self._map_event_type(it) for it in items if isinstance(it, dict)]
-
-    def get_sanctioning_bodies(self) -> list[SanctioningBody]:
-        query = """
-        query {
-          ARegSanctioningBodies {
-            id name appType
-          }
-        }
-        """
-        data = self._gql(query, {}) or {}
-        items = data.get("ARegSanctioningBodies") or []
-        out: list[SanctioningBody] = []
-        for it in items:
-            if not isinstance(it, dict):
-                continue
-            out.append(
-                SanctioningBody(
-                    id=int(it["id"]),
-                    name=it.get("name"),
-                    app_type=str(it.get("appType")),
-                )
-            )
-        return out
-
-    def search_calendar(
-        self,
-        params: dict[str, Any] | None = None,
-        first: int | None = None,
-        after: str | None = None,
-        last: int | None = None,
-        before: str | None = None,
-        precache: bool = False,
-    ) -> CalendarResult:
+    def _calendar_query(self, precache: bool) -> str:
         categories_fragment = f" {self._CATEGORIES_FIELDS}" if precache else ""
-        query = f"""
+        return f"""
         query($searchParameters: SearchEventQueryParamsInput, $first: Int, $after: String, $last: Int, $before: String) {{
           athleticEventCalendar(searchParameters: $searchParameters, first: $first, after: $after, last: $last, before: $before) {{
             totalCount
@@ -190,14 +145,12 @@ class OutsideApiGraphQlClient:
           }}
         }}
         """
-        variables = {
-            "searchParameters": params or None,
-            "first": first,
-            "after": after,
-            "last": last,
-            "before": before,
-        }
-        data = self._gql(query, variables) or {}
+
+    @staticmethod
+    def _has_next_page(page: CalendarResult) -> bool:
+        return bool(page.page_info.has_next_page and page.page_info.end_cursor and page.nodes)
+
+    def _calendar_result(self, data: dict[str, Any], precache: bool) -> CalendarResult:
         payload = data.get("athleticEventCalendar") or {}
         page_info = payload.get("pageInfo") or {}
         nodes = payload.get("nodes") or []
@@ -268,13 +221,15 @@ class OutsideApiGraphQlClient:
             race_dates=race_dates,
         )
 
-    def _gql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
-        try:
-            resp = self._client.post(self.endpoint, json={"query": query, "variables": variables})
-        except httpx.HTTPError as e:
-            self.logger.error("GraphQL transport error: %s", e)
-            raise
+    def _categories_from(self, data: dict[str, Any]) -> list[EventCategory]:
+        cats = ((data.get("athleticEvent") or {}).get("categories")) or []
+        out: list[EventCategory] = []
+        for c in cats:
+            if isinstance(c, dict):
+                out.append(self._map_category(c))
+        return out
 
+    def _parse_response(self, resp: httpx.Response) -> dict[str, Any]:
         payload: dict[str, Any] = {}
         parse_error = None
         try:
@@ -338,6 +293,9 @@ class OutsideApiGraphQlClient:
         except Exception:
             return None
 
+    def _default_categories_provider(self) -> Callable[[int], list[EventCategory]] | None:
+        return None
+
     def _map_event(
         self,
         node: dict[str, Any] | None,
@@ -355,13 +313,15 @@ class OutsideApiGraphQlClient:
             except Exception:
                 eid = -1
 
-        provider = categories_provider or (lambda event_id: self.get_event_categories(event_id))
+        provider = categories_provider or self._default_categories_provider()
 
         preloaded: list[EventCategory] | None = None
         if precache_categories:
             inline = node.get("categories")
             if isinstance(inline, list):
                 preloaded = [self._map_category(c) for c in inline if isinstance(c, dict)]
+            elif provider is None:
+                preloaded = []
             else:
                 try:
                     preloaded = provider(eid)
@@ -409,41 +369,38 @@ class OutsideApiGraphQlClient:
         p_str = str(p or "B").strip().upper()
         return p_str if p_str in {"A", "B", "C"} else "B"
 
-    def get_competitions(
-        self, entries: list[dict[str, Any]] | dict[str, list[dict[str, Any]]]
-    ) -> list[dict[str, Any]]:
-        if isinstance(entries, dict):
-            out: list[dict[str, Any]] = []
-            app_map = {
-                "bikereg": "BIKEREG",
-                "runreg": "RUNREG",
-                "trireg": "TRIREG",
-                "skireg": "SKIREG",
-            }
-            for key, lst in entries.items():
-                if not lst:
-                    continue
-                app_type = app_map.get(str(key).strip().lower())
-                if not app_type:
-                    self.logger.warning("Unknown Outside app section '%s' ignored", key)
-                    continue
+    def _competition_sections(
+        self, entries: dict[str, list[dict[str, Any]]]
+    ) -> list[tuple[str, str, list[dict[str, Any]]]]:
+        sections: list[tuple[str, str, list[dict[str, Any]]]] = []
+        for key, lst in entries.items():
+            if not lst:
+                continue
+            app_type = self._APP_SECTIONS.get(str(key).strip().lower())
+            if not app_type:
+                self.logger.warning("Unknown Outside app section '%s' ignored", key)
+                continue
+            sections.append((key, app_type, lst))
+        return sections
+
+    def _split_entries(self, entries: list[dict[str, Any]]) -> tuple[dict[int, int], dict[int, str]]:
+        """Event IDs and URLs of the entries, keyed by entry index."""
+        ids: dict[int, int] = {}
+        urls: dict[int, str] = {}
+        for index, entry in enumerate(entries):
+            eid, url = entry.get("id"), entry.get("url")
+            if eid:
                 try:
-                    sub = OutsideApiGraphQlClient(
-                        app_type=app_type,
-                        endpoint=self.endpoint,
-                        client=self._client,
-                    )
-                    out.extend(sub.get_competitions(lst))
-                except Exception as e:
-                    self.logger.error("Failed resolving competitions for '%s': %s", key, e)
-            return out
-
-        if not isinstance(entries, list) or not entries:
-            return []
-
-        from datetime import date as _date
-        from datetime import datetime
-
+                    ids[index] = int(eid)
+                except (TypeError, ValueError) as e:
+                    self.logger.error("Failed to retrieve event (id=%s): %s", eid, e)
+            elif url:
+                urls[index] = url
+        return ids, urls
+
+    def _competitions_from_events(
+        self, entries: list[dict[str, Any]], events: dict[int, Event | None]
+    ) -> list[dict[str, Any]]:
         def _iso_date(d: Any) -> str | None:
             try:
                 if isinstance(d, datetime):
@@ -458,7 +415,7 @@ class OutsideApiGraphQlClient:
 
         resolved: list[dict[str, Any]] = []
 
-        for entry in entries:
+        for index, entry in enumerate(entries):
             eid = entry.get("id")
             url = entry.get("url")
 
@@ -466,18 +423,7 @@ class OutsideApiGraphQlClient:
                 self.logger.warning("outside entry requires 'id' or 'url': %s", entry)
                 continue
 
-            event = None
-            try:
-                if eid:
-                    event = self.get_event(int(eid), precache=True)
-                elif url:
-                    event = self.get_event_by_url(url, precache=True)
-            except Exception as e:
-                self.logger.error(
-                    "Failed to retrieve event (%s): %s", f"id={eid}" if eid else f"url={url}", e
-                )
-                event = None
-
+            event = events.get(index)
             if not event:
                 self.logger.warning(
                     "OutsideAPI event not found (%s)", f"id={eid}" if eid else f"url={url}"
@@ -548,3 +494,447 @@ class OutsideApiGraphQlClient:
                 "See Outside AthleteReg GraphQL ApplicationType enum."
             )
         return at
+
+
+class OutsideApiGraphQlClient(_OutsideApiGraphQlBase):
+    def __init__(
+        self,
+        app_type: str = "BIKEREG",
+        endpoint: str = "https://outsideapi.com/fed-gw/graphql",
+        client: httpx.Client | None = None,
+        timeout_s: float = 20.0,
+        headers: dict[str, str] | None = None,
+        cache: OutsideResponseCache | None = None,
+    ):
+        self.app_type = self._normalize_and_validate_app_type(app_type)
+        self._cache = cache
+        self.endpoint = endpoint
+        base_headers = headers or {"User-Agent": "garmin-ai-coach/1.0"}
+        self._client = client or httpx.Client(timeout=timeout_s, headers=base_headers)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger.info("Initialized OutsideApiGraphQlClient for app_type=%s", self.app_type)
+
+    def get_event(self, event_id: int, precache: bool = False) -> Event | None:
+        data = self._gql(self._event_query(precache), {"appType": self.app_type, "id": int(event_id)})
+        node = ((data or {}).get("athleticEvent")) if data else None
+        return self._map_event(node, precache_categories=precache)
+
+    def get_event_categories(self, event_id: int) -> list[EventCategory]:
+        data = self._gql(self._CATEGORIES_QUERY, {"appType": self.app_type, "id": int(event_id)}) or {}
+        return self._categories_from(data)
+
+    def get_events(
+        self, event_ids: list[int], batch_size: int = 25, precache: bool = False
+    ) -> list[Event | None]:
+        results: list[Event | None] = []
+        for chunk in self._chunks(event_ids, batch_size):
+            query, variables = self._events_query(chunk, precache)
+            data = self._gql(query, variables) or {}
+            results.extend(self._events_from_batch(data, chunk, precache))
+        return results
+
+    def get_event_by_url(self, url: str, precache: bool = False) -> Event | None:
+        data = self._gql(self._event_by_url_query(precache), {"url": url})
+        node = ((data or {}).get("athleticEventByURL")) if data else None
+        return self._map_event(node, precache_categories=precache) if node else None
+
+    def get_event_types(self, type_priorities: list[int] | None = None) -> list[EventType]:
+        query = """
+        query($appType: ApplicationType!, $typePriorities: [Int!]) {
+          athleticEventTypes(appType: $appType, typePriorities: $typePriorities) {
+            typeID typeDesc typePriority filterableOnCalendar mapKeyColor displayStatusOnMap
+          }
+        }
+        """
+        vars_ = {"appType": self.app_type, "typePriorities": type_priorities}
+        data = self._gql(query, vars_) or {}
+        items = data.get("athleticEventTypes") or []
+        return [self._map_event_type(it) for it in items if isinstance(it, dict)]
+
+    def get_sanctioning_bodies(self) -> list[SanctioningBody]:
+        query = """
+        query {
+          ARegSanctioningBodies {
+            id name appType
+          }
+        }
+        """
+        data = self._gql(query, {}) or {}
+        items = data.get("ARegSanctioningBodies") or []
+        out: list[SanctioningBody] = []
+        for it in items:
+            if not isinstance(it, dict):
+                continue
+            out.append(
+                SanctioningBody(
+                    id=int(it["id"]),
+                    name=it.get("name"),
+                    app_type=str(it.get("appType")),
+                )
+            )
+        return out
+
+    def search_calendar(
+        self,
+        params: dict[str, Any] | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        precache: bool = False,
+    ) -> CalendarResult:
+        variables = {
+            "searchParameters": params or None,
+            "first": first,
+            "after": after,
+            "last": last,
+            "before": before,
+        }
+        data = self._gql(self._calendar_query(precache), variables) or {}
+        return self._calendar_result(data, precache)
+
+    def iter_calendar(
+        self,
+        params: dict[str, Any] | None = None,
+        page_size: int = 100,
+        prefetch: int = 1,
+        precache: bool = False,
+    ) -> Iterator[CalendarNode]:
+        """Yield every calendar node matching `params`, following the page cursors.
+
+        A background thread keeps up to `prefetch` pages ahead of the consumer, so the next round
+        trip overlaps the processing of the current page; `prefetch=0` fetches pages on demand.
+        With `precache`, each page carries its events' categories.
+        """
+
+        def fetch(cursor: str | None) -> CalendarResult:
+            return self.search_calendar(params, first=page_size, after=cursor, precache=precache)
+
+        if prefetch <= 0:
+            cursor = None
+            while True:
+                page = fetch(cursor)
+                yield from page.nodes
+                if not self._has_next_page(page):
+                    return
+                cursor = page.page_info.end_cursor
+
+        pages: queue.Queue[CalendarResult | Exception | None] = queue.Queue(maxsize=prefetch)
+        stop = threading.Event()
+
+        def put(item: CalendarResult | Exception | None) -> None:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def produce() -> None:
+            cursor = None
+            try:
+                while not stop.is_set():
+                    page = fetch(cursor)
+                    put(page)
+                    if not self._has_next_page(page):
+                        break
+                    cursor = page.page_info.end_cursor
+            except Exception as e:
+                put(e)
+            put(None)
+
+        threading.Thread(target=produce, name="outside-calendar-prefetch", daemon=True).start()
+        try:
+            while (item := pages.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                yield from item.nodes
+        finally:
+            stop.set()
+
+    def _gql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        if (cached := self._cached(query, variables)) is not None:
+            return cached
+        try:
+            resp = self._client.post(self.endpoint, json={"query": query, "variables": variables})
+        except httpx.HTTPError as e:
+            self.logger.error("GraphQL transport error: %s", e)
+            raise
+        return self._store(query, variables, self._parse_response(resp))
+
+    def _default_categories_provider(self) -> Callable[[int], list[EventCategory]]:
+        return lambda event_id: self.get_event_categories(event_id)
+
+    def get_competitions(
+        self, entries: list[dict[str, Any]] | dict[str, list[dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        if isinstance(entries, dict):
+            out: list[dict[str, Any]] = []
+
+            def resolve_section(section: tuple[str, str, list[dict[str, Any]]]) -> list[dict[str, Any]]:
+                key, app_type, lst = section
+                try:
+                    sub = OutsideApiGraphQlClient(
+                        app_type=app_type,
+                        endpoint=self.endpoint,
+                        client=self._client,
+                        cache=self._cache,
+                    )
+                    return sub.get_competitions(lst)
+                except Exception as e:
+                    self.logger.error("Failed resolving competitions for '%s': %s", key, e)
+                    return []
+
+            if not (sections := self._competition_sections(entries)):
+                return out
+            with ThreadPoolExecutor(max_workers=len(sections)) as pool:
+                for competitions in pool.map(resolve_section, sections):
+                    out.extend(competitions)
+            return out
+
+        if not isinstance(entries, list) or not entries:
+            return []
+
+        return self._competitions_from_events(entries, self._fetch_entry_events(entries))
+
+    def _fetch_entry_events(self, entries: list[dict[str, Any]]) -> dict[int, Event | None]:
+        """Fetch the event of every entry, keyed by entry index.
+
+        ID entries share aliased `get_events` queries and URL entries are looked up in parallel,
+        so a whole calendar resolves in about one round trip. A failed batch falls back to
+        per-ID lookups so one bad ID does not drop its neighbours.
+        """
+        ids, urls = self._split_entries(entries)
+
+        def by_id(index: int) -> Event | None:
+            try:
+                return self.get_event(ids[index], precache=True)
+            except Exception as e:
+                self.logger.error("Failed to retrieve event (id=%s): %s", ids[index], e)
+                return None
+
+        def by_url(index: int) -> Event | None:
+            try:
+                return self.get_event_by_url(urls[index], precache=True)
+            except Exception as e:
+                self.logger.error("Failed to retrieve event (url=%s): %s", urls[index], e)
+                return None
+
+        def id_batch() -> dict[int, Event | None]:
+            if len(ids) == 1:
+                return {index: by_id(index) for index in ids}
+            try:
+                return dict(zip(ids, self.get_events(list(ids.values()), precache=True), strict=True))
+            except Exception as e:
+                self.logger.warning("Batched event lookup failed, retrying per event: %s", e)
+                with ThreadPoolExecutor(max_workers=self._MAX_CONCURRENT_REQUESTS) as pool:
+                    return dict(zip(ids, pool.map(by_id, ids), strict=True))
+
+        events: dict[int, Event | None] = {}
+        if not ids and not urls:
+            return events
+        with ThreadPoolExecutor(max_workers=self._MAX_CONCURRENT_REQUESTS) as pool:
+            batch = pool.submit(id_batch) if ids else None
+            events.update(zip(urls, pool.map(by_url, urls), strict=True))
+            if batch is not None:
+                events.update(batch.result())
+        return events
+
+
+class AsyncOutsideApiGraphQlClient(_OutsideApiGraphQlBase):
+    """`OutsideApiGraphQlClient` on `httpx.AsyncClient`, for use inside an event loop.
+
+    Requests share one pooled connection (multiplexed over HTTP/2 when `h2` is installed), and
+    at most `_MAX_CONCURRENT_REQUESTS` are in flight per client. Event categories cannot load
+    lazily without blocking the loop, so events carry only the categories fetched with
+    `precache=True`; otherwise use `await get_event_categories(event_id)`.
+    """
+
+    def __init__(
+        self,
+        app_type: str = "BIKEREG",
+        endpoint: str = "https://outsideapi.com/fed-gw/graphql",
+        client: httpx.AsyncClient | None = None,
+        timeout_s: float = 20.0,
+        headers: dict[str, str] | None = None,
+        cache: OutsideResponseCache | None = None,
+    ):
+        self.app_type = self._normalize_and_validate_app_type(app_type)
+        self._cache = cache
+        self.endpoint = endpoint
+        base_headers = headers or {"User-Agent": "garmin-ai-coach/1.0"}
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout_s, headers=base_headers, http2=HTTP2_AVAILABLE, limits=ASYNC_POOL_LIMITS
+        )
+        self._request_slots = asyncio.Semaphore(self._MAX_CONCURRENT_REQUESTS)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger.info("Initialized AsyncOutsideApiGraphQlClient for app_type=%s", self.app_type)
+
+    async def __aenter__(self) -> "AsyncOutsideApiGraphQlClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def get_event(self, event_id: int, precache: bool = False) -> Event | None:
+        data = await self._gql(self._event_query(precache), {"appType": self.app_type, "id": int(event_id)})
+        node = ((data or {}).get("athleticEvent")) if data else None
+        return self._map_event(node, precache_categories=precache)
+
+    async def get_event_categories(self, event_id: int) -> list[EventCategory]:
+        data = await self._gql(self._CATEGORIES_QUERY, {"appType": self.app_type, "id": int(event_id)}) or {}
+        return self._categories_from(data)
+
+    async def get_events(
+        self, event_ids: list[int], batch_size: int = 25, precache: bool = False
+    ) -> list[Event | None]:
+        async def fetch(chunk: list[int]) -> list[Event | None]:
+            query, variables = self._events_query(chunk, precache)
+            data = await self._gql(query, variables) or {}
+            return self._events_from_batch(data, chunk, precache)
+
+        batches = await asyncio.gather(*(fetch(chunk) for chunk in self._chunks(event_ids, batch_size)))
+        return [event for batch in batches for event in batch]
+
+    async def get_event_by_url(self, url: str, precache: bool = False) -> Event | None:
+        data = await self._gql(self._event_by_url_query(precache), {"url": url})
+        node = ((data or {}).get("athleticEventByURL")) if data else None
+        return self._map_event(node, precache_categories=precache) if node else None
+
+    async def search_calendar(
+        self,
+        params: dict[str, Any] | None = None,
+        first: int | None = None,
+        after: str | None = None,
+        last: int | None = None,
+        before: str | None = None,
+        precache: bool = False,
+    ) -> CalendarResult:
+        variables = {
+            "searchParameters": params or None,
+            "first": first,
+            "after": after,
+            "last": last,
+            "before": before,
+        }
+        data = await self._gql(self._calendar_query(precache), variables) or {}
+        return self._calendar_result(data, precache)
+
+    async def iter_calendar(
+        self,
+        params: dict[str, Any] | None = None,
+        page_size: int = 100,
+        prefetch: int = 1,
+        precache: bool = False,
+    ) -> AsyncIterator[CalendarNode]:
+        """Async counterpart of `OutsideApiGraphQlClient.iter_calendar`; a task does the prefetching."""
+
+        async def fetch(cursor: str | None) -> CalendarResult:
+            return await self.search_calendar(params, first=page_size, after=cursor, precache=precache)
+
+        if prefetch <= 0:
+            cursor = None
+            while True:
+                page = await fetch(cursor)
+                for node in page.nodes:
+                    yield node
+                if not self._has_next_page(page):
+                    return
+                cursor = page.page_info.end_cursor
+
+        pages: asyncio.Queue[CalendarResult | Exception | None] = asyncio.Queue(maxsize=prefetch)
+
+        async def produce() -> None:
+            cursor = None
+            try:
+                while True:
+                    page = await fetch(cursor)
+                    await pages.put(page)
+                    if not self._has_next_page(page):
+                        break
+                    cursor = page.page_info.end_cursor
+            except Exception as e:
+                await pages.put(e)
+            await pages.put(None)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while (item := await pages.get()) is not None:
+                if isinstance(item, Exception):
+                    raise item
+                for node in item.nodes:
+                    yield node
+        finally:
+            producer.cancel()
+
+    async def _gql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        if (cached := self._cached(query, variables)) is not None:
+            return cached
+        try:
+            async with self._request_slots:
+                resp = await self._client.post(self.endpoint, json={"query": query, "variables": variables})
+        except httpx.HTTPError as e:
+            self.logger.error("GraphQL transport error: %s", e)
+            raise
+        return self._store(query, variables, self._parse_response(resp))
+
+    async def get_competitions(
+        self, entries: list[dict[str, Any]] | dict[str, list[dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        if isinstance(entries, dict):
+
+            async def resolve_section(key: str, app_type: str, lst: list[dict[str, Any]]) -> list[dict[str, Any]]:
+                try:
+                    sub = AsyncOutsideApiGraphQlClient(
+                        app_type=app_type,
+                        endpoint=self.endpoint,
+                        client=self._client,
+                        cache=self._cache,
+                    )
+                    return await sub.get_competitions(lst)
+                except Exception as e:
+                    self.logger.error("Failed resolving competitions for '%s': %s", key, e)
+                    return []
+
+            sections = self._competition_sections(entries)
+            results = await asyncio.gather(*(resolve_section(*section) for section in sections))
+            return [competition for competitions in results for competition in competitions]
+
+        if not isinstance(entries, list) or not entries:
+            return []
+
+        return self._competitions_from_events(entries, await self._fetch_entry_events(entries))
+
+    async def _fetch_entry_events(self, entries: list[dict[str, Any]]) -> dict[int, Event | None]:
+        ids, urls = self._split_entries(entries)
+
+        async def by_id(index: int) -> Event | None:
+            try:
+                return await self.get_event(ids[index], precache=True)
+            except Exception as e:
+                self.logger.error("Failed to retrieve event (id=%s): %s", ids[index], e)
+                return None
+
+        async def by_url(index: int) -> Event | None:
+            try:
+                return await self.get_event_by_url(urls[index], precache=True)
+            except Exception as e:
+                self.logger.error("Failed to retrieve event (url=%s): %s", urls[index], e)
+                return None
+
+        async def id_batch() -> dict[int, Event | None]:
+            if len(ids) <= 1:
+                return {index: await by_id(index) for index in ids}
+            try:
+                return dict(zip(ids, await self.get_events(list(ids.values()), precache=True), strict=True))
+            except Exception as e:
+                self.logger.warning("Batched event lookup failed, retrying per event: %s", e)
+                return dict(zip(ids, await asyncio.gather(*(by_id(index) for index in ids)), strict=True))
+
+        batch, *by_urls = await asyncio.gather(id_batch(), *(by_url(index) for index in urls))
+        return {**batch, **dict(zip(urls, by_urls, strict=True))}
@@ -0,0 +1,173 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+OUTSIDE_CACHE_DB_NAME = "outside_cache.sqlite"
+
+HOUR = 3600.0
+# Seconds a response stays fresh, by the query's root field. Reference data barely changes;
+# race metadata changes over days; calendar searches also surface new events.
+QUERY_TTLS = {
+    "athleticEventTypes": 7 * 24 * HOUR,
+    "ARegSanctioningBodies": 7 * 24 * HOUR,
+    "athleticEvent": 6 * HOUR,
+    "athleticEventByURL": 6 * HOUR,
+    "athleticEventCalendar": 0.5 * HOUR,
+}
+DEFAULT_TTL = HOUR
+# Responses that contain an event with registration open can flip (sell out, close early) at any time.
+OPEN_REGISTRATION_TTL = 0.5 * HOUR
+
+_ROOT_FIELD = re.compile(r"\{\s*(?:\w+\s*:\s*)?(\w+)")
+
+
+def query_root_field(query: str) -> str:
+    match = _ROOT_FIELD.search(query)
+    return match.group(1) if match else ""
+
+
+def response_cache_key(app_type: str, query: str, variables: dict[str, Any]) -> str:
+    normalized = " ".join(query.split())
+    payload = json.dumps([app_type, normalized, variables], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _has_open_registration(data: Any) -> bool:
+    if isinstance(data, dict):
+        return data.get("isOpen") is True or any(_has_open_registration(v) for v in data.values())
+    if isinstance(data, list):
+        return any(_has_open_registration(v) for v in data)
+    return False
+
+
+class OutsideResponseCache:
+    """GraphQL `data` payloads keyed by (app_type, query, variables), with per-query-type TTLs.
+
+    Entries live in memory and, with `db_path`, in SQLite so they survive across runs. At most
+    `max_entries` are kept; the least recently used go first. Safe to share between threads.
+    """
+
+    def __init__(
+        self,
+        db_path: str | Path | None = None,
+        max_entries: int = 5000,
+        ttls: dict[str, float] | None = None,
+        open_registration_ttl: float = OPEN_REGISTRATION_TTL,
+    ):
+        self.db_path = Path(db_path) if db_path else None
+        self.max_entries = max_entries
+        self.ttls = {**QUERY_TTLS, **(ttls or {})}
+        self.open_registration_ttl = open_registration_ttl
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        if self.db_path:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._connect() as conn:
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS outside_responses (
+                        key TEXT PRIMARY KEY,
+                        data TEXT NOT NULL,
+                        expires_at REAL NOT NULL,
+                        last_used REAL NOT NULL
+                    )
+                    """
+                )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def ttl_for(self, query: str, data: dict[str, Any]) -> float:
+        ttl = self.ttls.get(query_root_field(query), DEFAULT_TTL)
+        if _has_open_registration(data):
+            ttl = min(ttl, self.open_registration_ttl)
+        return ttl
+
+    def get(self, app_type: str, query: str, variables: dict[str, Any]) -> dict[str, Any] | None:
+        key = response_cache_key(app_type, query, variables)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self.db_path:
+                with self._connect() as conn:
+                    row = conn.execute(
+                        "SELECT data, expires_at FROM outside_responses WHERE key = ?", (key,)
+                    ).fetchone()
+                if row is not None:
+                    entry = (json.loads(row[0]), row[1])
+
+            if entry is not None and entry[1] <= now:
+                self.expired += 1
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if self.db_path:
+                with self._connect() as conn:
+                    conn.execute("UPDATE outside_responses SET last_used = ? WHERE key = ?", (now, key))
+            return entry[0]
+
+    def put(self, app_type: str, query: str, variables: dict[str, Any], data: dict[str, Any]) -> None:
+        key = response_cache_key(app_type, query, variables)
+        now = time.time()
+        expires_at = now + self.ttl_for(query, data)
+        with self._lock:
+            self._entries[key] = (data, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                if not self.db_path:
+                    self.evictions += 1
+            if not self.db_path:
+                return
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO outside_responses VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(data), expires_at, now),
+                )
+                self.evictions += conn.execute(
+                    """
+                    DELETE FROM outside_responses WHERE key NOT IN (
+                        SELECT key FROM outside_responses ORDER BY last_used DESC LIMIT ?
+                    )
+                    """,
+                    (self.max_entries,),
+                ).rowcount
+
+    def _remove(self, key: str) -> None:
+        self._entries.pop(key, None)
+        if self.db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM outside_responses WHERE key = ?", (key,))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "entries": len(self._entries),
+        }
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.ai.ai_settings import AgentRole, ai_settings
+from services.ai.langgraph.workflows.planning_workflow import run_batch_analysis_and_planning
+from services.ai.model_config import ModelSelector
+from services.ai.runtime_registry import RuntimeRegistry
+from services.ai.utils.batch_execution import (
+    AnthropicBatchBackend,
+    BatchCoordinator,
+    BatchingTransport,
+    OpenAIBatchBackend,
+    batch_execution,
+)
+from services.ai.utils.llm_scheduler import llm_scheduler
+from services.ai.utils.local_batch_server import LocalBatchServer
+
+
+@pytest.fixture
+def registry():
+    fresh = RuntimeRegistry()
+    config = Mock(openai_api_key="sk-test", anthropic_api_key="sk-ant-test", openrouter_api_key="or-test")
+
+    with (
+        patch("services.ai.model_config.runtime_registry", fresh),
+        patch("services.ai.utils.batch_execution.runtime_registry", fresh),
+        patch("services.ai.model_config.get_config", return_value=config),
+        patch.dict(
+            ai_settings.model_assignments[ai_settings.mode],
+            {AgentRole.SUMMARIZER: "gpt-4o", AgentRole.METRICS_EXPERT: "claude-3-haiku"},
+        ),
+    ):
+        yield fresh
+
+    fresh.clear()
+
+
+def _coordinator(server: LocalBatchServer) -> BatchCoordinator:
+    return BatchCoordinator(
+        {
+            "openai": OpenAIBatchBackend(server.openai_client(), poll_interval=0.01),
+            "anthropic": AnthropicBatchBackend(server.anthropic_client(), poll_interval=0.01),
+        },
+        collect_window_seconds=0.05,
+    )
+
+
+async def _athlete(name: str) -> str:
+    summary = await ModelSelector.get_llm(AgentRole.SUMMARIZER).ainvoke(f"summarize {name}")
+    expert = await ModelSelector.get_llm(AgentRole.METRICS_EXPERT).ainvoke(f"analyse {summary.content}")
+    return expert.content
+
+
+@pytest.mark.asyncio
+async def test_each_stage_becomes_one_provider_batch(registry):
+    server = LocalBatchServer(polls_until_complete=2)
+    coordinator = _coordinator(server)
+
+    async with batch_execution(coordinator):
+        assert not llm_scheduler.enabled
+        results = await asyncio.gather(*(_athlete(name) for name in ("Ana", "Ben", "Cy")))
+
+    assert results[1] == "Batch reply to: analyse Batch reply to: summarize Ben"
+    assert [(batch["endpoint"], batch["requests"]) for batch in server.submitted] == [
+        ("/v1/chat/completions", 3),
+        ("/v1/messages", 3),
+    ]
+    assert coordinator.get_stats()["batched_requests"] == 6
+    assert llm_scheduler.enabled
+    assert registry.batch_coordinator is None
+
+
+def test_only_providers_with_a_batch_backend_are_rerouted():
+    registry = RuntimeRegistry()
+    registry.set_batch_coordinator(BatchCoordinator({"openai": Mock()}))
+
+    openai_client = registry.get_async_http_client("https://api.openai.com/v1")
+    openrouter_client = registry.get_async_http_client("https://openrouter.ai/api/v1")
+
+    assert isinstance(openai_client._transport, BatchingTransport)
+    assert not isinstance(openrouter_client._transport, BatchingTransport)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_must_be_non_interactive():
+    coordinator = BatchCoordinator({})
+
+    with pytest.raises(ValueError, match="hitl_enabled"):
+        await run_batch_analysis_and_planning([{"user_id": "a", "hitl_enabled": True}], coordinator)
+    with pytest.raises(ValueError, match="distinct user_id"):
+        await run_batch_analysis_and_planning(
+            [{"user_id": "a", "hitl_enabled": False}, {"user_id": "a", "hitl_enabled": False}], coordinator
+        )
@@ -0,0 +1,82 @@
+from datetime import date
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.ai.langgraph.nodes.metrics_summarizer_node import metrics_summarizer_node
+from services.ai.langgraph.nodes.node_base import create_plot_entries
+from services.ai.langgraph.nodes.plot_resolution_node import plot_resolution_node
+from services.ai.langgraph.state.training_analysis_state import create_initial_state
+from services.ai.langgraph.utils.blob_store import (
+    BLOB_STORE_KEY,
+    BlobStore,
+    FileBlobStore,
+    is_blob_ref,
+    offload_garmin_data,
+)
+from services.ai.tools.plotting import PlotStorage
+
+GARMIN_DATA = {
+    "training_load_history": [{"date": f"2024-01-{day:02d}", "load": 100 + day} for day in range(1, 29)],
+    "vo2_max_history": {"running": 55},
+    "training_status": {"status": "productive"},
+}
+
+
+def test_file_store_round_trips_and_deduplicates(tmp_path):
+    store = FileBlobStore(tmp_path / "blobs")
+
+    sleep = [{"date": date(2024, 1, 1), "hours": 7.5}]
+    ref = store.put(sleep)
+
+    assert store.put(sleep) == ref
+    assert len(list((tmp_path / "blobs").iterdir())) == 1
+    assert FileBlobStore(tmp_path / "blobs").get(ref) == sleep
+    with pytest.raises(KeyError):
+        BlobStore().get(ref)
+
+    store.clear()
+    assert not (tmp_path / "blobs").exists()
+    with pytest.raises(KeyError):
+        store.get(ref)
+
+
+@pytest.mark.asyncio
+async def test_summarizer_dereferences_offloaded_slices():
+    store = BlobStore()
+    state = create_initial_state(
+        user_id="test",
+        athlete_name="Test",
+        garmin_data=offload_garmin_data(GARMIN_DATA, store),
+        execution_id="exec",
+    )
+    assert all(is_blob_ref(value) for value in state["garmin_data"].values())
+
+    llm = Mock(ainvoke=AsyncMock(return_value=Mock(content="summary")))
+    with patch("services.ai.model_config.ModelSelector.get_llm", return_value=llm):
+        result = await metrics_summarizer_node(state, {"configurable": {BLOB_STORE_KEY: store}})
+
+    assert result["metrics_summary"] == "summary"
+    prompt = llm.ainvoke.call_args.args[0][1]["content"]
+    assert '"load": 128' in prompt
+
+
+@pytest.mark.asyncio
+async def test_plot_html_travels_as_handle_until_resolution():
+    store = BlobStore()
+    plot_storage = PlotStorage("exec")
+    plot_id = plot_storage.store_plot("<div>" + "x" * 50_000 + "</div>", "Load", "metrics")
+
+    _, plot_storage_data, _ = create_plot_entries("metrics", plot_storage, store)
+    assert is_blob_ref(plot_storage_data[plot_id]["html_content"])
+
+    state = {
+        "plotting_enabled": True,
+        "execution_id": "exec",
+        "analysis_html": f"<p>[PLOT:{plot_id}]</p>",
+        "plot_storage_data": plot_storage_data,
+    }
+    result = await plot_resolution_node(state, {"configurable": {BLOB_STORE_KEY: store}})
+
+    assert "x" * 50_000 in result["analysis_html"]
+    assert result["plot_resolution_stats"]["resolved_count"] == 1
@@ -0,0 +1,138 @@
+import time
+from datetime import date, datetime, timedelta
+from typing import Any
+
+import pytest
+
+from services.outside.calendar_mirror import CalendarMirror, bounding_box, haversine_km
+from services.outside.models import CalendarNode, Event
+
+DENVER = (39.7392, -104.9903)
+BOULDER = (40.0150, -105.2705)  # ~40 km from Denver
+PUEBLO = (38.2544, -104.6091)  # ~170 km from Denver
+
+
+def _node(event_id: int, position: tuple[float, float], days_ahead: int, app_type: str = "TRIREG",
+          event_types: list[str] | None = None, city: str | None = "Denver") -> CalendarNode:
+    start = datetime.combine(date.today() + timedelta(days=days_ahead), datetime.min.time())
+    event = Event(
+        event_id=event_id, name=f"Race {event_id}", event_url=None, static_url=None, vanity_url=None,
+        app_type=app_type, city=city, state="CO", zip=None, date=start, event_end_date=start,
+        open_reg_date=None, close_reg_date=None, is_open=False, is_highlighted=False,
+        latitude=position[0], longitude=position[1], event_types=event_types or ["Triathlon"],
+    )
+    return CalendarNode(
+        id=f"{app_type}-{event_id}", event_id=event_id, app_type=app_type, start_date=start, end_date=start,
+        open_reg_date=None, close_reg_date=None, name=f"Race {event_id}", city=city, state="CO",
+        latitude=position[0], longitude=position[1], search_entry_type=None, is_membership=None,
+        promotion_level=None, event=event,
+    )
+
+
+class FakeCalendarClient:
+    def __init__(self, regions: dict[str, list[CalendarNode]]):
+        self.regions = regions
+        self.calls: list[dict[str, Any]] = []
+
+    def iter_calendar(self, params=None, page_size=100, prefetch=1):
+        self.calls.append(params)
+        yield from self.regions[params["region"]]
+
+
+@pytest.mark.unit
+def test_bounding_box_contains_radius():
+    min_lat, max_lat, min_lon, max_lon = bounding_box(*DENVER, 50)
+    assert min_lat < BOULDER[0] < max_lat and min_lon < BOULDER[1] < max_lon
+    assert 35 < haversine_km(*DENVER, *BOULDER) < 45
+    assert bounding_box(90.0, 0.0, 10)[2:] == (-180.0, 180.0)
+
+
+@pytest.mark.unit
+def test_sync_and_find_candidates_by_radius_and_dates(tmp_path):
+    mirror = CalendarMirror(tmp_path / "mirror.sqlite")
+    client = FakeCalendarClient({
+        "colorado": [
+            _node(1, DENVER, 30),
+            _node(2, BOULDER, 10, app_type="RUNREG", event_types=["Running"]),
+            _node(3, PUEBLO, 20),
+            _node(4, DENVER, 400),
+        ],
+    })
+
+    assert mirror.sync(client, {"colorado": {"region": "colorado"}}) == {"colorado": 4}
+
+    today = date.today()
+    races = mirror.find_candidates(*DENVER, radius_km=100, start=today, end=today + timedelta(days=180))
+    assert [race.event_id for race in races] == [2, 1]
+    assert races[1].distance_km == 0.0 and races[0].event_types == ["Running"]
+
+    assert [r.event_id for r in mirror.find_candidates(
+        *DENVER, radius_km=250, start=today, end=today + timedelta(days=180), app_types=["trireg"]
+    )] == [3, 1]
+    assert [r.event_id for r in mirror.find_candidates(
+        *DENVER, radius_km=100, start=today, end=today + timedelta(days=180), event_types=["triathlon"], limit=1
+    )] == [1]
+
+    competitions = mirror.find_competitions(
+        priority="b", latitude=DENVER[0], longitude=DENVER[1], radius_km=10,
+        start=today, end=today + timedelta(days=60),
+    )
+    assert competitions == [{
+        "name": "Race 1", "date": (today + timedelta(days=30)).isoformat(), "race_type": "Triathlon",
+        "priority": "B", "target_time": "", "location": "Denver, CO",
+    }]
+
+
+@pytest.mark.unit
+def test_sync_skips_fresh_regions_and_prunes_removed_events(tmp_path):
+    path = tmp_path / "mirror.sqlite"
+    client = FakeCalendarClient({"front_range": [_node(1, DENVER, 5), _node(2, BOULDER, 6)]})
+    regions = {"front_range": {"region": "front_range"}}
+    CalendarMirror(path).sync(client, regions, app_types=["TRIREG"])
+
+    # A second run within max_age_hours answers from the mirror without searching again.
+    assert CalendarMirror(path).sync(client, regions) == {"front_range": None}
+    assert len(client.calls) == 1
+
+    client.regions["front_range"] = [_node(2, BOULDER, 6)]
+    mirror = CalendarMirror(path)
+    assert mirror.sync(client, regions, max_age_hours=0) == {"front_range": 1}
+    races = mirror.find_candidates(*DENVER, radius_km=100, start=date.today(), end=date.today() + timedelta(days=30))
+    assert [race.event_id for race in races] == [2]
+
+
+@pytest.mark.unit
+def test_find_candidates_stays_fast_on_a_large_mirror(tmp_path):
+    mirror = CalendarMirror(tmp_path / "mirror.sqlite")
+    nodes = [
+        _node(i, (25 + (i % 97) * 0.25, -125 + (i // 97) * 0.6), i % 365)
+        for i in range(5000)
+    ]
+    mirror.sync(FakeCalendarClient({"us": nodes}), {"us": {"region": "us"}})
+
+    started = time.perf_counter()
+    races = mirror.find_candidates(*DENVER, radius_km=100, start=date.today(), end=date.today() + timedelta(days=180))
+    elapsed = time.perf_counter() - started
+
+    horizon = date.today() + timedelta(days=180)
+    expected = sorted(
+        (n.start_date.date().isoformat(), n.event_id) for n in nodes
+        if haversine_km(*DENVER, n.latitude, n.longitude) <= 100 and n.start_date.date() <= horizon
+    )
+    assert races and sorted((race.start_date, race.event_id) for race in races) == expected
+    assert elapsed < 0.1
+
+
+@pytest.mark.unit
+def test_cli_race_search_reads_the_mirror(tmp_path):
+    from cli.garmin_ai_coach_cli import find_nearby_competitions_from_config
+
+    path = tmp_path / "calendar_mirror.sqlite"
+    CalendarMirror(path).sync(
+        FakeCalendarClient({"co": [_node(1, DENVER, 30), _node(2, PUEBLO, 20)]}), {"co": {"region": "co"}}
+    )
+    config = {"race_search": {"latitude": DENVER[0], "longitude": DENVER[1], "radius_km": 50, "priority": "B"}}
+
+    assert [(c["name"], c["priority"]) for c in find_nearby_competitions_from_config(config, path)] == [("Race 1", "B")]
+    assert find_nearby_competitions_from_config({}, path) == []
+    assert find_nearby_competitions_from_config({"race_search": {"radius_km": 50}}, path) == []
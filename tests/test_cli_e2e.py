@@ -1,4 +1,6 @@
+import asyncio
 import json
+import threading
 from unittest.mock import AsyncMock, patch
 
 import pytest
@@ -169,4 +171,158 @@ credentials:
     summary = json.loads(summary_path.read_text(encoding="utf-8"))
     assert summary["athlete"] == "Test Athlete HITL"
     assert "total_cost_usd" in summary
-    assert "total_tokens" in summary
\ No newline at end of file
+    assert "total_tokens" in summary
+
+@pytest.mark.asyncio
+@patch("services.ai.langgraph.workflows.planning_workflow.run_complete_analysis_and_planning", new_callable=AsyncMock)
+@patch("services.garmin.TriathlonCoachDataExtractor")
+async def test_cli_resolves_outside_competitions_during_garmin_extraction(
+    mock_extractor_class,
+    mock_workflow,
+    tmp_path,
+):
+    lookup_started = threading.Event()
+
+    async def fake_get_competitions(self, entries):
+        lookup_started.set()
+        return [{"name": "Outside Race", "date": "2026-09-01", "race_type": "Olympic", "priority": "A"}]
+
+    def extract_data(config):
+        # Only returns if the Outside lookup runs while Garmin extraction is still in progress.
+        assert lookup_started.wait(timeout=5)
+        return GarminData()
+
+    mock_extractor_class.return_value.extract_data.side_effect = extract_data
+    mock_workflow.return_value = {"execution_id": "test-exec", "execution_metadata": {}}
+
+    from cli.garmin_ai_coach_cli import run_analysis_from_config
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"""
+athlete: {{name: "Test A", email: "user@example.com"}}
+extraction: {{hitl_enabled: false}}
+outside:
+  trireg: [{{id: 1}}]
+output: {{directory: "{(tmp_path / 'out').as_posix()}"}}
+credentials: {{password: "dummy"}}
+""",
+        encoding="utf-8",
+    )
+
+    with patch("services.outside.client.AsyncOutsideApiGraphQlClient.get_competitions", fake_get_competitions):
+        await run_analysis_from_config(config_path)
+
+    competitions = mock_workflow.call_args.kwargs["competitions"]
+    assert [c["name"] for c in competitions] == ["Outside Race"]
+
+
+@pytest.mark.asyncio
+@patch("services.garmin.TriathlonCoachDataExtractor")
+async def test_failed_extraction_cancels_and_awaits_the_outside_lookup(mock_extractor_class, tmp_path):
+    lookup_started = threading.Event()
+    lookup_cancelled = []
+
+    async def fake_get_competitions(self, entries):
+        lookup_started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            lookup_cancelled.append(True)
+            raise
+
+    def read_password(prompt):
+        # The prompt blocks the event loop, so the lookup only starts once it has been answered.
+        assert not lookup_started.is_set()
+        return "secret"
+
+    def extract_data(config):
+        assert lookup_started.wait(timeout=5)
+        raise RuntimeError("Garmin login failed")
+
+    mock_extractor_class.return_value.extract_data.side_effect = extract_data
+
+    from cli.garmin_ai_coach_cli import prepare_run
+
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        f"""
+athlete: {{name: "Test A", email: "user@example.com"}}
+extraction: {{hitl_enabled: false}}
+outside:
+  trireg: [{{id: 1}}]
+output: {{directory: "{(tmp_path / 'out').as_posix()}"}}
+""",
+        encoding="utf-8",
+    )
+
+    with (
+        patch("services.outside.client.AsyncOutsideApiGraphQlClient.get_competitions", fake_get_competitions),
+        patch("getpass.getpass", side_effect=read_password),
+        pytest.raises(RuntimeError, match="Garmin login failed"),
+    ):
+        await prepare_run(config_path)
+
+    assert lookup_cancelled == [True]
+    assert mock_extractor_class.call_args.args == ("user@example.com", "secret")
+
+
+def _write_batch_config(tmp_path, name: str, user_id: str, output_name: str | None = None):
+    config_path = tmp_path / f"{name}.yaml"
+    config_path.write_text(
+        f"""
+athlete: {{name: "{name}", email: "{name}@example.com", user_id: "{user_id}"}}
+extraction: {{hitl_enabled: false}}
+output: {{directory: "{(tmp_path / (output_name or name)).as_posix()}"}}
+credentials: {{password: "dummy"}}
+""",
+        encoding="utf-8",
+    )
+    return config_path
+
+
+@pytest.mark.asyncio
+@patch("services.ai.utils.batch_execution.create_batch_coordinator")
+@patch("services.ai.langgraph.workflows.planning_workflow.run_batch_analysis_and_planning", new_callable=AsyncMock)
+@patch("services.garmin.TriathlonCoachDataExtractor")
+async def test_batch_prepares_athletes_concurrently_with_their_user_ids(
+    mock_extractor_class, mock_batch, mock_coordinator, tmp_path
+):
+    both_extracting = threading.Barrier(2, timeout=5)
+
+    def extract_data(config):
+        # Only returns once both athletes' extractions are in progress at the same time.
+        both_extracting.wait()
+        return GarminData()
+
+    mock_extractor_class.return_value.extract_data.side_effect = extract_data
+    mock_coordinator.return_value.backends = {}
+    mock_batch.side_effect = lambda jobs, coordinator: [
+        {"execution_id": job["user_id"], "execution_metadata": {}} for job in jobs
+    ]
+
+    from cli.garmin_ai_coach_cli import run_batch_from_configs
+    from services.ai.utils.llm_scheduler import llm_scheduler
+
+    configs = [_write_batch_config(tmp_path, "ana", "ana"), _write_batch_config(tmp_path, "ben", "ben")]
+    with patch.object(llm_scheduler, "configure", wraps=llm_scheduler.configure) as configure:
+        await run_batch_from_configs(configs)
+
+    assert configure.call_count == 1
+    assert [job["user_id"] for job in mock_batch.call_args.args[0]] == ["ana", "ben"]
+
+    duplicate = [_write_batch_config(tmp_path, "cy", "ana"), _write_batch_config(tmp_path, "di", "ana")]
+    with pytest.raises(ValueError, match="distinct 'athlete.user_id'"):
+        await run_batch_from_configs(duplicate)
+    assert mock_extractor_class.call_count == 2
+
+
+@pytest.mark.asyncio
+@patch("services.garmin.TriathlonCoachDataExtractor")
+async def test_batch_rejects_configs_sharing_an_output_directory(mock_extractor_class, tmp_path):
+    from cli.garmin_ai_coach_cli import run_batch_from_configs
+
+    shared = [_write_batch_config(tmp_path, "ana", "ana"), _write_batch_config(tmp_path, "ben", "ben", "ana")]
+    with pytest.raises(ValueError, match="distinct 'output.directory'"):
+        await run_batch_from_configs(shared)
+    mock_extractor_class.assert_not_called()
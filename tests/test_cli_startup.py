@@ -0,0 +1,85 @@
+import json
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Seconds from running the CLI module to the point of interest, excluding interpreter start.
+HELP_BUDGET_SECONDS = 0.3
+FIRST_GARMIN_REQUEST_BUDGET_SECONDS = 0.6
+HEAVY_MODULES = ["langgraph", "langchain_core", "langchain_openai", "langchain_anthropic", "anthropic", "openai",
+                 "langsmith", "plotly", "pandas"]
+
+PROBE = textwrap.dedent("""
+    import json, runpy, sys, time
+
+    argv, patch_garmin = json.loads(sys.argv[1]), sys.argv[2] == "garmin"
+    heavy = json.loads(sys.argv[3])
+    loaded = lambda: sorted(name for name in heavy if name in sys.modules)
+
+    if patch_garmin:
+        import services.garmin
+
+        class FirstRequest(Exception):
+            pass
+
+        class Extractor:
+            def __init__(self, *args, **kwargs):
+                pass
+
+            def extract_data(self, config):
+                print("PROBE", json.dumps({"seconds": time.perf_counter() - started}), flush=True)
+                raise FirstRequest
+
+        services.garmin.TriathlonCoachDataExtractor = Extractor
+
+    sys.argv = ["garmin_ai_coach_cli.py", *argv]
+    started = time.perf_counter()
+    try:
+        runpy.run_path("cli/garmin_ai_coach_cli.py", run_name="__main__")
+    except SystemExit:
+        pass
+    if not patch_garmin:
+        print("PROBE", json.dumps({"seconds": time.perf_counter() - started, "loaded": loaded()}), flush=True)
+""")
+
+
+def run_probe(argv: list[str], patch_garmin: bool = False) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(argv), "garmin" if patch_garmin else "-", json.dumps(HEAVY_MODULES)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=120,
+        check=False,
+    )
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("PROBE ")]
+    assert lines, f"probe produced no result (exit {completed.returncode}):\n{completed.stderr}"
+    return json.loads(lines[0].removeprefix("PROBE "))
+
+
+def test_help_and_init_config_skip_the_ai_stack(tmp_path):
+    for argv in (["--help"], ["--init-config", str(tmp_path / "config.yaml")]):
+        probe = run_probe(argv)
+        assert probe["loaded"] == [], argv
+        assert probe["seconds"] < HELP_BUDGET_SECONDS, argv
+    assert (tmp_path / "config.yaml").exists()
+
+
+def test_first_garmin_request_does_not_wait_for_the_workflow_import(tmp_path):
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text(
+        textwrap.dedent(f"""
+            athlete: {{name: Test, email: user@example.com}}
+            extraction: {{hitl_enabled: false}}
+            output: {{directory: "{(tmp_path / 'out').as_posix()}"}}
+            credentials: {{password: dummy}}
+        """),
+        encoding="utf-8",
+    )
+
+    probe = run_probe(["--config", str(config_path)], patch_garmin=True)
+
+    assert probe["seconds"] < FIRST_GARMIN_REQUEST_BUDGET_SECONDS
@@ -1,7 +1,11 @@
+import asyncio
+import re
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from services.ai.langgraph.nodes.activity_summarizer_node import ACTIVITY_CHUNK_CONCURRENCY, activity_summarizer_node
+from services.ai.langgraph.nodes.data_summarizer_node import chunk_by_token_budget, estimate_json_tokens
 from services.ai.langgraph.nodes.metrics_summarizer_node import metrics_summarizer_node
 from services.ai.langgraph.nodes.physiology_summarizer_node import physiology_summarizer_node
 from services.ai.langgraph.state.training_analysis_state import create_initial_state
@@ -119,4 +123,53 @@ async def test_physiology_summarizer_with_empty_data():
         result = await physiology_summarizer_node(state)
         
         assert "physiology_summary" in result or "errors" in result
-    
\ No newline at end of file
+    
+
+def test_chunk_by_token_budget_balances_chunks():
+    items = [{"payload": "x" * 400} for _ in range(10)]
+
+    chunks = chunk_by_token_budget(items, max_chunk_tokens=350)
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 3, 1]
+    assert [item for chunk in chunks for item in chunk] == items
+    assert all(sum(estimate_json_tokens(item) for item in chunk) <= 350 for chunk in chunks)
+    assert chunk_by_token_budget(items[:2], max_chunk_tokens=10_000) == [items[:2]]
+
+
+@pytest.mark.asyncio
+async def test_activity_summarizer_map_reduce_keeps_newest_first_order():
+    activities = [
+        {"start_time": f"2024-01-{day:02d}T07:00:00", "laps": [{"note": "x" * 2000}] * 10}
+        for day in range(1, 13)
+    ]
+    state = create_initial_state(
+        user_id="test_user",
+        athlete_name="Test Athlete",
+        garmin_data={"recent_activities": activities},
+        execution_id="test_exec_123",
+    )
+    active = 0
+    peak = 0
+
+    async def summarize(messages):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        days = sorted(re.findall(r'"start_time": "(\d{4}-\d{2}-\d{2})', messages[1]["content"]))
+        # Older chunks finish first so completion order differs from output order.
+        await asyncio.sleep(0.01 * int(days[-1][-2:]))
+        active -= 1
+        return Mock(content=" ".join(reversed(days)))
+
+    mock_llm = Mock()
+    mock_llm.ainvoke = AsyncMock(side_effect=summarize)
+
+    with patch("services.ai.model_config.ModelSelector.get_llm", return_value=mock_llm):
+        result = await activity_summarizer_node(state)
+
+    assert mock_llm.ainvoke.await_count > ACTIVITY_CHUNK_CONCURRENCY
+    assert peak <= ACTIVITY_CHUNK_CONCURRENCY
+    assert result["activity_summary"].replace("\n\n", " ").split() == [
+        f"2024-01-{day:02d}" for day in range(12, 0, -1)
+    ]
+    assert len(result["costs"]) == 1
@@ -0,0 +1,79 @@
+import asyncio
+import json
+import operator
+from typing import Annotated, TypedDict
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from services.ai.utils.execution_timeline import (
+    ExecutionTimeline,
+    activate_timeline,
+    graph_edges,
+    record_span,
+    timeline_span,
+)
+
+
+class State(TypedDict, total=False):
+    visited: Annotated[list[str], operator.add]
+
+
+def build_app():
+    llm = GenericFakeChatModel(messages=iter([
+        AIMessage(content="ok", usage_metadata={"input_tokens": 10, "output_tokens": 40, "total_tokens": 50})
+    ]))
+
+    def sleeper(name: str, seconds: float, call_llm: bool = False):
+        async def node(state: State) -> State:
+            with timeline_span("plot_subprocess", "plot"):
+                await asyncio.sleep(seconds)
+            record_span("llm_queue", "queue", 0.01)
+            if call_llm:
+                await llm.ainvoke("hello")
+            return {"visited": [name]}
+
+        return node
+
+    graph = StateGraph(State)
+    graph.add_node("summarizer", sleeper("summarizer", 0.02))
+    graph.add_node("fast_expert", sleeper("fast_expert", 0.02, call_llm=True))
+    graph.add_node("slow_expert", sleeper("slow_expert", 0.15))
+    graph.add_node("synthesis", sleeper("synthesis", 0.02))
+    graph.add_edge(START, "summarizer")
+    graph.add_edge("summarizer", "fast_expert")
+    graph.add_edge("summarizer", "slow_expert")
+    graph.add_edge(["fast_expert", "slow_expert"], "synthesis")
+    graph.add_edge("synthesis", END)
+    return graph.compile()
+
+
+@pytest.mark.asyncio
+async def test_critical_path_follows_the_slow_branch(tmp_path):
+    app = build_app()
+    timeline = ExecutionTimeline("exec")
+
+    with activate_timeline(timeline):
+        await app.ainvoke({}, config={"callbacks": [timeline.callback_handler()]})
+
+    critical = timeline.critical_path(graph_edges(app))
+
+    assert critical["path"] == ["summarizer", "slow_expert", "synthesis"]
+    assert critical["nodes"]["fast_expert"]["slack_seconds"] >= 0.08
+    assert critical["nodes"]["slow_expert"]["slack_seconds"] < 0.01
+
+    trace = json.loads(timeline.write_chrome_trace(tmp_path / "timeline.json").read_text())
+    tracks = {e["args"]["name"]: e["tid"] for e in trace["traceEvents"] if e["ph"] == "M"}
+    spans = [(e["name"], e["tid"]) for e in trace["traceEvents"] if e["ph"] == "X"]
+    assert ("plot_subprocess", tracks["slow_expert"]) in spans
+    assert sum(name == "llm_queue" for name, _ in spans) == 4
+    llm_span = next(e for e in trace["traceEvents"] if e.get("cat") == "llm")
+    assert llm_span["tid"] == tracks["fast_expert"] and llm_span["args"]["output_tokens"] == 40
+
+
+def test_spans_are_ignored_without_an_active_timeline():
+    with timeline_span("hitl_wait", "hitl") as span:
+        record_span("llm_queue", "queue", 1.0)
+    assert span is None
@@ -0,0 +1,105 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.ai.langgraph.nodes.formatter_node import formatter_node
+from services.ai.langgraph.nodes.plan_formatter_node import plan_formatter_node
+from services.ai.langgraph.state.training_analysis_state import create_initial_state
+from services.ai.langgraph.utils.html_stream_writer import (
+    PROGRESS_CALLBACK_KEY,
+    StreamingHtmlWriter,
+    extract_chunk_text,
+)
+
+
+def _streaming_llm(chunks: list):
+    async def astream(_messages):
+        for chunk in chunks:
+            yield Mock(content=chunk)
+
+    llm = Mock()
+    llm.astream = astream
+    return llm
+
+
+class TestStreamingHtmlWriter:
+
+    def test_writes_partial_then_renames(self, tmp_path):
+        target = tmp_path / "analysis.html"
+        progress = []
+
+        with StreamingHtmlWriter(target, "analysis_html", lambda label, n: progress.append((label, n))) as writer:
+            writer.write("<html>")
+            assert (tmp_path / "analysis.partial.html").read_text(encoding="utf-8") == "<html>"
+            assert not target.exists()
+            writer.write("</html>")
+
+        assert target.read_text(encoding="utf-8") == "<html></html>"
+        assert not (tmp_path / "analysis.partial.html").exists()
+        assert progress == [("analysis_html", 6), ("analysis_html", 13)]
+
+    def test_failure_discards_partial_file(self, tmp_path):
+        target = tmp_path / "planning.html"
+
+        with pytest.raises(RuntimeError), StreamingHtmlWriter(target, "planning_html") as writer:
+            writer.write("<html>")
+            raise RuntimeError("stream interrupted")
+
+        assert not target.exists()
+        assert not (tmp_path / "planning.partial.html").exists()
+
+    def test_extract_chunk_text_skips_reasoning_blocks(self):
+        chunk = Mock(content=[
+            {"type": "reasoning", "summary": []},
+            {"type": "text", "text": "<h1>", "index": 0},
+            {"type": "text", "text": "Report</h1>", "index": 0},
+        ])
+        assert extract_chunk_text(chunk) == "<h1>Report</h1>"
+        assert extract_chunk_text(Mock(content=[])) == ""
+
+
+@pytest.mark.asyncio
+async def test_formatter_node_streams_to_output_dir(tmp_path):
+    state = create_initial_state(
+        user_id="test_user",
+        athlete_name="Test Athlete",
+        garmin_data={},
+        execution_id="test_stream",
+        html_stream_dir=str(tmp_path),
+    )
+    state["synthesis_result"] = "# Report"
+    progress = []
+
+    with patch(
+        "services.ai.model_config.ModelSelector.get_llm",
+        return_value=_streaming_llm(["<html>", "<body>Report</body>", "</html>"]),
+    ):
+        result = await formatter_node(
+            state, {"configurable": {PROGRESS_CALLBACK_KEY: lambda label, n: progress.append(n)}}
+        )
+
+    assert result["analysis_html"] == "<html><body>Report</body></html>"
+    assert (tmp_path / "analysis.html").read_text(encoding="utf-8") == result["analysis_html"]
+    assert progress[-1] == len(result["analysis_html"])
+
+
+@pytest.mark.asyncio
+async def test_plan_formatter_node_streams_to_output_dir(tmp_path):
+    state = create_initial_state(
+        user_id="test_user",
+        athlete_name="Test Athlete",
+        garmin_data={},
+        execution_id="test_stream",
+        html_stream_dir=str(tmp_path),
+    )
+    state["season_plan"] = {"output": "Season"}
+    state["weekly_plan"] = {"output": "Weekly"}
+
+    with patch(
+        "services.ai.model_config.ModelSelector.get_llm",
+        return_value=_streaming_llm(["<html>", "Plan", "</html>"]),
+    ):
+        result = await plan_formatter_node(state)
+
+    assert result["planning_html"] == "<html>Plan</html>"
+    assert (tmp_path / "planning.html").read_text(encoding="utf-8") == "<html>Plan</html>"
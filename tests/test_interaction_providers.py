@@ -0,0 +1,105 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from services.ai.langgraph.nodes.orchestrator_node import master_orchestrator_node
+from services.ai.langgraph.utils.interaction_providers import (
+    INTERACTION_PROVIDER_KEY,
+    NO_ANSWER,
+    FileInteractionProvider,
+    QueueInteractionProvider,
+    create_interaction_provider,
+)
+
+QUESTIONS = [
+    {"agent": "metrics_expert", "question": {"message": "How did the race go?"}},
+    {"agent": "activity_expert", "question": {"message": "Was Tuesday's run an interval session?", "context": "HR"}},
+]
+
+ANALYSIS_STATE = {
+    "metrics_outputs": {"output": [{"message": "Any injuries?"}]},
+    "hitl_enabled": True,
+}
+
+
+async def _ticks_while(coro) -> tuple[object, int]:
+    ticks = 0
+    task = asyncio.ensure_future(coro)
+    while not task.done():
+        ticks += 1
+        await asyncio.sleep(0.01)
+    return task.result(), ticks
+
+
+class TestInteractionProviders:
+
+    @pytest.mark.asyncio
+    async def test_queue_provider_times_out_with_no_answer(self):
+        answers = asyncio.Queue()
+        answers.put_nowait("Felt strong")
+        provider = QueueInteractionProvider(answers, timeout_seconds=0.05)
+
+        result = await provider.collect_answers(QUESTIONS, "Analysis")
+
+        assert [entry["answer"] for entry in result] == ["Felt strong", NO_ANSWER]
+        assert result[1]["question"] == "Was Tuesday's run an interval session?"
+
+    @pytest.mark.asyncio
+    async def test_file_provider_round_trip(self, tmp_path):
+        provider = FileInteractionProvider(tmp_path, poll_interval=0.01)
+        questions_path, answers_path = provider.paths_for("Season Planning")
+
+        async def answer_later():
+            while not questions_path.exists():
+                await asyncio.sleep(0.01)
+            assert [q["index"] for q in json.loads(questions_path.read_text())] == [1, 2]
+            answers_path.write_text(json.dumps(["Great", {"answer": "Yes, 6x800m"}]))
+
+        result, _ = await asyncio.gather(provider.collect_answers(QUESTIONS, "Season Planning"), answer_later())
+
+        assert [entry["answer"] for entry in result] == ["Great", "Yes, 6x800m"]
+        assert not answers_path.exists() and not questions_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_file_provider_timeout(self, tmp_path):
+        provider = FileInteractionProvider(tmp_path, timeout_seconds=0.05, poll_interval=0.01)
+
+        result = await provider.collect_answers(QUESTIONS, "Analysis")
+
+        assert [entry["answer"] for entry in result] == [NO_ANSWER, NO_ANSWER]
+
+    def test_create_interaction_provider_validates_kind(self, tmp_path):
+        assert isinstance(create_interaction_provider("file", 5, tmp_path), FileInteractionProvider)
+        with pytest.raises(ValueError, match="Unknown HITL provider"):
+            create_interaction_provider("socket")
+
+
+class TestOrchestratorDoesNotBlock:
+
+    @pytest.mark.asyncio
+    async def test_async_provider_from_config_keeps_loop_running(self):
+        answers = asyncio.Queue()
+        config = {"configurable": {INTERACTION_PROVIDER_KEY: QueueInteractionProvider(answers)}}
+        asyncio.get_running_loop().call_later(0.1, answers.put_nowait, "Sore calf")
+
+        command, ticks = await _ticks_while(master_orchestrator_node(ANALYSIS_STATE, config))
+
+        assert ticks >= 5
+        assert command.goto == ["metrics_expert"]
+        assert command.update["metrics_expert_messages"][1].content == "Sore calf"
+
+    @pytest.mark.asyncio
+    async def test_blocking_provider_runs_off_the_loop(self):
+        class SlowConsole:
+            def collect_answers(self, questions, stage_name):
+                time.sleep(0.1)
+                return [{"agent": qa["agent"], "question": "", "answer": "ok"} for qa in questions]
+
+        config = {"configurable": {INTERACTION_PROVIDER_KEY: SlowConsole()}}
+
+        command, ticks = await _ticks_while(master_orchestrator_node(ANALYSIS_STATE, config))
+
+        assert ticks >= 5
+        assert command.update["metrics_expert_messages"][1].content == "ok"
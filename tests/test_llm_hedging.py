@@ -0,0 +1,143 @@
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from services.ai.ai_settings import AgentRole
+from services.ai.langgraph.nodes.node_base import create_cost_entry
+from services.ai.langgraph.nodes.tool_calling_helper import handle_tool_calling_in_node
+from services.ai.utils.llm_hedging import HedgePolicy, LLMHedger, llm_hedger, parse_hedging_settings
+
+
+def _warm_hedger(latency: float = 0.01, **policy) -> LLMHedger:
+    hedger = LLMHedger(HedgePolicy(enabled=True, min_samples=3, min_delay_seconds=0.0, **policy))
+    for _ in range(3):
+        hedger.record_latency(AgentRole.SYNTHESIS, latency)
+    return hedger
+
+
+async def _respond(value: str, delay: float, calls: list[str]):
+    calls.append(value)
+    await asyncio.sleep(delay)
+    return value
+
+
+class TestLLMHedger:
+
+    def test_hedge_delay_uses_percentile_and_floor(self):
+        hedger = LLMHedger(HedgePolicy(enabled=True, percentile=90, min_samples=3, min_delay_seconds=2.0))
+        for latency in (1.0, 3.0):
+            hedger.record_latency(AgentRole.SYNTHESIS, latency)
+        assert hedger.hedge_delay(AgentRole.SYNTHESIS) is None
+
+        for latency in (5.0, 4.0, 1.5, 1.0, 2.0, 2.5, 1.0, 9.0):
+            hedger.record_latency(AgentRole.SYNTHESIS, latency)
+        assert hedger.hedge_delay(AgentRole.SYNTHESIS) == 5.0
+
+        hedger.policy.min_delay_seconds = 30.0
+        assert hedger.hedge_delay(AgentRole.SYNTHESIS) == 30.0
+
+    @pytest.mark.asyncio
+    async def test_fast_call_is_not_hedged(self):
+        hedger = _warm_hedger(latency=0.5)
+        calls = []
+
+        result = await hedger.run(
+            AgentRole.SYNTHESIS, lambda: _respond("primary", 0, calls), lambda: _respond("hedge", 0, calls)
+        )
+
+        assert result == "primary" and calls == ["primary"]
+        assert hedger.get_stats()["synthesis"]["hedged"] == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_call_is_hedged_and_loser_cancelled(self):
+        hedger = _warm_hedger()
+        calls = []
+        cancelled = asyncio.Event()
+
+        async def slow_primary():
+            try:
+                return await _respond("primary", 5, calls)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        result = await hedger.run(AgentRole.SYNTHESIS, slow_primary, lambda: _respond("hedge", 0, calls))
+
+        assert result == "hedge" and calls == ["primary", "hedge"]
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+        stats = hedger.get_stats()["synthesis"]
+        assert (stats["calls"], stats["hedged"], stats["hedge_wins"], stats["hedge_rate"]) == (1, 1, 1, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_hedge_falls_back_to_primary(self):
+        hedger = _warm_hedger()
+        calls = []
+
+        async def failing_hedge():
+            raise RuntimeError("hedge failed")
+
+        result = await hedger.run(AgentRole.SYNTHESIS, lambda: _respond("primary", 0.05, calls), failing_hedge)
+
+        assert result == "primary"
+        assert hedger.get_stats()["synthesis"]["hedge_wins"] == 0
+
+    def test_disabled_or_unlisted_roles_run_directly(self):
+        hedger = LLMHedger(HedgePolicy(enabled=True, roles={AgentRole.SYNTHESIS}))
+        assert hedger.applies_to(AgentRole.SYNTHESIS)
+        assert not hedger.applies_to(AgentRole.FORMATTER)
+        assert not LLMHedger().applies_to(AgentRole.SYNTHESIS)
+
+    def test_parse_hedging_settings(self):
+        policy = parse_hedging_settings(
+            {"enabled": True, "percentile": 99, "roles": ["synthesis"], "fallback_models": {"synthesis": "gpt-4.1"}}
+        )
+        assert policy.roles == {AgentRole.SYNTHESIS}
+        assert policy.fallback_models == {AgentRole.SYNTHESIS: "gpt-4.1"}
+        assert parse_hedging_settings(None) == HedgePolicy()
+
+        with pytest.raises(ValueError, match="Unknown fallback model"):
+            parse_hedging_settings({"fallback_models": {"synthesis": "gpt-99"}})
+        with pytest.raises(ValueError, match="Invalid hedging role"):
+            parse_hedging_settings({"roles": ["coach"]})
+        with pytest.raises(ValueError, match="percentile"):
+            parse_hedging_settings({"percentile": 100})
+
+
+@pytest.mark.asyncio
+async def test_tool_calling_hedges_to_fallback_model():
+    class FakeLLM:
+        def __init__(self, content: str, delay: float):
+            self.content, self.delay = content, delay
+
+        async def ainvoke(self, _messages):
+            await asyncio.sleep(self.delay)
+            return Mock(content=self.content, tool_calls=[])
+
+    fallback_base = Mock()
+    bind_llm = Mock(return_value=FakeLLM("fallback", 0))
+    llm_hedger.configure(
+        HedgePolicy(enabled=True, min_samples=1, min_delay_seconds=0.0, fallback_models={AgentRole.SYNTHESIS: "gpt-4.1"})
+    )
+    llm_hedger.record_latency(AgentRole.SYNTHESIS, 0.01)
+
+    try:
+        with patch(
+            "services.ai.langgraph.nodes.tool_calling_helper.ModelSelector.get_llm", return_value=fallback_base
+        ) as get_llm:
+            response = await handle_tool_calling_in_node(
+                llm_with_tools=FakeLLM("primary", 5),
+                messages=[{"role": "user", "content": "hi"}],
+                tools=[],
+                agent_role=AgentRole.SYNTHESIS,
+                bind_llm=bind_llm,
+            )
+    finally:
+        llm_hedger.configure()
+
+    assert response.content == "fallback"
+    get_llm.assert_called_once_with(AgentRole.SYNTHESIS, model_name="gpt-4.1")
+    bind_llm.assert_called_once_with(fallback_base)
+
+    entry = create_cost_entry("synthesis", 1.0)
+    assert (entry["hedge_eligible_calls"], entry["hedged_calls"], entry["hedge_wins"]) == (1, 1, 1)
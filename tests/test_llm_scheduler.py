@@ -0,0 +1,124 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.ai.ai_settings import AgentRole
+from services.ai.langgraph.nodes.metrics_summarizer_node import metrics_summarizer_node
+from services.ai.langgraph.state.training_analysis_state import create_initial_state
+from services.ai.utils.llm_scheduler import (
+    LLMBudget,
+    LLMScheduler,
+    estimate_message_tokens,
+    llm_scheduler,
+    parse_scheduler_settings,
+)
+
+
+async def _hold(scheduler: LLMScheduler, name: str, order: list, priority: int = 5, tokens: int = 0, delay=0.02):
+    async with scheduler.reserve("openai", "gpt-test", tokens, priority):
+        order.append(name)
+        await asyncio.sleep(delay)
+
+
+class TestLLMScheduler:
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_and_priority_order(self):
+        scheduler = LLMScheduler(budgets={"openai": LLMBudget(max_concurrency=1)})
+        order = []
+
+        blocker = asyncio.create_task(_hold(scheduler, "first", order))
+        await asyncio.sleep(0)
+        waiting = [
+            asyncio.create_task(_hold(scheduler, "formatter", order, priority=4)),
+            asyncio.create_task(_hold(scheduler, "summarizer", order, priority=0)),
+            asyncio.create_task(_hold(scheduler, "synthesis", order, priority=3)),
+        ]
+        await asyncio.sleep(0)
+        assert scheduler.get_stats()["openai/gpt-test"]["queued"] == 3
+
+        await asyncio.gather(blocker, *waiting)
+
+        assert order == ["first", "summarizer", "synthesis", "formatter"]
+        stats = scheduler.get_stats()["openai/gpt-test"]
+        assert stats["requests"] == 4 and stats["active"] == 0
+        assert stats["max_wait_seconds"] > 0
+
+    @pytest.mark.asyncio
+    async def test_request_and_token_budgets_delay_admission(self):
+        scheduler = LLMScheduler(
+            budgets={
+                "openai/gpt-test": LLMBudget(max_concurrency=10, requests_per_minute=2),
+                "anthropic": LLMBudget(max_concurrency=10, tokens_per_minute=100),
+            },
+            window_seconds=0.2,
+        )
+
+        async def timed(provider: str, tokens: int) -> float:
+            async with scheduler.reserve(provider, "gpt-test", tokens) as waited:
+                return waited
+
+        rpm_waits = await asyncio.gather(*(timed("openai", 0) for _ in range(3)))
+        assert rpm_waits[0] < 0.05 and rpm_waits[1] < 0.05
+        assert rpm_waits[2] >= 0.15
+
+        tpm_waits = await asyncio.gather(timed("anthropic", 80), timed("anthropic", 80))
+        assert tpm_waits[0] < 0.05
+        assert tpm_waits[1] >= 0.15
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_does_not_hold_slot(self):
+        scheduler = LLMScheduler(budgets={"openai": LLMBudget(max_concurrency=1)})
+        order = []
+
+        blocker = asyncio.create_task(_hold(scheduler, "first", order))
+        await asyncio.sleep(0)
+        cancelled = asyncio.create_task(_hold(scheduler, "cancelled", order, priority=0))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(blocker, _hold(scheduler, "second", order))
+
+        assert order == ["first", "second"]
+        assert scheduler.get_stats()["openai/gpt-test"]["active"] == 0
+
+    def test_disabled_scheduler_and_settings(self):
+        settings = parse_scheduler_settings({
+            "enabled": False,
+            "budgets": {"openai": {"max_concurrency": 2, "tokens_per_minute": 1000}},
+            "priorities": {"synthesis": 0},
+        })
+
+        assert settings["budgets"]["openai"] == LLMBudget(max_concurrency=2, tokens_per_minute=1000)
+        assert settings["role_priorities"] == {AgentRole.SYNTHESIS: 0}
+        assert settings["enabled"] is False
+
+        with pytest.raises(ValueError):
+            parse_scheduler_settings({"priorities": {"coach": 1}})
+        with pytest.raises(ValueError):
+            parse_scheduler_settings({"budgets": {"openai": {"max_concurrency": 0}}})
+
+    def test_estimate_message_tokens(self):
+        messages = [{"role": "user", "content": "x" * 400}, Mock(content="y" * 40)]
+        assert estimate_message_tokens(messages) == 100 + 10 + 8
+
+
+@pytest.mark.asyncio
+async def test_queue_wait_is_recorded_in_cost_entry():
+    state = create_initial_state(
+        user_id="test_user",
+        athlete_name="Test Athlete",
+        garmin_data={"training_load_history": []},
+        execution_id="test_scheduler",
+    )
+    mock_llm = Mock()
+    mock_llm.ainvoke = AsyncMock(return_value=Mock(content="summary"))
+
+    with (
+        patch("services.ai.model_config.ModelSelector.get_llm", return_value=mock_llm),
+        patch.object(llm_scheduler, "reserve", wraps=llm_scheduler.reserve) as reserve,
+    ):
+        result = await metrics_summarizer_node(state)
+
+    assert reserve.call_args.kwargs["priority"] == llm_scheduler.priority_for(AgentRole.SUMMARIZER)
+    assert result["costs"][0]["queue_wait_time"] >= 0.0
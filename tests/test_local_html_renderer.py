@@ -0,0 +1,138 @@
+from unittest.mock import patch
+
+import pytest
+
+from services.ai.langgraph.nodes.formatter_node import formatter_node
+from services.ai.langgraph.nodes.plan_formatter_node import plan_formatter_node
+from services.ai.langgraph.rendering import (
+    render_analysis_html,
+    render_markdown,
+    render_planning_html,
+    resolve_formatter_backends,
+)
+from services.ai.langgraph.state.training_analysis_state import create_initial_state
+from services.ai.tools.plotting import PlotReferenceResolver, PlotStorage
+
+SYNTHESIS_MARKDOWN = """# Executive Summary
+Readiness is **high** and load is *stable*.
+
+[PLOT:metrics_1700000000000_001]
+
+| Metric | Value |
+|--------|------:|
+| CTL | 55 |
+| TSB | -5 |
+
+1. Keep volume
+2. Add strides
+"""
+
+WEEKLY_MARKDOWN = """## Week 1
+- **Mon, Nov 24** — Recovery: 40' Z1
+- **Tue, Nov 25** — VO2max: 5x(3' Z5, 3' r)
+"""
+
+
+class TestMarkdownRenderer:
+
+    def test_renders_report_subset(self):
+        html = render_markdown(SYNTHESIS_MARKDOWN)
+
+        assert '<h1 id="executive-summary">Executive Summary</h1>' in html
+        assert "<strong>high</strong>" in html and "<em>stable</em>" in html
+        assert '<div class="plot-slot">[PLOT:metrics_1700000000000_001]</div>' in html
+        assert '<td style="text-align: right">-5</td>' in html
+        assert "<ol><li>Keep volume</li><li>Add strides</li></ol>" in html
+
+    def test_escapes_html_and_keeps_identifiers(self):
+        html = render_markdown("Load < 100 & snake_case_value `a<b`")
+
+        assert html == "<p>Load &lt; 100 &amp; snake_case_value <code>a&lt;b</code></p>"
+
+    def test_only_safe_link_schemes_become_anchors(self):
+        html = render_markdown(
+            "[site](https://example.com) [mail](mailto:a@b.c) [top](#summary) "
+            "[xss](javascript:alert(1)) [blob](data:text/html;base64,PHNjcmlwdD4=)"
+        )
+
+        assert '<a href="https://example.com">site</a>' in html
+        assert '<a href="mailto:a@b.c">mail</a>' in html and '<a href="#summary">top</a>' in html
+        assert html.count("<a ") == 3 and "javascript:" not in html and "data:" not in html
+
+    def test_checklist_mode_adds_named_checkboxes(self):
+        html = render_markdown(WEEKLY_MARKDOWN + "\n| Day | Workout |\n|---|---|\n| Wed | Easy |\n", "wk")
+
+        assert html.count('type="checkbox"') == 3
+        assert 'name="wk-001"' in html and 'name="wk-003"' in html
+        assert '<th class="check-cell"></th>' in html
+
+
+class TestHtmlTemplates:
+
+    def test_analysis_output_is_byte_stable(self):
+        first = render_analysis_html(SYNTHESIS_MARKDOWN, "Test Athlete", {"date": "2026-01-05"})
+        second = render_analysis_html(SYNTHESIS_MARKDOWN, "Test Athlete", {"date": "2026-01-05"})
+
+        assert first == second
+        assert first.startswith("<!DOCTYPE html>")
+        assert "Test Athlete · 2026-01-05" in first
+
+    def test_analysis_plot_placeholders_resolve(self):
+        plot_storage = PlotStorage("test_render")
+        plot_id = plot_storage.store_plot("<div>chart</div>", "Load", "metrics")
+        synthesis = SYNTHESIS_MARKDOWN.replace("metrics_1700000000000_001", plot_id)
+
+        resolved = PlotReferenceResolver(plot_storage).resolve_plot_references(render_analysis_html(synthesis))
+
+        assert "[PLOT:" not in resolved
+        assert "<div>chart</div>" in resolved
+
+    def test_planning_layout(self):
+        html = render_planning_html(
+            "## Base Phase\nBuild aerobic capacity.",
+            WEEKLY_MARKDOWN,
+            "Test Athlete",
+            [{"date": "2026-01-05"}, {"date": "2026-02-01"}],
+        )
+
+        assert "Season Plan Overview" in html and "4-Week Plan" in html
+        assert "Test Athlete · 2026-01-05 – 2026-02-01" in html
+        assert html.count('type="checkbox"') == 2
+
+
+class TestFormatterBackends:
+
+    def test_resolve_formatter_backends(self):
+        assert resolve_formatter_backends(None) == {"formatter": "llm", "plan_formatter": "llm"}
+        assert resolve_formatter_backends("local") == {"formatter": "local", "plan_formatter": "local"}
+        assert resolve_formatter_backends({"plan_formatter": "LOCAL"}) == {
+            "formatter": "llm",
+            "plan_formatter": "local",
+        }
+
+        with pytest.raises(ValueError):
+            resolve_formatter_backends("markdown")
+        with pytest.raises(ValueError):
+            resolve_formatter_backends({"synthesis": "local"})
+
+    @pytest.mark.asyncio
+    async def test_local_backend_skips_llm(self):
+        state = create_initial_state(
+            user_id="test_user",
+            athlete_name="Test Athlete",
+            garmin_data={},
+            execution_id="test_local",
+            formatter_backends={"formatter": "local", "plan_formatter": "local"},
+        )
+        state["synthesis_result"] = SYNTHESIS_MARKDOWN
+        state["season_plan"] = {"output": "## Base"}
+        state["weekly_plan"] = {"output": WEEKLY_MARKDOWN}
+
+        with patch("services.ai.model_config.ModelSelector.get_llm") as mock_get_llm:
+            analysis = await formatter_node(state)
+            planning = await plan_formatter_node(state)
+
+        mock_get_llm.assert_not_called()
+        assert "[PLOT:metrics_1700000000000_001]" in analysis["analysis_html"]
+        assert 'name="wk-001"' in planning["planning_html"]
+        assert analysis["costs"][0]["agent"] == "formatter"
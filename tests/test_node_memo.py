@@ -0,0 +1,143 @@
+import operator
+from typing import Annotated, TypedDict
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langgraph.graph import END, START, StateGraph
+
+from services.ai.ai_settings import AgentRole, ai_settings
+from services.ai.langgraph.nodes.node_base import expert_memo_inputs, memoize_node
+from services.ai.langgraph.schemas import MetricsExpertOutputs
+from services.ai.langgraph.schemas.expert_outputs import ReceiverOutputs
+from services.ai.langgraph.utils.node_memo import NODE_MEMO_KEY, NodeMemoStore, fingerprint_inputs
+
+
+class _State(TypedDict, total=False):
+    metrics_summary: str
+    competitions: list
+    current_date: dict
+    athlete_name: str
+    analysis_context: str
+    metrics_expert_messages: list
+    metrics_outputs: MetricsExpertOutputs | None
+    costs: Annotated[list, operator.add]
+
+
+def _receiver_outputs(text: str) -> ReceiverOutputs:
+    return ReceiverOutputs(for_synthesis=text, for_season_planner=text, for_weekly_planner=text)
+
+
+def _memoized_expert(calls: list):
+    @memoize_node("metrics", AgentRole.METRICS_EXPERT, expert_memo_inputs("metrics_summary", "metrics_expert_messages"))
+    async def metrics_node(state: _State):
+        calls.append(state["metrics_summary"])
+        return {
+            "metrics_outputs": MetricsExpertOutputs(output=_receiver_outputs(f"analysis of {state['metrics_summary']}")),
+            "costs": [{"agent": "metrics", "execution_time": 1.0}],
+        }
+
+    return metrics_node
+
+
+def _graph(node):
+    workflow = StateGraph(_State)
+    workflow.add_node("metrics_expert", node)
+    workflow.add_edge(START, "metrics_expert")
+    workflow.add_edge("metrics_expert", END)
+    return workflow.compile()
+
+
+BASE_STATE = {"metrics_summary": "load 100", "competitions": [], "analysis_context": "", "costs": []}
+
+
+@pytest.mark.asyncio
+async def test_graph_reuses_output_for_unchanged_inputs(tmp_path):
+    calls = []
+    app = _graph(_memoized_expert(calls))
+    config = {"configurable": {NODE_MEMO_KEY: NodeMemoStore(tmp_path / "node_memo.sqlite")}}
+
+    first = await app.ainvoke(BASE_STATE, config)
+    second = await app.ainvoke(BASE_STATE, {"configurable": {NODE_MEMO_KEY: NodeMemoStore(tmp_path / "node_memo.sqlite")}})
+
+    assert calls == ["load 100"]
+    assert isinstance(second["metrics_outputs"], MetricsExpertOutputs)
+    assert second["metrics_outputs"] == first["metrics_outputs"]
+    assert second["metrics_outputs"].output.for_synthesis == "analysis of load 100"
+    assert [cost["memo_hit"] for cost in first["costs"] + second["costs"]] == [False, True]
+    assert second["costs"][0]["execution_time"] == 0.0
+
+
+@pytest.mark.asyncio
+async def test_changed_inputs_or_model_miss(tmp_path):
+    calls = []
+    node = _memoized_expert(calls)
+    config = {"configurable": {NODE_MEMO_KEY: NodeMemoStore(tmp_path / "node_memo.sqlite")}}
+    answered = {
+        **BASE_STATE,
+        "metrics_expert_messages": [AIMessage(content="Injured?"), HumanMessage(content="No")],
+    }
+
+    await node(BASE_STATE, config)
+    await node(answered, config)
+    await node(answered, config)
+    with patch.dict(ai_settings.model_assignments[ai_settings.mode], {AgentRole.METRICS_EXPERT: "gpt-4.1"}):
+        await node(answered, config)
+    await node(BASE_STATE)
+
+    assert len(calls) == 4
+    assert config["configurable"][NODE_MEMO_KEY].hits == 1
+
+
+@pytest.mark.asyncio
+async def test_next_day_misses_with_unchanged_summary(tmp_path):
+    calls = []
+    node = _memoized_expert(calls)
+    config = {"configurable": {NODE_MEMO_KEY: NodeMemoStore(tmp_path / "node_memo.sqlite")}}
+    today = {**BASE_STATE, "athlete_name": "Ana", "current_date": {"date": "2026-10-18", "day_name": "Sunday"}}
+    tomorrow = {**today, "current_date": {"date": "2026-10-19", "day_name": "Monday"}}
+
+    await node(today, config)
+    await node(tomorrow, config)
+    await node({**tomorrow, "athlete_name": "Ben"}, config)
+    await node(tomorrow, config)
+
+    assert len(calls) == 3
+    assert config["configurable"][NODE_MEMO_KEY].hits == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_runs_are_not_memoized(tmp_path):
+    calls = []
+
+    @memoize_node("metrics", AgentRole.METRICS_EXPERT, expert_memo_inputs("metrics_summary", "metrics_expert_messages"))
+    async def failing_node(state):
+        calls.append(1)
+        return {"errors": ["Metrics expert analysis failed: boom"]}
+
+    config = {"configurable": {NODE_MEMO_KEY: NodeMemoStore(tmp_path / "node_memo.sqlite")}}
+    await failing_node(BASE_STATE, config)
+    await failing_node(BASE_STATE, config)
+
+    assert len(calls) == 2
+
+
+def test_store_keeps_newest_entries_per_node(tmp_path):
+    store = NodeMemoStore(tmp_path / "node_memo.sqlite", keep_per_node=2)
+    for i in range(3):
+        store.put("metrics", f"fp{i}", {"metrics_outputs": i})
+    store.put("activity_expert", "fp0", {"activity_outputs": 0})
+
+    assert store.get("metrics", "fp0") is None
+    assert store.get("metrics", "fp2") == {"metrics_outputs": 2}
+    assert store.get("activity_expert", "fp0") == {"activity_outputs": 0}
+
+
+def test_fingerprint_is_order_independent_and_message_aware():
+    messages = [AIMessage(content="Q"), HumanMessage(content="A")]
+    assert fingerprint_inputs("metrics", {"a": 1, "messages": messages}) == fingerprint_inputs(
+        "metrics", {"messages": [AIMessage(content="Q"), HumanMessage(content="A")], "a": 1}
+    )
+    assert fingerprint_inputs("metrics", {"messages": messages}) != fingerprint_inputs(
+        "metrics", {"messages": [AIMessage(content="Q"), HumanMessage(content="B")]}
+    )
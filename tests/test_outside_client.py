@@ -1,11 +1,13 @@
+import asyncio
 import json
+import time
 from datetime import datetime as dt
 from typing import Any
 
 import httpx
 import pytest
 
-from services.outside.client import OutsideApiGraphQlClient
+from services.outside.client import AsyncOutsideApiGraphQlClient, OutsideApiGraphQlClient
 from services.outside.models import (
     CalendarNode,
     CalendarResult,
@@ -15,6 +17,7 @@ from services.outside.models import (
     PageInfo,
     SanctioningBody,
 )
+from services.outside.response_cache import OutsideResponseCache
 
 
 @pytest.mark.unit
@@ -925,3 +928,174 @@ class TestOutsideApiGraphQlClient:
         monkeypatch.setattr(OutsideApiGraphQlClient, "get_event", staticmethod(fake_get_event))
         competitions = client.get_competitions([{"id": 12}])
         assert competitions[0]["date"] == "2026-07-02"
+
+    def test_get_competitions_batches_ids_and_resolves_urls_concurrently(self):
+        requests: list[dict[str, Any]] = []
+
+        def node(event_id: int) -> dict[str, Any]:
+            return {"eventId": event_id, "name": f"Race {event_id}", "date": "2026-06-01", "categories": []}
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            body = json.loads(request.content)
+            requests.append(body)
+            variables = body["variables"]
+            if "url" in variables:
+                data = {"athleticEventByURL": node(int(variables["url"].rsplit("/", 1)[1]))}
+            elif variables.get("id_0") == 13:
+                return httpx.Response(200, json={"errors": [{"message": "event 13 not found"}]})
+            elif "id" in variables:
+                data = {"athleticEvent": node(variables["id"]) if variables["id"] != 13 else None}
+            else:
+                data = {f"e_{name[3:]}": node(eid) for name, eid in variables.items() if name.startswith("id_")}
+            return httpx.Response(200, json={"data": data})
+
+        client = OutsideApiGraphQlClient(client=httpx.Client(transport=httpx.MockTransport(handler)))
+        calendar = [{"id": event_id} for event_id in range(100, 120)] + [{"url": "https://x.com/e/500"}]
+
+        competitions = client.get_competitions({"bikereg": calendar, "runreg": [{"id": 7}, {"id": 8}]})
+
+        assert [c["name"] for c in competitions] == [f"Race {i}" for i in [*range(100, 120), 500, 7, 8]]
+        assert len(requests) == 3
+        assert {r["variables"]["appType"] for r in requests if "appType" in r["variables"]} == {"BIKEREG", "RUNREG"}
+
+        requests.clear()
+        competitions = client.get_competitions([{"id": 13}, {"id": 14}])
+        assert [c["name"] for c in competitions] == ["Race 14"]
+        assert len(requests) == 3
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_client_resolves_competitions_concurrently():
+    in_flight, peak, requests = 0, 0, []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        body = json.loads(request.content)
+        requests.append(body)
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        variables = body["variables"]
+        node = {"date": "2026-06-01", "categories": [{"name": "Olympic", "raceDates": ["2026-06-01"]}]}
+        if "url" in variables:
+            data = {"athleticEventByURL": {**node, "eventId": 500, "name": "Race 500"}}
+        else:
+            data = {
+                f"e_{name[3:]}": {**node, "eventId": eid, "name": f"Race {eid}"}
+                for name, eid in variables.items()
+                if name.startswith("id_")
+            }
+        return httpx.Response(200, json={"data": data})
+
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    async with AsyncOutsideApiGraphQlClient(client=http_client) as client:
+        competitions = await client.get_competitions({
+            "trireg": [{"id": 1, "priority": "A"}, {"id": 2}, {"url": "https://x.com/e/500"}],
+            "runreg": [{"id": 3}, {"id": 4}],
+        })
+        events = await client.get_events([1, 2, 3], batch_size=2, precache=True)
+
+    assert [(c["name"], c["race_type"], c["priority"]) for c in competitions] == [
+        ("Race 1", "Olympic", "A"), ("Race 2", "Olympic", "B"), ("Race 500", "Olympic", "B"),
+        ("Race 3", "Olympic", "B"), ("Race 4", "Olympic", "B"),
+    ]
+    assert [event.event_id for event in events] == [1, 2, 3]
+    assert len(requests) == 5 and peak >= 2
+    assert not http_client.is_closed
+    await http_client.aclose()
+
+
+@pytest.mark.unit
+def test_response_cache_serves_warm_runs_without_requests(tmp_path, monkeypatch):
+    requests: list[dict[str, Any]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        node = {"date": "2026-06-01", "categories": [], "isOpen": body["variables"].get("id_1") == 2}
+        data = {
+            f"e_{name[3:]}": {**node, "eventId": eid, "name": f"Race {eid}"}
+            for name, eid in body["variables"].items()
+            if name.startswith("id_")
+        }
+        return httpx.Response(200, json={"data": data or {"athleticEventTypes": []}})
+
+    def run(cache: OutsideResponseCache) -> list[dict[str, Any]]:
+        client = OutsideApiGraphQlClient(client=httpx.Client(transport=httpx.MockTransport(handler)), cache=cache)
+        client.get_event_types()
+        return client.get_competitions({"trireg": [{"id": 1}, {"id": 3}], "runreg": [{"id": 1}, {"id": 2}]})
+
+    db_path = tmp_path / "outside_cache.sqlite"
+    cold = run(OutsideResponseCache(db_path))
+    assert len(requests) == 3
+
+    warm_cache = OutsideResponseCache(db_path)
+    assert run(warm_cache) == cold and len(requests) == 3
+    assert warm_cache.get_stats() == {"hits": 3, "misses": 0, "expired": 0, "evictions": 0, "entries": 3}
+
+    # Open registration expires sooner; reference data lasts longest.
+    later = time.time() + 3 * 3600
+    monkeypatch.setattr("services.outside.response_cache.time.time", lambda: later)
+    assert len(run(OutsideResponseCache(db_path))) == 4 and len(requests) == 4
+
+    small = OutsideResponseCache(max_entries=2)
+    run(small)
+    assert small.get_stats()["entries"] == 2 and small.get_stats()["evictions"] == 1
+
+
+def _calendar_handler(pages: int, per_page: int, requests: list[dict[str, Any]]):
+    def respond(request: httpx.Request) -> httpx.Response:
+        variables = json.loads(request.content)["variables"]
+        requests.append(variables)
+        index = int(variables["after"] or 0)
+        nodes = [
+            {"id": f"n{index * per_page + i}", "eventId": index * per_page + i, "appType": "TRIREG"}
+            for i in range(per_page)
+        ]
+        page_info = {"hasNextPage": index + 1 < pages, "endCursor": str(index + 1)}
+        return httpx.Response(200, json={"data": {"athleticEventCalendar": {"pageInfo": page_info, "nodes": nodes}}})
+
+    return respond
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("prefetch", [0, 2])
+def test_iter_calendar_streams_all_pages(prefetch):
+    requests: list[dict[str, Any]] = []
+    transport = httpx.MockTransport(_calendar_handler(pages=4, per_page=3, requests=requests))
+    client = OutsideApiGraphQlClient(app_type="TRIREG", client=httpx.Client(transport=transport))
+
+    nodes = client.iter_calendar({"appTypes": ["TRIREG"]}, page_size=3, prefetch=prefetch)
+    first = next(nodes)
+    time.sleep(0.1)
+    # With prefetch, later pages are requested while the caller is still on the first one.
+    assert len(requests) == (1 if prefetch == 0 else 4)
+    assert [first.event_id, *(node.event_id for node in nodes)] == list(range(12))
+    assert [r["after"] for r in requests] == [None, "1", "2", "3"] and requests[0]["first"] == 3
+
+    requests.clear()
+    assert next(client.iter_calendar(page_size=3, prefetch=1)).event_id == 0
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+async def test_async_iter_calendar_prefetches_and_propagates_errors():
+    requests: list[dict[str, Any]] = []
+    respond = _calendar_handler(pages=3, per_page=2, requests=requests)
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if len(requests) == 5:
+            return httpx.Response(500)
+        return respond(request)
+
+    async with AsyncOutsideApiGraphQlClient(client=httpx.AsyncClient(transport=httpx.MockTransport(handler))) as client:
+        nodes = client.iter_calendar(page_size=2, prefetch=1)
+        first = await anext(nodes)
+        await asyncio.sleep(0.05)
+        assert len(requests) >= 2
+        assert [first.event_id] + [node.event_id async for node in nodes] == list(range(6))
+
+        with pytest.raises(httpx.HTTPStatusError):
+            [node async for node in client.iter_calendar(page_size=2, prefetch=2)]
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from services.ai.tools.plotting.plot_datasets import MANIFEST_NAME, write_plot_datasets
+from services.ai.tools.plotting.plot_worker_pool import PlotWorkerPool
+
+GARMIN_DATA = {
+    "training_load_history": [
+        {"date": f"2024-01-{day:02d}", "acute_load": 300 + day, "chronic_load": 280, "acwr": 1.1}
+        for day in range(1, 15)
+    ],
+    "vo2_max_history": {"running": [{"date": "2024-01-01", "value": 55.0}], "cycling": []},
+    "all_activities": [
+        {
+            "activity_id": 1,
+            "activity_type": "running",
+            "activity_name": "Easy run",
+            "start_time": "2024-01-02 07:00:00",
+            "summary": {"distance": 10000.0, "average_hr": 140},
+            "laps": [{"distance": 1000.0}],
+        }
+    ],
+    "recovery_indicators": [
+        {"date": "2024-01-02", "sleep": {"duration": {"total": 7.5}}, "stress": {"avg_level": 25}}
+    ],
+}
+
+
+@pytest.fixture
+def pool():
+    pool = PlotWorkerPool(size=1)
+    yield pool
+    pool.close()
+
+
+def test_datasets_are_flattened_tables_with_a_manifest(tmp_path):
+    manifest = write_plot_datasets(GARMIN_DATA, tmp_path)
+
+    assert manifest == json.loads((tmp_path / MANIFEST_NAME).read_text())
+    assert manifest["training_load_history"]["rows"] == 14
+    assert manifest["vo2_max_history"]["columns"] == ["sport", "date", "value"]
+    assert "laps" not in manifest["activities"]["columns"]
+    assert manifest["recovery"]["columns"] == ["date", "sleep_duration_total", "stress_avg_level"]
+
+
+def test_plot_code_loads_datasets_by_name(tmp_path, pool):
+    write_plot_datasets(GARMIN_DATA, tmp_path)
+    code = """
+    import plotly.graph_objects as go
+    df = load_dataset("training_load_history")
+    assert str(df["date"].dtype).startswith("datetime64") and df["acute_load"].max() == 314
+    fig = go.Figure(go.Scatter(x=df["date"], y=df["acute_load"]))
+    """
+
+    result = pool.run(code, dataset_dir=tmp_path)
+    assert result["ok"] and "plotly" in result["html"]
+
+    missing = pool.run('load_dataset("hrv")', dataset_dir=tmp_path)
+    assert not missing["ok"] and "available: training_load_history" in missing["error"]
@@ -0,0 +1,84 @@
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from services.ai.tools.plotting import PlotReferenceResolver, PlotStorage
+from services.ai.tools.plotting.figure_optimizer import lttb_indices, optimize_figure
+from services.ai.tools.plotting.plot_worker_pool import PlotWorkerPool
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    y = np.sin(np.arange(10_000) / 300.0)
+    y[4321] = 5.0
+
+    kept = lttb_indices(np.arange(10_000, dtype=float), y, 200)
+
+    assert len(kept) == 200 and kept[0] == 0 and kept[-1] == 9_999
+    assert 4321 in kept and np.all(np.diff(kept) > 0)
+
+
+def test_figures_are_decimated_and_minified():
+    x = np.arange(20_000) * 0.5
+    fig = go.Figure([
+        go.Scatter(x=x, y=140 + 10 * np.sin(x / 100) + np.random.default_rng(0).normal(size=x.size)),
+        go.Bar(x=[f"W{i}" for i in range(10)], y=[i * 1.23456789 for i in range(10)]),
+    ])
+    before = len(pio.to_html(fig, include_plotlyjs=False, full_html=False))
+
+    stats = optimize_figure(fig, max_points=500)
+
+    assert stats["points_before"] == 20_000 and stats["points_after"] == 500
+    assert list(fig.data[1].y[:3]) == [0.0, 1.235, 2.469]
+    assert set(fig.data[0].x) <= set(x)
+    assert len(pio.to_html(fig, include_plotlyjs=False, full_html=False)) < before / 20
+
+
+def test_per_point_marker_and_error_arrays_stay_aligned():
+    x = np.arange(5_000, dtype=float)
+    fig = go.Figure([
+        go.Scatter(
+            x=x,
+            y=np.sin(x / 50),
+            mode="markers",
+            marker={"color": x * 2, "size": x % 7, "line": {"width": x % 3}},
+            error_y={"array": x / 10, "arrayminus": x / 20},
+            error_x={"array": x / 30},
+            hovertext=[f"p{i}" for i in range(5_000)],
+        ),
+        go.Scatter(x=x, y=np.cos(x / 50), marker={"color": "red", "size": 6}, error_y={"value": 5}),
+    ])
+
+    optimize_figure(fig, max_points=300)
+    assert fig.data[1].marker.size == 6 and fig.data[1].marker.color == "red" and len(fig.data[1].x) == 300
+
+    trace = fig.data[0]
+    kept = np.asarray(trace.x, dtype=float)
+    assert len(kept) == 300
+    np.testing.assert_allclose(trace.marker.color, kept * 2)
+    np.testing.assert_allclose(trace.marker.size, kept % 7)
+    np.testing.assert_allclose(trace.marker.line.width, kept % 3)
+    np.testing.assert_allclose(trace.error_y.array, kept / 10)
+    np.testing.assert_allclose(trace.error_y.arrayminus, kept / 20)
+    np.testing.assert_allclose(trace.error_x.array, kept / 30)
+    assert list(trace.hovertext) == [f"p{int(i)}" for i in kept]
+
+
+def test_plotlyjs_is_loaded_once_per_document():
+    pool = PlotWorkerPool(size=1)
+    try:
+        result = pool.run("import plotly.express as px\nfig = px.line(y=list(range(5000)))")
+    finally:
+        pool.close()
+    assert result["ok"] and result["stats"]["traces_downsampled"] == 1
+
+    storage = PlotStorage("exec")
+    first = storage.store_plot(result["html"], "A", "metrics", optimization=result["stats"])
+    second = storage.store_plot(result["html"], "B", "activity")
+    resolver = PlotReferenceResolver(storage)
+
+    html = resolver.resolve_plot_references(f"[PLOT:{first}] text [PLOT:{second}]")
+
+    assert html.count("cdn.plot.ly") == 1 and html.count("PlotlyConfig") == 1
+    assert html.index("cdn.plot.ly") < html.index(f"plot-{first}")
+    assert resolver.size_stats["plotlyjs_loads"] == 1
+    assert resolver.size_stats["embedded_plot_bytes"] < resolver.size_stats["plot_html_bytes"]
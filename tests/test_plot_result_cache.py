@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+from services.ai.tools.plotting import PlotStorage, create_plotting_tools, production_secure_executor
+from services.ai.tools.plotting.plot_datasets import write_plot_datasets
+from services.ai.tools.plotting.plot_result_cache import PlotResultCache, plot_cache_key
+from services.ai.tools.plotting.plot_worker_pool import PlotWorkerPool
+
+PLOT_CODE = """
+import plotly.graph_objects as go
+fig = go.Figure(go.Bar(x=["a", "b"], y=[1, 2]))
+"""
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = PlotWorkerPool(size=1)
+    monkeypatch.setattr(production_secure_executor, "plot_worker_pool", pool)
+    yield pool
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_hits_register_plots_without_running_code(pool):
+    cache = PlotResultCache()
+    plot_storage = PlotStorage("exec")
+    metrics_tool = create_plotting_tools(plot_storage, "metrics", cache=cache)
+    activity_tool = create_plotting_tools(plot_storage, "activity", cache=cache)
+
+    first = await metrics_tool.ainvoke({"python_code": PLOT_CODE, "description": "Bars"})
+    indented = PLOT_CODE.replace("\n", "\n    ")
+    second = await activity_tool.ainvoke({"python_code": indented, "description": "Bars"})
+
+    assert first["ok"] and second["ok"] and first["plot_id"] != second["plot_id"]
+    assert pool.stats["jobs"] == 1
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "entries": 1}
+    assert plot_storage.get_plot_html(second["plot_id"]) == plot_storage.get_plot_html(first["plot_id"])
+    first_stats = plot_storage.plots[first["plot_id"]].optimization
+    assert first_stats and plot_storage.plots[second["plot_id"]].optimization == first_stats
+
+
+def test_persisted_entries_depend_on_dataset_version(tmp_path):
+    write_plot_datasets({"training_load_history": [{"date": "2024-01-01", "acwr": 1.0}]}, tmp_path / "v1")
+    write_plot_datasets({"training_load_history": [{"date": "2024-01-01", "acwr": 1.4}]}, tmp_path / "v2")
+    PlotResultCache(tmp_path / "plots.sqlite").put(
+        plot_cache_key(PLOT_CODE, tmp_path / "v1"), "<div>v1</div>", {"points_before": 4, "points_after": 2}
+    )
+
+    cache = PlotResultCache(tmp_path / "plots.sqlite")
+    assert cache.get(plot_cache_key(PLOT_CODE, tmp_path / "v1")) == {
+        "html": "<div>v1</div>", "stats": {"points_before": 4, "points_after": 2}
+    }
+    assert cache.get(plot_cache_key(PLOT_CODE, tmp_path / "v2")) is None
+
+
+def test_caches_written_without_stats_still_open(tmp_path):
+    path = tmp_path / "plots.sqlite"
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE plot_cache (key TEXT PRIMARY KEY, html TEXT NOT NULL, created_at REAL NOT NULL)")
+        conn.execute("INSERT INTO plot_cache VALUES ('old', '<div>old</div>', 0)")
+    conn.close()
+
+    assert PlotResultCache(path).get("old") == {"html": "<div>old</div>", "stats": {}}
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from services.ai.tools.plotting import ProductionSecureExecutor
+from services.ai.tools.plotting.plot_worker_pool import PlotWorkerPool
+
+PLOT_CODE = """
+import plotly.graph_objects as go
+print("debug output must not break the protocol")
+fig = go.Figure(go.Scatter(x=[1, 2, 3], y=[4, 5, 6]))
+"""
+
+
+@pytest.fixture
+def pool():
+    pool = PlotWorkerPool(size=1, max_jobs_per_worker=3)
+    yield pool
+    pool.close()
+
+
+def test_workers_are_reused_and_recycled(pool):
+    results = [pool.run(PLOT_CODE) for _ in range(4)]
+
+    assert all(result["ok"] and "plotly" in result["html"] for result in results)
+    assert pool.stats["workers_started"] == 2
+    assert pool.stats["workers_recycled"] == 1
+
+
+def test_timeout_replaces_the_worker(pool):
+    result = pool.run("import time\ntime.sleep(10)", timeout_s=0.5)
+
+    assert not result["ok"] and "timed out" in result["error"]
+    assert pool.run(PLOT_CODE)["ok"]
+    assert pool.stats["timeouts"] == 1 and pool.stats["workers_started"] == 2
+
+
+@pytest.mark.asyncio
+async def test_crash_after_a_long_queue_is_not_reported_as_a_timeout(pool):
+    slow = asyncio.ensure_future(pool.arun("import time\ntime.sleep(1)\n" + PLOT_CODE))
+    await asyncio.sleep(0.1)
+    # Waits behind the slow job for longer than its own timeout, then crashes at once.
+    crashed = await pool.arun("import os\nos._exit(1)", timeout_s=0.5)
+
+    assert (await slow)["ok"]
+    assert not crashed["ok"] and "exited unexpectedly" in crashed["error"]
+    assert pool.stats["timeouts"] == 0
+
+
+def test_errors_come_back_without_killing_the_worker(pool):
+    result = pool.run("x = 1")
+
+    assert not result["ok"] and "No variable named 'fig'" in result["error"]
+    assert pool.run(PLOT_CODE)["ok"]
+    assert pool.stats["workers_started"] == 1
+
+
+@pytest.mark.asyncio
+async def test_executor_runs_off_the_event_loop(pool):
+    executor = ProductionSecureExecutor(pool=pool)
+    ticks = 0
+    task = asyncio.ensure_future(executor.aexecute_plotting_code("import time\ntime.sleep(0.3)\n" + PLOT_CODE))
+    while not task.done():
+        ticks += 1
+        await asyncio.sleep(0.01)
+
+    ok, html, error = task.result()
+    assert ok and html and not error
+    assert ticks >= 10
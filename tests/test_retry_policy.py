@@ -0,0 +1,160 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import anthropic
+import httpx
+import openai
+import pytest
+
+from services.ai.ai_settings import AgentRole
+from services.ai.langgraph.nodes.tool_calling_helper import scheduled_llm_call
+from services.ai.utils.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    get_circuit_breaker,
+    reset_circuit_breakers,
+)
+from services.ai.utils.llm_scheduler import llm_scheduler
+from services.ai.utils.retry_handler import (
+    RetryConfig,
+    classify_exception,
+    parse_retry_after,
+    retry_with_backoff,
+)
+
+
+def _response(status: int, url: str = "https://api.openai.com/v1/chat/completions", **headers) -> httpx.Response:
+    return httpx.Response(status, headers=headers, request=httpx.Request("POST", url))
+
+
+class TestErrorClassification:
+
+    def test_openai_and_openrouter_status_errors(self):
+        rate_limited = openai.RateLimitError(
+            "slow down", response=_response(429, "https://openrouter.ai/api/v1/chat", **{"retry-after": "7"}), body=None
+        )
+        bad_request = openai.BadRequestError("bad", response=_response(400), body=None)
+        unavailable = openai.APIStatusError("down", response=_response(503), body=None)
+
+        assert classify_exception(rate_limited) == classify_exception(rate_limited, RetryConfig())
+        assert classify_exception(rate_limited).retryable
+        assert classify_exception(rate_limited).provider == "openrouter"
+        assert classify_exception(rate_limited).retry_after == 7.0
+        assert not classify_exception(bad_request).retryable
+        assert classify_exception(unavailable).retryable
+        assert classify_exception(unavailable).provider == "openai"
+
+    def test_transport_and_anthropic_errors(self):
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        overloaded = anthropic.APIStatusError(
+            "overloaded",
+            response=httpx.Response(529, request=request),
+            body={"type": "error", "error": {"type": "overloaded_error"}},
+        )
+
+        assert classify_exception(httpx.ConnectError("reset", request=request)).retryable
+        assert classify_exception(httpx.ReadTimeout("timeout")).provider is None
+        assert classify_exception(overloaded).provider == "anthropic"
+        assert classify_exception(overloaded).reason == "overloaded_error"
+        assert not classify_exception(ValueError("schema mismatch")).retryable
+
+    def test_parse_retry_after_formats(self):
+        now = 1_700_000_000.0
+        assert parse_retry_after({"retry-after-ms": "1500"}, now) == 1.5
+        assert parse_retry_after({"retry-after": "Tue, 14 Nov 2023 22:13:40 GMT"}, now) == pytest.approx(20.0)
+        assert parse_retry_after(
+            {
+                "x-ratelimit-remaining-requests": "12",
+                "x-ratelimit-reset-requests": "6m0s",
+                "x-ratelimit-remaining-tokens": "0",
+                "x-ratelimit-reset-tokens": "1.5s",
+            },
+            now,
+        ) == 1.5
+        reset_headers = {"anthropic-ratelimit-tokens-reset": "2023-11-14T22:13:50Z"}
+        assert parse_retry_after(reset_headers, now) == pytest.approx(30.0)
+        assert parse_retry_after({"x-ratelimit-reset": str(int((now + 4) * 1000))}, now) == pytest.approx(4.0)
+        assert parse_retry_after({}, now) is None
+
+
+@pytest.mark.asyncio
+async def test_retry_honors_retry_after_instead_of_backoff():
+    error = openai.RateLimitError("slow down", response=_response(429, **{"retry-after": "3"}), body=None)
+    func = AsyncMock(side_effect=[error, "ok"])
+
+    with patch("services.ai.utils.retry_handler.asyncio.sleep", new=AsyncMock()) as sleep:
+        result = await retry_with_backoff(func, RetryConfig(base_delay=30.0, jitter=False), "test")
+
+    assert result == "ok"
+    sleep.assert_awaited_once_with(3.0)
+
+
+@pytest.mark.asyncio
+async def test_non_retryable_error_is_raised_immediately():
+    func = AsyncMock(side_effect=openai.BadRequestError("bad", response=_response(400), body=None))
+
+    with pytest.raises(openai.BadRequestError):
+        await retry_with_backoff(func, RetryConfig(), "test")
+
+    assert func.await_count == 1
+
+
+class TestCircuitBreaker:
+
+    @pytest.mark.asyncio
+    async def test_retry_after_pauses_all_callers(self):
+        breaker = CircuitBreaker("openai")
+        breaker.record_failure(retry_after=0.1)
+
+        waits = await asyncio.gather(breaker.wait_until_ready(), breaker.wait_until_ready())
+
+        assert all(wait >= 0.09 for wait in waits)
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_closes_on_probe(self):
+        breaker = CircuitBreaker("openrouter", failure_threshold=2, reset_timeout=0.05)
+        breaker.record_failure()
+        assert breaker.state is CircuitState.CLOSED
+        breaker.record_failure()
+        assert breaker.state is CircuitState.OPEN
+
+        assert await breaker.wait_until_ready() > 0
+        assert breaker.state is CircuitState.HALF_OPEN
+
+        second_caller = asyncio.create_task(breaker.wait_until_ready())
+        await asyncio.sleep(0.01)
+        assert not second_caller.done()
+
+        breaker.record_success()
+        await second_caller
+        assert breaker.state is CircuitState.CLOSED
+
+    @pytest.mark.asyncio
+    async def test_probe_cancelled_while_queued_is_released(self):
+        reset_circuit_breakers()
+        breaker = get_circuit_breaker("openai")
+        breaker.state = CircuitState.HALF_OPEN
+        queued = asyncio.Event()
+
+        @asynccontextmanager
+        async def never_admitted(**kwargs):
+            queued.set()
+            await asyncio.Event().wait()
+            yield 0.0
+
+        async def probe():
+            async with scheduled_llm_call(AgentRole.SUMMARIZER, [], "gpt-4o"):
+                pass
+
+        with patch.object(llm_scheduler, "reserve", never_admitted):
+            task = asyncio.create_task(probe())
+            await queued.wait()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        # The next caller becomes the probe straight away instead of waiting on one that never ran.
+        assert await asyncio.wait_for(breaker.wait_until_ready(), timeout=0.5) == 0.0
+        reset_circuit_breakers()
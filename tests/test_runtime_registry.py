@@ -0,0 +1,92 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from services.ai.ai_settings import AgentRole, ai_settings
+from services.ai.model_config import ModelSelector
+from services.ai.runtime_registry import RuntimeRegistry
+
+
+@pytest.fixture
+def registry():
+    fresh = RuntimeRegistry()
+    config = Mock(openai_api_key="sk-test", anthropic_api_key="sk-ant-test", openrouter_api_key="or-test")
+
+    with (
+        patch("services.ai.model_config.runtime_registry", fresh),
+        patch("services.ai.model_config.get_config", return_value=config),
+    ):
+        yield fresh
+
+    fresh.clear()
+
+
+def _assign(mode_models: dict[AgentRole, str]):
+    return patch.dict(ai_settings.model_assignments[ai_settings.mode], mode_models)
+
+
+class TestRuntimeRegistry:
+
+    def test_llm_clients_are_reused_per_model_and_params(self, registry):
+        with _assign({AgentRole.SUMMARIZER: "gpt-4o", AgentRole.SYNTHESIS: "gpt-4o", AgentRole.FORMATTER: "gpt-4.1"}):
+            summarizer = ModelSelector.get_llm(AgentRole.SUMMARIZER)
+            synthesis = ModelSelector.get_llm(AgentRole.SYNTHESIS)
+            formatter = ModelSelector.get_llm(AgentRole.FORMATTER)
+
+        assert summarizer is synthesis
+        assert formatter is not summarizer
+        assert formatter.http_async_client is summarizer.http_async_client
+        assert registry.stats["llm_hits"] == 1 and registry.stats["llm_misses"] == 2
+
+    def test_anthropic_clients_are_cached(self, registry):
+        with _assign({AgentRole.SUMMARIZER: "claude-4", AgentRole.SYNTHESIS: "claude-4-thinking"}):
+            first = ModelSelector.get_llm(AgentRole.SUMMARIZER)
+            second = ModelSelector.get_llm(AgentRole.SUMMARIZER)
+            thinking = ModelSelector.get_llm(AgentRole.SYNTHESIS)
+
+        assert first is second
+        assert thinking is not first
+
+    def test_reload_invalidates_llms_and_graphs(self, registry):
+        factory = Mock(side_effect=object)
+
+        graph = registry.get_graph("integrated", factory)
+        assert registry.get_graph("integrated", factory) is graph
+
+        with _assign({AgentRole.SUMMARIZER: "gpt-4o"}):
+            llm = ModelSelector.get_llm(AgentRole.SUMMARIZER)
+            with patch("services.ai.ai_settings.get_config", return_value=Mock(ai_mode=ai_settings.mode)):
+                ai_settings.reload()
+            assert ModelSelector.get_llm(AgentRole.SUMMARIZER) is not llm
+
+        assert registry.get_graph("integrated", factory) is not graph
+        assert factory.call_count == 2
+
+    def test_llms_are_bound_to_event_loop(self, registry):
+        async def get_in_loop():
+            first = registry.get_llm("model", {}, lambda params: object())
+            return first, registry.get_llm("model", {}, lambda params: object())
+
+        first_run = asyncio.run(get_in_loop())
+        second_run = asyncio.run(get_in_loop())
+
+        assert first_run[0] is first_run[1]
+        assert second_run[0] is not first_run[0]
+
+    def test_async_http_pools_are_closed_when_the_loop_changes(self, registry):
+        stale = Mock(aclose=AsyncMock())
+
+        async def first_run():
+            registry.get_llm("model", {}, lambda params: object())
+            with patch("openai.DefaultAsyncHttpxClient", return_value=stale):
+                assert registry.get_async_http_client("https://api.openai.com/v1") is stale
+
+        async def second_run():
+            registry.get_llm("model", {}, lambda params: object())
+            await asyncio.sleep(0)
+
+        asyncio.run(first_run())
+        asyncio.run(second_run())
+
+        stale.aclose.assert_awaited_once()
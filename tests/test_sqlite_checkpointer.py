@@ -0,0 +1,125 @@
+import operator
+from dataclasses import asdict
+from typing import Annotated, TypedDict
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+
+from benchmarks.fake_llm import fake_llms
+from benchmarks.synthetic_athlete import generate_garmin_data
+from services.ai.langgraph.schemas import MetricsExpertOutputs
+from services.ai.langgraph.utils.blob_store import BLOB_DIR_NAME
+from services.ai.langgraph.utils.sqlite_checkpointer import open_sqlite_checkpointer
+from services.ai.langgraph.workflows.planning_workflow import run_complete_analysis_and_planning
+
+
+class _State(TypedDict):
+    steps: Annotated[list[str], operator.add]
+    metrics_outputs: MetricsExpertOutputs | None
+
+
+def _build_graph(calls: list[str], fail_at: set[str]):
+    def make_node(name: str):
+        def node(_state):
+            calls.append(name)
+            if name in fail_at:
+                raise RuntimeError(f"{name} failed")
+            update = {"steps": [name]}
+            if name == "expert":
+                update["metrics_outputs"] = MetricsExpertOutputs.model_construct()
+            return update
+        return node
+
+    workflow = StateGraph(_State)
+    for name in ("summarizer", "expert", "planner", "formatter"):
+        workflow.add_node(name, make_node(name))
+    workflow.add_edge(START, "summarizer")
+    workflow.add_edge("summarizer", "expert")
+    workflow.add_edge("expert", "planner")
+    workflow.add_edge("planner", "formatter")
+    workflow.add_edge("formatter", END)
+    return workflow.compile()
+
+
+@pytest.mark.asyncio
+async def test_resume_skips_completed_nodes(tmp_path):
+    db_path = tmp_path / "out" / "checkpoints.sqlite"
+    config = {"configurable": {"thread_id": "exec_1"}}
+    calls: list[str] = []
+    fail_at = {"planner"}
+    graph = _build_graph(calls, fail_at)
+
+    async with open_sqlite_checkpointer(db_path) as saver:
+        with pytest.raises(RuntimeError):
+            await graph.copy(update={"checkpointer": saver}).ainvoke({"steps": []}, config)
+
+    fail_at.clear()
+    async with open_sqlite_checkpointer(db_path) as saver:
+        app = graph.copy(update={"checkpointer": saver})
+        snapshot = await app.aget_state(config)
+        assert snapshot.next == ("planner",)
+        assert isinstance(snapshot.values["metrics_outputs"], MetricsExpertOutputs)
+
+        result = await app.ainvoke(None, config)
+
+    assert result["steps"] == ["summarizer", "expert", "planner", "formatter"]
+    assert calls == ["summarizer", "expert", "planner", "planner", "formatter"]
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_compacted_per_thread(tmp_path):
+    db_path = tmp_path / "checkpoints.sqlite"
+    graph = _build_graph([], set())
+
+    async with open_sqlite_checkpointer(db_path, keep_last=2) as saver:
+        app = graph.copy(update={"checkpointer": saver})
+        for thread_id in ("exec_1", "exec_2"):
+            await app.ainvoke({"steps": []}, {"configurable": {"thread_id": thread_id}})
+
+        cursor = await saver.conn.execute(
+            "SELECT thread_id, COUNT(*) FROM checkpoints GROUP BY thread_id ORDER BY thread_id"
+        )
+        assert await cursor.fetchall() == [("exec_1", 2), ("exec_2", 2)]
+
+        final = await app.aget_state({"configurable": {"thread_id": "exec_1"}})
+        assert final.next == ()
+        assert final.values["steps"][-1] == "formatter"
+
+
+@pytest.mark.asyncio
+async def test_resume_requires_existing_checkpoint(tmp_path):
+    with pytest.raises(ValueError, match="requires a checkpoint database"):
+        await run_complete_analysis_and_planning(
+            user_id="test_user", athlete_name="Test", garmin_data={}, resume_execution_id="missing"
+        )
+
+    with pytest.raises(ValueError, match="No checkpoint found"):
+        await run_complete_analysis_and_planning(
+            user_id="test_user",
+            athlete_name="Test",
+            garmin_data={},
+            checkpoint_db=str(tmp_path / "checkpoints.sqlite"),
+            resume_execution_id="missing",
+        )
+
+
+@pytest.mark.asyncio
+async def test_completed_durable_run_leaves_no_thread(tmp_path):
+    db_path = tmp_path / "checkpoints.sqlite"
+    with fake_llms():
+        result = await run_complete_analysis_and_planning(
+            user_id="test_user",
+            athlete_name="Test",
+            garmin_data=asdict(generate_garmin_data(7)),
+            plotting_enabled=True,
+            hitl_enabled=False,
+            checkpoint_db=str(db_path),
+        )
+
+    assert result["errors"] == []
+    assert not any((tmp_path / BLOB_DIR_NAME).iterdir())
+    assert not any((tmp_path / "plot_datasets").iterdir())
+    async with open_sqlite_checkpointer(db_path) as saver:
+        for table in ("checkpoints", "writes"):
+            cursor = await saver.conn.execute(f"SELECT COUNT(*) FROM {table}")
+            assert await cursor.fetchone() == (0,)
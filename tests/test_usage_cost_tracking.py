@@ -0,0 +1,81 @@
+from typing import TypedDict
+from unittest.mock import Mock
+
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from services.ai.langgraph.utils.langsmith_cost_extractor import WorkflowCostSummary
+from services.ai.langgraph.utils.workflow_cost_tracker import (
+    ProgressIntegratedCostTracker,
+    WorkflowCostTracker,
+)
+from services.ai.utils.cost_tracker import CostTracker
+
+
+class State(TypedDict, total=False):
+    answer: str
+
+
+def build_app(model_name: str, calls: int = 2):
+    llm = GenericFakeChatModel(messages=iter([
+        AIMessage(
+            content="ok",
+            usage_metadata={"input_tokens": 1000, "output_tokens": 500, "total_tokens": 1500},
+            response_metadata={"model_name": model_name},
+        )
+        for _ in range(calls)
+    ]))
+
+    async def metrics_expert(state: State) -> State:
+        for _ in range(calls):
+            await llm.ainvoke("hello")
+        return {"answer": "done"}
+
+    graph = StateGraph(State)
+    graph.add_node("metrics_expert", metrics_expert)
+    graph.add_edge(START, "metrics_expert")
+    graph.add_edge("metrics_expert", END)
+    return graph.compile()
+
+
+@pytest.mark.asyncio
+async def test_costs_are_priced_per_node_while_running():
+    progress_manager = Mock(analysis_stats={"total_cost_usd": 0.0, "total_tokens": 0})
+    seen_totals = []
+    tracker = ProgressIntegratedCostTracker(progress_manager=progress_manager)
+    tracker.cost_extractor = Mock(client=None)
+    original_update = tracker._on_cost_update
+    tracker._on_cost_update = lambda summary: (seen_totals.append(summary.total_tokens), original_update(summary))
+
+    _, execution = await tracker.run_workflow_with_progress(build_app("gpt-4o-2024-08-06"), {}, "thread")
+
+    summary = execution.cost_summary
+    assert [(node.name, node.model) for node in summary.node_costs] == [("metrics_expert", "gpt-4o-2024-08-06")]
+    assert summary.total_cost_usd == pytest.approx(2 * (1000 * 2.5 + 500 * 10.0) / 1_000_000)
+    assert seen_totals == [1500, 3000]
+    assert progress_manager.analysis_stats["total_tokens"] == 3000
+    tracker.cost_extractor.extract_workflow_costs_by_trace.assert_not_called()
+    assert tracker.get_legacy_cost_summary(execution)["agents"][0]["name"] == "metrics_expert"
+
+
+def test_only_dated_snapshots_fall_back_to_the_base_model_price():
+    usages = CostTracker().calculate_cost_from_usage_metadata({
+        model: {"input_tokens": 1000, "output_tokens": 0}
+        for model in ("gpt-4o-2024-08-06", "o3-mini-20250131", "gpt-4.1-mini", "gpt-4o-audio-preview")
+    })
+
+    assert [usage.model_name for usage in usages] == ["gpt-4o", "o3-mini"]
+
+
+@pytest.mark.asyncio
+async def test_langsmith_reconciliation_runs_in_background():
+    tracker = WorkflowCostTracker(reconcile_with_langsmith=True)
+    remote = WorkflowCostSummary("trace", "", 0.02, 3000, 2000, 1000, 0, [])
+    tracker.cost_extractor = Mock(client=object(), extract_workflow_costs_by_trace=Mock(return_value=remote))
+
+    _, execution = await tracker.run_workflow_with_cost_tracking(build_app("unpriced-model", 1), {}, "thread")
+
+    assert execution.cost_summary.total_tokens == 1500 and execution.cost_summary.total_cost_usd == 0.0
+    assert await execution.langsmith_reconciliation is remote
@@ -0,0 +1,66 @@
+from dataclasses import asdict
+
+import httpx
+import pytest
+from langchain_core.messages import ToolMessage
+from langchain_core.tools import tool
+
+from benchmarks.fake_llm import FakeChatModel
+from benchmarks.synthetic_athlete import generate_garmin_data
+from benchmarks.workflow_benchmark import run_profile
+from services.ai.langgraph.schemas.expert_outputs import MetricsExpertOutputs
+from services.ai.utils.retry_handler import classify_exception
+
+
+@tool
+def create_plot(python_code: str, description: str) -> str:
+    """Create a plot."""
+    return "plot_1"
+
+
+@pytest.mark.asyncio
+async def test_fake_model_honors_tools_structured_output_and_failures():
+    llm = FakeChatModel(model="gpt-4o", tool_call_rounds=1)
+    with_tools = llm.bind_tools([create_plot])
+
+    first = await with_tools.ainvoke("analyse")
+    assert first.tool_calls[0]["name"] == "create_plot"
+    assert set(first.tool_calls[0]["args"]) == {"python_code", "description"}
+    final = await with_tools.ainvoke(["analyse", first, ToolMessage(content="plot_1", tool_call_id="call_0")])
+    assert not final.tool_calls and final.usage_metadata["output_tokens"] == 200
+    assert isinstance(await llm.with_structured_output(MetricsExpertOutputs).ainvoke("analyse"), MetricsExpertOutputs)
+    assert (await llm.ainvoke("hi")).content == (await FakeChatModel(model="gpt-4o").ainvoke("hi")).content
+
+    async def attempts(model: FakeChatModel) -> list[str]:
+        outcomes = []
+        for _ in range(6):
+            try:
+                await model.ainvoke("hello")
+                outcomes.append("ok")
+            except httpx.HTTPStatusError as e:
+                assert classify_exception(e).retryable
+                outcomes.append("429")
+        return outcomes
+
+    outcomes = await attempts(FakeChatModel(failure_rate=0.5, seed=3))
+    assert {"ok", "429"} <= set(outcomes)
+    assert await attempts(FakeChatModel(failure_rate=0.5, seed=3)) == outcomes
+
+
+def test_synthetic_athlete_scales_with_days():
+    small, large = generate_garmin_data(7, seed=1), generate_garmin_data(56, seed=1)
+
+    assert len(large.training_load_history) == 56 and len(large.recovery_indicators) == 56
+    assert len(large.recent_activities) > 5 * len(small.recent_activities) > 0
+    assert asdict(generate_garmin_data(7, seed=1)) == asdict(small)
+
+
+@pytest.mark.asyncio
+async def test_benchmark_runs_the_integrated_workflow_offline():
+    result = await run_profile(7, latency_seconds=0.01)
+
+    assert result.errors == [] and result.activities > 0 and result.llm_calls >= 11
+    assert result.critical_path[0].endswith("_summarizer") and result.critical_path[-1] == "finalize"
+    assert result.node_overhead["master_orchestrator"]["runs"] == 3
+    assert result.node_overhead["metrics_expert"]["llm_seconds"] >= 0.01
+    assert result.total_tokens > 0